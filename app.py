@@ -1,8 +1,17 @@
+import os
+import uuid
+
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime
+from datetime import datetime, timedelta
+
+from monitor.anomaly import KIND_LABELS
+from monitor.data import compact_frame, content_hash, load_report
+from monitor.dataset import Dataset, load_dataset
+from monitor.rollup import trend_bucket
+from monitor.shared import SharedDataset
+from monitor.snapshot import load_snapshot
+from monitor.store import ArticleStore
+from monitor.timing import StageTimer
 
 # Set page config for a professional management console
 st.set_page_config(
@@ -12,6 +21,59 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Sections decorated with @fragment rerun on their own when only their widgets change
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+# Default report shared by all sessions: a workbook or a data directory (newest report wins)
+DATA_PATH = os.environ.get("MONITOR_DATA_PATH", "信源监测_Updated.xlsx")
+WATCH_INTERVAL = float(os.environ.get("MONITOR_WATCH_INTERVAL", "5"))
+
+# Start from the report's precomputed snapshot (scripts/build_snapshot.py) when it
+# matches the file; MONITOR_SNAPSHOT=0 always loads the report itself
+USE_SNAPSHOT = os.environ.get("MONITOR_SNAPSHOT", "1") != "0"
+
+# Compact schema: categorical labels, narrow integer metrics, text columns left on disk
+COMPACT_SCHEMA = os.environ.get("MONITOR_COMPACT_SCHEMA", "1") != "0"
+
+# Multi-period history: with MONITOR_STORE=<path to SQLite file> the dashboard reads the
+# article store (see scripts/ingest_store.py) instead of a single workbook, querying
+# only the selected platforms and dates; the window defaults to the last N days
+STORE_PATH = os.environ.get("MONITOR_STORE")
+STORE_WINDOW_DAYS = int(os.environ.get("MONITOR_STORE_WINDOW_DAYS", "30"))
+
+# Opt-in stage timings: MONITOR_PROFILE=1 (or ?profile=1 in the URL) shows a sidebar
+# panel; MONITOR_PROFILE_LOG=<path> also appends one JSON line per run
+PROFILE = os.environ.get("MONITOR_PROFILE", "0") == "1"
+PROFILE_LOG = os.environ.get("MONITOR_PROFILE_LOG")
+
+# Daily trend: series longer than this many points in total are drawn with WebGL
+# (straight lines, no markers); bucket labels for the granularity picker
+TREND_WEBGL_POINTS = 1000
+TREND_GRANULARITY = {"自动粒度": None, "按日": "D", "按周": "W", "按月": "M"}
+TREND_LABELS = {"D": "日", "W": "周", "M": "月"}
+
+# Styling is self-hosted so first paint never waits on an outside network: the
+# stylesheet is static/dashboard.css, and fonts are served from static/fonts at
+# app/static/fonts (see .streamlit/config.toml) for each of these files present.
+# The Docker image builds them with scripts/build_fonts.py.
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+FONT_FILES = {
+    "NotoSansSC-Regular.woff2": ("Noto Sans SC", 400),
+    "NotoSansSC-Medium.woff2": ("Noto Sans SC", 500),
+    "NotoSansSC-Bold.woff2": ("Noto Sans SC", 700),
+    "JetBrainsMono-Regular.woff2": ("JetBrains Mono", 400),
+    "JetBrainsMono-Bold.woff2": ("JetBrains Mono", 700),
+}
+
+# Anomaly alerts: the sidebar lists days flagged within the last N days of data
+ANOMALY_RECENT_DAYS = 3
+
+# Article explorer: sortable columns (label -> column), page sizes and shown columns
+EXPLORER_SORTS = {"发布时间": "发布时间", "阅读数": "阅读数", "点赞数": "点赞数", "评论数": "评论数",
+                  "转发数": "转发数", "传播指数": "raw_csi"}
+EXPLORER_PAGE_SIZES = [20, 50, 100]
+EXPLORER_COLUMNS = ['标题', '发布平台', '发布时间', '阅读数', '点赞数', '评论数', '转发数', '原文链接']
+
 # --- OPERATIONAL DESIGN SYSTEM ---
 PLATFORM_COLORS = {
     '今日头条': '#C21807',  # Deep Red
@@ -22,295 +84,345 @@ PLATFORM_COLORS = {
     'APP': '#02559E',
     '其他': '#94a3b8'
 }
+SENTIMENT_COLORS = {'正面': '#10b981', '中性': '#94a3b8', '负面': '#ef4444'}
 
-st.markdown(f"""
-<link href="https://fonts.googleapis.com/css2?family=JetBrains+Mono:wght@400;700&family=Noto+Sans+SC:wght@400;500;700&display=swap" rel="stylesheet">
-<style>
-    .stApp {{
-        background-color: #f1f5f9;
-        font-family: 'Noto Sans SC', sans-serif;
-    }}
-    
-    header {{visibility: hidden;}}
-    footer {{visibility: hidden;}}
-
-    /* Sidebar Styling */
-    section[data-testid="stSidebar"] {{
-        background-color: #ffffff;
-        border-right: 1px solid #e2e8f0;
-    }}
-
-    /* Global Header */
-    .ops-header {{
-        background: #ffffff;
-        padding: 1rem 2rem;
-        border-bottom: 2px solid #02559e;
-        margin-bottom: 1.5rem;
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-    }}
-    .ops-title {{
-        color: #02559e;
-        font-weight: 800;
-        font-size: 1.25rem;
-        display: flex;
-        align-items: center;
-        gap: 10px;
-    }}
-    .ops-badge {{
-        background: #e0f2fe;
-        color: #0369a1;
-        padding: 2px 8px;
-        border-radius: 4px;
-        font-size: 0.7rem;
-        font-weight: 700;
-        text-transform: uppercase;
-    }}
-
-    /* Data Cards */
-    .metric-container {{
-        background: #ffffff;
-        border-left: 4px solid #02559e;
-        padding: 1rem;
-        border-radius: 0 8px 8px 0;
-        box-shadow: 0 1px 2px rgba(0,0,0,0.05);
-    }}
-    .metric-sub {{ color: #64748b; font-size: 0.75rem; margin-bottom: 2px; font-weight: 500; }}
-    .metric-main {{ color: #0f172a; font-size: 1.5rem; font-weight: 800; font-family: 'JetBrains Mono', monospace; }}
-
-    /* Chart Containers */
-    .chart-card {{
-        background: #ffffff;
-        border-radius: 12px;
-        padding: 1.5rem;
-        border: 1px solid #e2e8f0;
-        margin-bottom: 1.5rem;
-    }}
-    .chart-header {{
-        font-size: 1rem;
-        font-weight: 700;
-        color: #1e293b;
-        margin-bottom: 1rem;
-        display: flex;
-        justify-content: space-between;
-    }}
-
-    /* Tables */
-    .stDataFrame {{ border-radius: 8px; overflow: hidden; }}
-
-    /* Unified Section Title */
-    .ops-section-title {{
-        color: #0f172a;
-        font-size: 1.5rem;
-        font-weight: 800;
-        margin: 3rem 0 2rem 0;
-        display: flex;
-        align-items: center;
-        gap: 15px;
-        padding-bottom: 12px;
-        border-bottom: 2px solid #e2e8f0;
-    }}
-    .ops-section-title::before {{
-        content: "";
-        display: inline-block;
-        width: 8px;
-        height: 28px;
-        background: #02559e;
-        border-radius: 4px;
-    }}
-</style>
-""", unsafe_allow_html=True)
+@st.cache_resource(show_spinner=False)
+def page_style():
+    # Read once per process: the stylesheet plus @font-face rules for the bundled fonts
+    faces = []
+    for name, (family, weight) in FONT_FILES.items():
+        if os.path.exists(os.path.join(STATIC_DIR, "fonts", name)):
+            faces.append(f"@font-face {{ font-family: '{family}'; font-weight: {weight}; font-display: swap; "
+                         f"src: local('{family}'), url('app/static/fonts/{name}') format('woff2'); }}")
+    with open(os.path.join(STATIC_DIR, "dashboard.css"), encoding="utf-8") as fh:
+        css = fh.read()
+    return "<style>\n" + "\n".join(faces + [css]) + "</style>"
+
+st.markdown(page_style(), unsafe_allow_html=True)
+
+@st.cache_resource(show_spinner=False)
+def _shared_dataset(path):
+    # One copy per process for every session; a watcher thread swaps in new versions
+    return SharedDataset(path, _load_report_dataset, interval=WATCH_INTERVAL)
+
+def _load_report_dataset(report):
+    ds = load_snapshot(report) if USE_SNAPSHOT else None
+    if ds is None:
+        return load_dataset(report, compact=COMPACT_SCHEMA)
+    # Row-level views (the article explorer) load the report itself on demand
+    ds.loader = lambda: load_dataset(report, compact=COMPACT_SCHEMA)
+    return ds
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _load_dataset(digest, _file):
+    # Parsed once per file content (columnar cache on disk), aggregated once per process
+    return Dataset(load_report(_file, digest=digest, compact=COMPACT_SCHEMA), digest)
 
 def load_data(file):
     try:
-        df = pd.read_excel(file)
-        # Force numeric types
-        for col in ['阅读数', '点赞数', '评论数', '转发数']:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-        
-        if '发布时间' in df.columns:
-            df['发布时间'] = pd.to_datetime(df['发布时间'])
-            df['日期'] = df['发布时间'].dt.date
-            
-        return df
+        if isinstance(file, str):
+            return _shared_dataset(file).current()
+        return _load_dataset(content_hash(file), file)
     except Exception as e:
         st.error(f"加载出错: {e}")
         return None
 
-def main():
-    # Sidebar Filters
+@st.cache_resource(show_spinner=False)
+def _open_store(path):
+    return ArticleStore(path)
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _query_store(path, version, platforms, start, end):
+    # Keyed by the store's latest ingestion, so new reports invalidate old windows
+    store = _open_store(path)
+    leaders = store.leaders(list(platforms), start, end)
+    if COMPACT_SCHEMA:
+        leaders = compact_frame(leaders)
+    # Flags come from the store's rolling detector (scripts/ingest_store.py updates it);
+    # a store it never ran on gets them detected over the window
+    ds = Dataset(leaders, cube=store.cube(list(platforms), start, end),
+                 sentiments=store.sentiments(list(platforms), start, end), anomalies=store.anomalies(start, end))
+    ds.version = version
+    return ds
+
+def normalize_window(bounds, picked):
+    # (start, end) of a date_input range within bounds: while a range is being picked the
+    # widget holds only its start day, and a cleared widget means the whole range
+    days = [day for day in (picked if isinstance(picked, (list, tuple)) else (picked,)) if day is not None]
+    if not days:
+        return tuple(bounds)
+    return max(days[0], bounds[0]), min(days[-1], bounds[1])
+
+def store_filters(store):
+    # Platform and date window; both are pushed down into the store's queries
+    bounds = store.date_bounds()
+    if bounds is None:
+        return None, None
+    first, last = bounds
+    platforms = store.platforms()
     with st.sidebar:
-        st.markdown("### 🛠️ 运营过滤控制")
-        uploaded_file = st.file_uploader("导入原始监测报表", type=["xlsx"])
-    
-    # Header logic
-    st.markdown("""
-        <div class="ops-header">
-            <div class="ops-title">📊 新华社矩阵运营驾驶舱 <span class="ops-badge">Live Ops</span></div>
-            <div style="color: #64748b; font-size: 0.8rem;">数据更新：""" + datetime.now().strftime("%Y-%m-%d %H:%M") + """</div>
-        </div>
-    """, unsafe_allow_html=True)
+        st.markdown("### 🎯 监测对象")
+        selected_platforms = st.multiselect("选择观察平台", platforms, default=platforms)
+        window = st.date_input("监测时段", value=(max(first, last - timedelta(days=STORE_WINDOW_DAYS - 1)), last),
+                               min_value=first, max_value=last)
+        st.markdown("---")
+    return selected_platforms, normalize_window(bounds, window)
 
-    if uploaded_file is None:
-        sample_path = "信源监测_Updated.xlsx"
-        try:
-            df = load_data(sample_path)
-        except:
-            st.warning("请上传报表进行分析")
-            return
-    else:
-        df = load_data(uploaded_file)
+def start_timer():
+    enabled = PROFILE or st.query_params.get("profile") == "1"
+    if enabled:
+        st.session_state.setdefault("session_id", uuid.uuid4().hex[:8])
+        st.session_state["rerun_id"] = st.session_state.get("rerun_id", 0) + 1
+    return StageTimer(enabled)
 
-    if df is not None:
-        # Sidebar dynamic filters
-        platforms = df['发布平台'].unique().tolist()
-        with st.sidebar:
-            st.markdown("### 🎯 监测对象")
-            selected_platforms = st.multiselect("选择观察平台", platforms, default=platforms)
-            st.markdown("---")
+def finish_timer(timer, scope):
+    if timer.enabled and PROFILE_LOG:
+        timer.write_log(PROFILE_LOG, session=st.session_state["session_id"],
+                        rerun=st.session_state["rerun_id"], scope=scope)
 
-        # Filtered data
-        f_df = df[df['发布平台'].isin(selected_platforms)]
+def render_timings(timer):
+    if not timer.enabled:
+        return
+    with st.sidebar.expander("⏱️ 性能剖析", expanded=False):
+        st.caption(f"本次运行 {timer.total() * 1000:.0f} ms · 会话 {st.session_state['session_id']} · 第 {st.session_state['rerun_id']} 次运行")
+        st.dataframe(timer.report(), use_container_width=True, hide_index=True)
 
-        # Dynamic Insight Calculation (placed after filtering)
-        if not f_df.empty:
-            with st.sidebar:
-                # Calculate interaction density (Total Interactions / Article Count)
-                insight_df = f_df.groupby('发布平台')[['点赞数', '评论数', '转发数']].sum()
-                insight_df['total_int'] = insight_df.sum(axis=1)
-                insight_df['count'] = f_df['发布平台'].value_counts()
-                insight_df['density'] = insight_df['total_int'] / insight_df['count']
-                
-                if not insight_df.empty:
-                    best_plat = insight_df['density'].idxmax()
-                    best_val = insight_df['density'].max()
-                    
-                    st.markdown("### 💡 智能运营建议")
-                    st.info(f"**{best_plat}** 当前表现最佳！\n\n篇均互动达到 **{int(best_val)}** 次。建议维持当前发布频率，并尝试将该平台的高赞内容分发至其他渠道。")
-
-        # --- TIER 1: TOTAL PIPELINE ---
-        # --- TIER 1: TOTAL PIPELINE ---
-        st.markdown('<div class="ops-section-title">🚀 核心数据概览</div>', unsafe_allow_html=True)
-        c1, c2, c3, c4, c5 = st.columns(5)
-        
+def render_insight(ds, selected_platforms):
+    with st.sidebar:
+        # Calculate interaction density (Total Interactions / Article Count)
+        best_plat, best_val = ds.insight(selected_platforms)
+        if best_plat is not None:
+            st.markdown("### 💡 智能运营建议")
+            st.info(f"**{best_plat}** 当前表现最佳！\n\n篇均互动达到 **{int(best_val)}** 次。建议维持当前发布频率，并尝试将该平台的高赞内容分发至其他渠道。")
+
+def render_anomalies(ds, selected_platforms):
+    flags = ds.anomalies(selected_platforms)
+    bounds = ds.date_bounds(selected_platforms)
+    if bounds is None:
+        return
+    recent = flags[flags['日期'] > bounds[1] - timedelta(days=ANOMALY_RECENT_DAYS)]
+    with st.sidebar:
+        st.markdown("### 🚨 异常预警")
+        if recent.empty:
+            st.caption(f"近 {ANOMALY_RECENT_DAYS} 天各平台发文量、阅读与互动均无异常波动")
+        for (platform, day), group in recent.groupby(['发布平台', '日期'], sort=False):
+            details = "；".join(f"{row['指标']}{KIND_LABELS[row['类型']]} {row['数值']:,.0f}（常态约 {row['预期']:,.0f}）"
+                               for _, row in group.iterrows())
+            st.warning(f"**{platform}** {day:%m-%d}：{details}")
+        if not flags.empty:
+            with st.expander(f"全部异常日（{len(flags)} 项）", expanded=False):
+                st.dataframe(flags, use_container_width=True, hide_index=True)
+
+def render_memory(ds):
+    with st.sidebar.expander("🧠 内存占用", expanded=False):
+        report = ds.memory
+        st.caption(f"常驻数据 {report['字节'].sum() / 1024 ** 2:.2f} MB · {len(ds.df):,} 行")
+        st.dataframe(report, use_container_width=True, hide_index=True)
+
+def render_overview(ds, selected_platforms, timer):
+    # --- TIER 1: TOTAL PIPELINE ---
+    # --- TIER 1: TOTAL PIPELINE ---
+    with timer.stage("tier1.compute"):
+        kpis = ds.kpis(selected_platforms)
+
+    st.markdown('<div class="ops-section-title">🚀 核心数据概览</div>', unsafe_allow_html=True)
+    c1, c2, c3, c4, c5 = st.columns(5)
+    with timer.stage("tier1.render"):
         with c1:
-            st.markdown(f'<div class="metric-container"><div class="metric-sub">监测覆盖篇数</div><div class="metric-main">{len(f_df):,}</div></div>', unsafe_allow_html=True)
+            st.markdown(f'<div class="metric-container"><div class="metric-sub">监测覆盖篇数</div><div class="metric-main">{kpis["count"]:,}</div></div>', unsafe_allow_html=True)
         with c2:
-            st.markdown(f'<div class="metric-container"><div class="metric-sub">全网累计触达</div><div class="metric-main">{int(f_df["阅读数"].sum()):,}</div></div>', unsafe_allow_html=True)
+            st.markdown(f'<div class="metric-container"><div class="metric-sub">全网累计触达</div><div class="metric-main">{int(kpis["reads"]):,}</div></div>', unsafe_allow_html=True)
         with c3:
-            st.markdown(f'<div class="metric-container"><div class="metric-sub">社交互动总量</div><div class="metric-main">{int(f_df["点赞数"].sum()+f_df["评论数"].sum()+f_df["转发数"].sum()):,}</div></div>', unsafe_allow_html=True)
+            st.markdown(f'<div class="metric-container"><div class="metric-sub">社交互动总量</div><div class="metric-main">{int(kpis["interactions"]):,}</div></div>', unsafe_allow_html=True)
         with c4:
-            avg_int = (f_df['点赞数'].sum() / len(f_df)) if len(f_df) > 0 else 0
-            st.markdown(f'<div class="metric-container"><div class="metric-sub">篇均互动(点赞)</div><div class="metric-main">{avg_int:.1f}</div></div>', unsafe_allow_html=True)
+            st.markdown(f'<div class="metric-container"><div class="metric-sub">篇均互动(点赞)</div><div class="metric-main">{kpis["avg_likes"]:.1f}</div></div>', unsafe_allow_html=True)
         with c5:
-            platforms_count = f_df['发布平台'].nunique()
-            st.markdown(f'<div class="metric-container"><div class="metric-sub">活跃监测渠道</div><div class="metric-main">{platforms_count}</div></div>', unsafe_allow_html=True)
+            st.markdown(f'<div class="metric-container"><div class="metric-sub">活跃监测渠道</div><div class="metric-main">{kpis["platforms"]}</div></div>', unsafe_allow_html=True)
+
+def render_trends(ds, selected_platforms, timer):
+    # --- TIER 2: BENCHMARKING ---
+    # --- TIER 2: BENCHMARKING ---
+    with timer.stage("tier2.compute"):
+        p_vol = ds.volume(selected_platforms)
+
+    with timer.stage("tier2.figures"):
+        # Deferred to the first chart: header, KPIs and sidebar render without plotly.express
+        import plotly.express as px
+        # Calculate total for center text
+        total_vol = p_vol['篇数'].sum()
+        
+        fig_vol = px.pie(p_vol, values='篇数', names='平台', hole=0.7,
+                         color='平台', color_discrete_map=PLATFORM_COLORS)
+        fig_vol.update_layout(
+            showlegend=False,
+            margin=dict(l=60, r=60, t=60, b=60),
+            height=320,
+            annotations=[dict(text=f'<span style="font-size:32px; font-weight:bold; color:#0f172a">{total_vol}</span><br><span style="font-size:14px; color:#64748b">总篇数</span>', 
+                            x=0.5, y=0.5, font_size=20, showarrow=False)]
+        )
+        fig_vol.update_traces(textposition='outside', textinfo='percent+label', textfont_size=11,
+                             hovertemplate='%{label}: %{value}篇<extra></extra>')
 
-        # --- TIER 2: BENCHMARKING ---
-        # --- TIER 2: BENCHMARKING ---
-        st.markdown('<div class="ops-section-title">📈 发稿量与发布趋势</div>', unsafe_allow_html=True)
-        col_bench1, col_bench2 = st.columns([1, 2])
+    st.markdown('<div class="ops-section-title">📈 发稿量与发布趋势</div>', unsafe_allow_html=True)
+    col_bench1, col_bench2 = st.columns([1, 2])
 
+    with timer.stage("tier2.render"):
         with col_bench1:
             st.markdown('<div class="chart-card"><div class="chart-header">各平台分发篇数占比</div>', unsafe_allow_html=True)
-            p_vol = f_df['发布平台'].value_counts().reset_index()
-            p_vol.columns = ['平台', '篇数']
-            
-            # Calculate total for center text
-            total_vol = p_vol['篇数'].sum()
-            
-            fig_vol = px.pie(p_vol, values='篇数', names='平台', hole=0.7,
-                             color='平台', color_discrete_map=PLATFORM_COLORS)
-            fig_vol.update_layout(
-                showlegend=False,
-                margin=dict(l=60, r=60, t=60, b=60),
-                height=320,
-                annotations=[dict(text=f'<span style="font-size:32px; font-weight:bold; color:#0f172a">{total_vol}</span><br><span style="font-size:14px; color:#64748b">总篇数</span>', 
-                                x=0.5, y=0.5, font_size=20, showarrow=False)]
-            )
-            fig_vol.update_traces(textposition='outside', textinfo='percent+label', textfont_size=11,
-                                 hovertemplate='%{label}: %{value}篇<extra></extra>')
             st.plotly_chart(fig_vol, use_container_width=True)
             st.markdown('</div>', unsafe_allow_html=True)
 
-        with col_bench2:
-            st.markdown('<div class="chart-card"><div class="chart-header">分平台日均生产节奏</div>', unsafe_allow_html=True)
-            daily_p = f_df.groupby(['日期', '发布平台']).size().reset_index(name='篇数')
-            fig_daily = px.line(daily_p, x='日期', y='篇数', color='发布平台', 
-                               line_shape='spline', color_discrete_map=PLATFORM_COLORS)
-            fig_daily.update_layout(
-                margin=dict(l=0,r=0,t=20,b=0), 
-                plot_bgcolor='white', 
-                hovermode='x',
-                height=320,
-                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1, title_text=''),
-                xaxis=dict(tickformat='%m月%d日', tickmode='auto', nticks=10)
-            )
-            fig_daily.update_traces(mode='lines+markers', hovertemplate='%{y}篇<extra></extra>')
-            st.plotly_chart(fig_daily, use_container_width=True)
-            st.markdown('</div>', unsafe_allow_html=True)
+    with col_bench2:
+        render_daily_trend(ds, selected_platforms)
+
+def trend_window(ds, selected_platforms):
+    # Window and bucket of the trend: the whole range by default, narrowed to drill down
+    bounds = ds.date_bounds(selected_platforms)
+    if bounds is None or bounds[0] == bounds[1]:
+        return bounds, None
+    col_window, col_bucket = st.columns([3, 1])
+    with col_window:
+        window = st.date_input("趋势时段", value=bounds, min_value=bounds[0], max_value=bounds[1],
+                               label_visibility="collapsed")
+    with col_bucket:
+        granularity = st.selectbox("趋势粒度", list(TREND_GRANULARITY), label_visibility="collapsed")
+    return normalize_window(bounds, window), TREND_GRANULARITY[granularity]
+
+@fragment
+def render_daily_trend(ds, selected_platforms):
+    # Reruns on its own when the trend's window or granularity changes
+    timer = st.session_state.get("_run_timer")
+    fragment_run = timer is None
+    if fragment_run:
+        timer = start_timer()
+
+    st.markdown('<div class="chart-card"><div class="chart-header">分平台日均生产节奏</div>', unsafe_allow_html=True)
+    window, freq = trend_window(ds, selected_platforms)
+    with timer.stage("trend.compute"):
+        # Buckets are aggregated here so the browser gets at most a few hundred points
+        freq = freq or (trend_bucket(*window) if window is not None else 'D')
+        if window == ds.date_bounds(selected_platforms) and freq == 'D':
+            daily_p = ds.daily(selected_platforms)
+        else:
+            daily_p = ds.trend(selected_platforms, window[0], window[1], freq)
+
+    with timer.stage("trend.figure"):
+        import plotly.express as px
+        webgl = len(daily_p) > TREND_WEBGL_POINTS
+        fig_daily = px.line(daily_p, x='日期', y='篇数', color='发布平台',
+                           line_shape='linear' if webgl else 'spline', render_mode='webgl' if webgl else 'svg',
+                           color_discrete_map=PLATFORM_COLORS)
+        fig_daily.update_layout(
+            margin=dict(l=0,r=0,t=20,b=0), 
+            plot_bgcolor='white', 
+            hovermode='x',
+            height=320,
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1, title_text=''),
+            xaxis=dict(tickformat='%Y年%m月' if freq == 'M' else '%m月%d日', tickmode='auto', nticks=10)
+        )
+        fig_daily.update_traces(mode='lines' if webgl else 'lines+markers', hovertemplate='%{y}篇<extra></extra>')
+
+    with timer.stage("trend.render"):
+        if freq != 'D':
+            st.caption(f"按{TREND_LABELS[freq]}汇总 · 选择较短时段可查看每日明细")
+        st.plotly_chart(fig_daily, use_container_width=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    if fragment_run:
+        finish_timer(timer, "trend")
+
+def render_interactions(ds, selected_platforms, timer):
+    # --- TIER 3: INTERACTION DETAIL ---
+    # --- TIER 3: INTERACTION DETAIL ---
+    with timer.stage("tier3.compute"):
+        read_comp, int_comp = ds.comps(selected_platforms)
+
+    with timer.stage("tier3.figures"):
+        import plotly.express as px
+        fig_read = px.bar(read_comp, x='发布平台', y='阅读数', color='发布平台', color_discrete_map=PLATFORM_COLORS)
+        fig_read.update_layout(showlegend=False, plot_bgcolor='white')
+        fig_read.update_traces(hovertemplate='%{y}<extra></extra>')
+
+        fig_int = px.bar(int_comp, x='发布平台', y=['点赞数', '评论数', '转发数'], barmode='group',
+                        color_discrete_map={'点赞数': '#3b82f6', '评论数': '#8b5cf6', '转发数': '#ec4899'})
+        fig_int.update_layout(
+            plot_bgcolor='white', 
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1, title_text=''),
+            yaxis_title='互动量',
+            hovermode='closest'
+        )
+        # Clean hover template: removes the secondary box and formats numbers
+        fig_int.update_traces(hovertemplate='%{y:.0f}<extra></extra>')
 
-        # --- TIER 3: INTERACTION DETAIL ---
-        # --- TIER 3: INTERACTION DETAIL ---
-        st.markdown('<div class="ops-section-title">🔥 阅读量与互动分析</div>', unsafe_allow_html=True)
-        col_eff1, col_eff2 = st.columns(2)
+    st.markdown('<div class="ops-section-title">🔥 阅读量与互动分析</div>', unsafe_allow_html=True)
+    col_eff1, col_eff2 = st.columns(2)
 
+    with timer.stage("tier3.render"):
         with col_eff1:
             st.markdown('<div class="chart-card"><div class="chart-header">全网阅读量/触达规模对比</div>', unsafe_allow_html=True)
-            read_comp = f_df.groupby('发布平台')['阅读数'].sum().reset_index()
-            fig_read = px.bar(read_comp, x='发布平台', y='阅读数', color='发布平台', color_discrete_map=PLATFORM_COLORS)
-            fig_read.update_layout(showlegend=False, plot_bgcolor='white')
-            fig_read.update_traces(hovertemplate='%{y}<extra></extra>')
             st.plotly_chart(fig_read, use_container_width=True)
             st.markdown('</div>', unsafe_allow_html=True)
 
         with col_eff2:
             st.markdown('<div class="chart-card"><div class="chart-header">各大平台社交声量构成 (互动类型)</div>', unsafe_allow_html=True)
-            int_comp = f_df.groupby('发布平台')[['点赞数', '评论数', '转发数']].sum().reset_index()
-            fig_int = px.bar(int_comp, x='发布平台', y=['点赞数', '评论数', '转发数'], barmode='group',
-                            color_discrete_map={'点赞数': '#3b82f6', '评论数': '#8b5cf6', '转发数': '#ec4899'})
-            fig_int.update_layout(
-                plot_bgcolor='white', 
-                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1, title_text=''),
-                yaxis_title='互动量',
-                hovermode='closest'
-            )
-            # Clean hover template: removes the secondary box and formats numbers
-            fig_int.update_traces(hovertemplate='%{y:.0f}<extra></extra>')
-            
             st.plotly_chart(fig_int, use_container_width=True)
             st.markdown('</div>', unsafe_allow_html=True)
 
-        # --- TIER 4: CONTENT AUDIT ---
-        # --- TIER 4: CONTENT AUDIT ---
-        st.markdown('<div class="ops-section-title">🏆 热门稿件排行榜</div>', unsafe_allow_html=True)
-        
-        # 4.1 Local Platform Filter
-        audit_platforms = ["全平台"] + selected_platforms
-        selected_audit_plat = st.radio("审计范围筛选:", audit_platforms, horizontal=True, label_visibility="collapsed")
-
-        # 4.2 Data Preparation & CSI Calculation
-        audit_df = f_df.copy()
-        if selected_audit_plat != "全平台":
-            audit_df = audit_df[audit_df['发布平台'] == selected_audit_plat]
-            
-        # CSI Algorithm: Likes*1 + Comments*2 + Shares*3
-        audit_df['raw_csi'] = audit_df['点赞数'] + audit_df['评论数']*2 + audit_df['转发数']*3
-        
-        # Standardization (0-100 Scale)
-        max_csi = audit_df['raw_csi'].max()
-        if max_csi > 0:
-            audit_df['传播指数'] = (audit_df['raw_csi'] / max_csi) * 100
-        else:
-            audit_df['传播指数'] = 0
-            
-        tab1, tab2 = st.tabs(["🔥 优质传播热度榜 (CSI Top 20)", "💬 评论活跃榜 Top 20"])
-        
+def render_sentiment(ds, selected_platforms, timer):
+    # --- TIER 3B: SENTIMENT MIX ---
+    with timer.stage("sentiment.compute"):
+        shares = ds.sentiment(selected_platforms)
+    if shares.empty:
+        return
+
+    with timer.stage("sentiment.figures"):
+        import plotly.express as px
+        fig_sent = px.bar(shares, x='占比', y='发布平台', color='情感属性', orientation='h',
+                          color_discrete_map=SENTIMENT_COLORS, custom_data=['篇数'],
+                          category_orders={'情感属性': list(SENTIMENT_COLORS)})
+        fig_sent.update_layout(
+            barmode='stack',
+            plot_bgcolor='white',
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1, title_text=''),
+            xaxis=dict(tickformat='.0%', title_text='', range=[0, 1]),
+            yaxis_title='',
+            height=max(220, 60 * shares['发布平台'].nunique() + 100)
+        )
+        fig_sent.update_traces(hovertemplate='%{x:.1%} · %{customdata[0]} 篇<extra></extra>')
+
+    st.markdown('<div class="ops-section-title">🧭 舆情倾向分布</div>', unsafe_allow_html=True)
+    with timer.stage("sentiment.render"):
+        st.markdown('<div class="chart-card"><div class="chart-header">各平台正面 / 中性 / 负面稿件占比</div>', unsafe_allow_html=True)
+        st.plotly_chart(fig_sent, use_container_width=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+
+@fragment
+def render_leaderboard(ds, selected_platforms):
+    # Reruns on its own when the audit scope changes; such reruns get their own timer
+    timer = st.session_state.get("_run_timer")
+    fragment_run = timer is None
+    if fragment_run:
+        timer = start_timer()
+
+    # --- TIER 4: CONTENT AUDIT ---
+    # --- TIER 4: CONTENT AUDIT ---
+    st.markdown('<div class="ops-section-title">🏆 热门稿件排行榜</div>', unsafe_allow_html=True)
+    
+    # 4.1 Local Platform Filter
+    audit_platforms = ["全平台"] + selected_platforms
+    selected_audit_plat = st.radio("审计范围筛选:", audit_platforms, horizontal=True, label_visibility="collapsed")
+
+    # 4.2 Merge the precomputed per-platform top-K lists of the audit scope
+    scope = selected_platforms if selected_audit_plat == "全平台" else [selected_audit_plat]
+    with timer.stage("leaderboard.compute"):
+        top_csi = ds.leaderboard('raw_csi', scope)[['标题', '发布平台', '传播指数', '点赞数', '评论数', '转发数', '发布时间']]
+        top_comments = ds.leaderboard('评论数', scope)[['标题', '发布平台', '评论数', '点赞数', '发布时间']]
+
+    tab1, tab2 = st.tabs(["🔥 优质传播热度榜 (CSI Top 20)", "💬 评论活跃榜 Top 20"])
+    
+    with timer.stage("leaderboard.render"):
         with tab1:
             # Sort by CSI Index
-            top_csi = audit_df.nlargest(20, '传播指数')[['标题', '发布平台', '传播指数', '点赞数', '评论数', '转发数', '发布时间']]
             # Format float to 1 decimal place
             st.dataframe(
                 top_csi.style.format({'传播指数': '{:.1f}'}), 
@@ -328,9 +440,158 @@ def main():
             )
         
         with tab2:
-            top_comments = audit_df.nlargest(20, '评论数')[['标题', '发布平台', '评论数', '点赞数', '发布时间']]
             st.dataframe(top_comments, use_container_width=True, hide_index=True)
 
+    if fragment_run:
+        finish_timer(timer, "leaderboard")
+
+def explorer_filters(platforms, selected_platforms, bounds, window):
+    # Keyword, platforms, publish window and sort of the explorer
+    col_keyword, col_platforms = st.columns([2, 3])
+    with col_keyword:
+        keyword = st.text_input("标题关键词", placeholder="输入标题关键词，空格分隔多个词")
+    with col_platforms:
+        chosen = st.multiselect("检索平台", platforms, default=selected_platforms)
+    col_window, col_sort, col_order, col_size = st.columns([2, 1, 1, 1])
+    start = end = None
+    if bounds is not None:
+        with col_window:
+            picked = st.date_input("发布日期", value=window or bounds, min_value=bounds[0], max_value=bounds[1])
+        picked = normalize_window(bounds, picked)
+        # The whole range also keeps articles without a publish time
+        if picked != tuple(bounds):
+            start, end = picked
+    with col_sort:
+        sort = EXPLORER_SORTS[st.selectbox("排序字段", list(EXPLORER_SORTS))]
+    with col_order:
+        descending = st.selectbox("排序方向", ["降序", "升序"]) == "降序"
+    with col_size:
+        size = st.selectbox("每页篇数", EXPLORER_PAGE_SIZES)
+    return dict(platforms=chosen, start=start, end=end, keyword=keyword, sort=sort, descending=descending,
+                size=size)
+
+@fragment
+def render_explorer(ds, store, selected_platforms, window=None):
+    # Paging and filtering rerun only this section; the store or the frame returns one page
+    timer = st.session_state.get("_run_timer")
+    fragment_run = timer is None
+    if fragment_run:
+        timer = start_timer()
+
+    # --- TIER 5: ARTICLE EXPLORER ---
+    st.markdown('<div class="ops-section-title">🔎 稿件检索</div>', unsafe_allow_html=True)
+    if store is not None:
+        source, platforms, bounds = store, store.platforms(), store.date_bounds()
+    elif ds.loader is not None and not st.session_state.get("explorer_open"):
+        # Started from a snapshot: every article row is only loaded once asked for
+        if not st.button("加载全部稿件以检索"):
+            return
+        st.session_state["explorer_open"] = True
+    if store is None:
+        source = ds.full()
+        platforms, bounds = source.platforms, source.date_bounds(source.platforms)
+
+    query = explorer_filters(platforms, selected_platforms, bounds, window)
+    # A new query starts again from its first page
+    if st.session_state.get("explorer_query") != query:
+        st.session_state["explorer_query"] = query
+        st.session_state["explorer_page"] = 1
+    page = st.session_state.get("explorer_page", 1)
+    with timer.stage("explorer.query"):
+        rows, total = source.explore(page=page - 1, columns=EXPLORER_COLUMNS, **query)
+        pages = max(1, -(-total // query['size']))
+        if page > pages:
+            page = st.session_state["explorer_page"] = pages
+            rows, total = source.explore(page=page - 1, columns=EXPLORER_COLUMNS, **query)
+
+    with timer.stage("explorer.render"):
+        st.dataframe(rows[[col for col in EXPLORER_COLUMNS if col in rows.columns]],
+                     use_container_width=True, hide_index=True,
+                     column_config={"原文链接": st.column_config.LinkColumn("原文链接")})
+        col_info, col_page = st.columns([3, 1])
+        with col_info:
+            st.caption(f"共 {total:,} 篇 · 第 {page} / {pages} 页")
+        with col_page:
+            st.number_input("页码", min_value=1, max_value=pages, key="explorer_page", label_visibility="collapsed")
+
+    if fragment_run:
+        finish_timer(timer, "explorer")
+
+def main():
+    timer = start_timer()
+    st.session_state["_run_timer"] = timer
+
+    # Sidebar Filters
+    with st.sidebar:
+        st.markdown("### 🛠️ 运营过滤控制")
+        uploaded_file = st.file_uploader("导入原始监测报表", type=["xlsx", "parquet", "csv"])
+    
+    store = None
+    with timer.stage("load"):
+        if uploaded_file is None and STORE_PATH:
+            store = _open_store(STORE_PATH)
+            ds = None
+        elif uploaded_file is None:
+            try:
+                ds = load_data(DATA_PATH)
+            except:
+                st.warning("请上传报表进行分析")
+                return
+        else:
+            ds = load_data(uploaded_file)
+
+    # Header logic: the shared report shows its file version, the store its latest
+    # ingestion, uploads the load time
+    if store is not None:
+        updated = store.version() or datetime.now()
+    else:
+        updated = ds.version if ds is not None and ds.version is not None else datetime.now()
+    st.markdown("""
+        <div class="ops-header">
+            <div class="ops-title">📊 新华社矩阵运营驾驶舱 <span class="ops-badge">Live Ops</span></div>
+            <div style="color: #64748b; font-size: 0.8rem;">数据更新：""" + updated.strftime("%Y-%m-%d %H:%M") + """</div>
+        </div>
+    """, unsafe_allow_html=True)
+
+    if store is not None:
+        selected_platforms, window = store_filters(store)
+        if window is None:
+            st.warning("本地数据库暂无数据，请先运行 scripts/ingest_store.py 导入报表")
+        else:
+            with timer.stage("query"):
+                ds = _query_store(STORE_PATH, store.version(), tuple(selected_platforms), *window)
+    elif ds is not None:
+        # Sidebar dynamic filters
+        platforms = ds.platforms
+        with st.sidebar:
+            st.markdown("### 🎯 监测对象")
+            selected_platforms = st.multiselect("选择观察平台", platforms, default=platforms)
+            st.markdown("---")
+
+    if ds is not None:
+        # Every KPI and chart in Tiers 1-3 is a slice of the platform × day cube
+        with timer.stage("filter"):
+            totals = ds.totals(selected_platforms)
+
+        # Dynamic Insight Calculation (placed after filtering)
+        with timer.stage("sidebar_insight"):
+            if not totals.empty:
+                render_insight(ds, selected_platforms)
+        with timer.stage("sidebar_anomalies"):
+            render_anomalies(ds, selected_platforms)
+
+        render_memory(ds)
+        render_overview(ds, selected_platforms, timer)
+        render_trends(ds, selected_platforms, timer)
+        render_interactions(ds, selected_platforms, timer)
+        render_sentiment(ds, selected_platforms, timer)
+        render_leaderboard(ds, selected_platforms)
+        render_explorer(ds, store, selected_platforms, window if store is not None else None)
+
+    st.session_state["_run_timer"] = None
+    render_timings(timer)
+    finish_timer(timer, "full")
+
 
 if __name__ == "__main__":
     main()
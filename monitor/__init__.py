@@ -0,0 +1 @@
+"""Shared data components for the Xinhua matrix dashboard and its scripts."""
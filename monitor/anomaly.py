@@ -0,0 +1,153 @@
+import math
+from datetime import date, timedelta
+
+import pandas as pd
+
+from monitor.rollup import INTERACTION_COLUMNS
+
+# Daily series watched per platform
+METRICS = ['篇数', '阅读数', '互动量']
+# Smoothing of the rolling mean/variance: weight of the newest day
+ALPHA = 0.3
+# Days of history a series needs before its days are judged
+WARMUP_DAYS = 7
+# Days more than this many (floored) standard deviations from the EWMA are flagged
+Z_THRESHOLD = 3.0
+# Floor of the (log-scale) standard deviation, about ±10%, so near-constant
+# series are not flagged for small wobbles
+MIN_STD = 0.1
+STATE_VERSION = 1
+
+FLAG_COLUMNS = ['发布平台', '日期', '指标', '数值', '预期', '偏离', '类型']
+KIND_LABELS = {'spike': '激增', 'drop': '骤降', 'zero': '归零'}
+
+
+def daily_metrics(cube):
+    """Daily 篇数, 阅读数 and 互动量 per platform from a platform × day cube (undated cells dropped)."""
+    cells = cube.reset_index()
+    cells = cells[cells['日期'].notna()]
+    return pd.DataFrame({
+        '发布平台': cells['发布平台'].astype(object).to_numpy(),
+        '日期': pd.to_datetime(cells['日期']).dt.date.to_numpy(),
+        '篇数': cells['篇数'].astype('float64').to_numpy(),
+        '阅读数': cells['阅读数'].astype('float64').to_numpy(),
+        '互动量': cells[INTERACTION_COLUMNS].astype('float64').sum(axis=1).to_numpy(),
+    })
+
+
+def _ewma(stats, value, alpha):
+    """One day's update of ``[mean, variance, days]`` (exponentially weighted)."""
+    mean, var, days = stats
+    if days == 0:
+        return [value, 0.0, 1]
+    diff = value - mean
+    step = alpha * diff
+    return [mean + step, (1 - alpha) * (var + diff * step), days + 1]
+
+
+class AnomalyDetector:
+    """Per-platform EWMA mean and variance of the daily series, updated a day at a time.
+
+    Each platform's state is its last closed day and, per metric, the rolling
+    mean, variance and number of days seen of ``log1p(value)`` (so a viral
+    day is judged by its ratio to normal, not its raw size); ``update`` folds
+    in only the days after it, so a merge costs its new rows, not the
+    history. The newest day stays open (it may still be filling) until a
+    later day shows up anywhere. Days without a single article count as
+    zero, so a platform that stops delivering is caught, not skipped. A
+    closed day is judged before it is folded in: 'spike' or 'drop' beyond
+    ``threshold`` deviations, 'zero' for a drop to nothing (e.g. a crawler
+    that returned no reads). Data arriving for closed days later does not
+    change the statistics.
+    """
+
+    def __init__(self, state=None, alpha=ALPHA, warmup=WARMUP_DAYS, threshold=Z_THRESHOLD):
+        state = state or {}
+        self.alpha = alpha
+        self.warmup = warmup
+        self.threshold = threshold
+        self.platforms = state.get('platforms', {})
+        self.flags = state.get('flags', [])
+
+    def state(self):
+        """JSON-serializable state, for ``AnomalyDetector(state)``."""
+        return {'version': STATE_VERSION, 'platforms': self.platforms, 'flags': self.flags}
+
+    def resume_day(self):
+        """First day ``update`` still needs (None: everything)."""
+        closed = [entry['closed'] for entry in self.platforms.values()]
+        if not closed or None in closed:
+            return None
+        return date.fromisoformat(min(closed)) + timedelta(days=1)
+
+    def _judge(self, platform, day, metric, value, stats):
+        mean, var, days = stats
+        if days < self.warmup:
+            return None
+        deviation = (math.log1p(value) - mean) / max(math.sqrt(var), MIN_STD)
+        if deviation >= self.threshold:
+            kind = 'spike'
+        elif deviation <= -self.threshold:
+            kind = 'zero' if value == 0 else 'drop'
+        else:
+            return None
+        return {'platform': platform, 'day': day.isoformat(), 'metric': metric, 'value': value,
+                'expected': round(math.expm1(mean), 2), 'score': round(deviation, 2), 'kind': kind}
+
+    def update(self, daily):
+        """Fold in the closed days of ``daily`` (see ``daily_metrics``) after each platform's state.
+
+        Only rows from ``resume_day`` on are needed. Returns the new flags.
+        """
+        if daily.empty:
+            return []
+        newest = max(daily['日期'])
+        flags = []
+        groups = dict(list(daily.groupby('发布平台', sort=False)))
+        for platform in list(self.platforms) + [p for p in groups if p not in self.platforms]:
+            entry = self.platforms.setdefault(platform, {'closed': None, 'stats': {}})
+            rows = groups.get(platform)
+            if entry['closed'] is not None:
+                first = date.fromisoformat(entry['closed']) + timedelta(days=1)
+            elif rows is not None:
+                first = min(rows['日期'])
+            else:
+                continue
+            last = newest - timedelta(days=1)
+            if last < first:
+                continue
+            values = pd.DataFrame(0.0, index=pd.date_range(first, last).date, columns=METRICS)
+            if rows is not None:
+                rows = rows[(rows['日期'] >= first) & (rows['日期'] <= last)]
+                values.loc[rows['日期'].to_numpy(), METRICS] = rows[METRICS].to_numpy()
+            for day, *day_values in values.itertuples(name=None):
+                for metric, value in zip(METRICS, day_values):
+                    stats = entry['stats'].get(metric, [0.0, 0.0, 0])
+                    flag = self._judge(platform, day, metric, float(value), stats)
+                    if flag is not None:
+                        flags.append(flag)
+                    entry['stats'][metric] = _ewma(stats, math.log1p(value), self.alpha)
+            entry['closed'] = last.isoformat()
+        flags.sort(key=lambda f: (f['day'], f['platform'], METRICS.index(f['metric'])))
+        self.flags.extend(flags)
+        return flags
+
+
+def flag_frame(flags):
+    """Flags as a frame with FLAG_COLUMNS, latest day first."""
+    frame = pd.DataFrame([(f['platform'], date.fromisoformat(f['day']), f['metric'], f['value'], f['expected'],
+                           f['score'], f['kind']) for f in flags], columns=FLAG_COLUMNS)
+    return frame.sort_values(['日期', '发布平台'], ascending=[False, True], kind='stable').reset_index(drop=True)
+
+
+def describe_flag(flag):
+    """One log line for a row of ``flag_frame``."""
+    return (f"{flag['发布平台']} {flag['日期']} {flag['指标']} {KIND_LABELS[flag['类型']]}: "
+            f"{flag['数值']:,.0f} (expected ~{flag['预期']:,.0f})")
+
+
+def detect_anomalies(cube):
+    """Flags of every closed day of a platform × day cube, from a fresh detector."""
+    detector = AnomalyDetector()
+    detector.update(daily_metrics(cube))
+    return flag_frame(detector.flags)
@@ -0,0 +1,210 @@
+import hashlib
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from monitor.incremental import file_fingerprint
+from monitor.leaderboard import raw_csi
+from monitor.timestamps import parse_timestamps
+
+logger = logging.getLogger(__name__)
+
+METRIC_COLUMNS = ['阅读数', '点赞数', '评论数', '转发数']
+
+CACHE_DIR = os.environ.get(
+    "MONITOR_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache"),
+)
+# Columns the dashboard reads on every rerun. In compact mode everything else
+# (摘要, 主题词, ...) stays on disk and is fetched with load_columns().
+RESIDENT_COLUMNS = ['发布平台', '标题', '发布时间', '日期', '情感属性', '作者'] + METRIC_COLUMNS + ['raw_csi']
+CATEGORY_COLUMNS = ['发布平台', '情感属性', '作者']
+
+# Bump whenever read_report's output changes so stale cache files are ignored.
+CACHE_VERSION = 4
+CACHE_KEEP = 8
+# Rows per row group of a cache file; a page of non-resident columns only
+# reads the groups holding its rows.
+CACHE_ROW_GROUP = 10_000
+
+
+def _suffix(file):
+    name = file if isinstance(file, (str, os.PathLike)) else getattr(file, "name", "")
+    return os.path.splitext(str(name))[1].lower()
+
+
+def read_table(file):
+    """Raw rows of a report: a workbook, or a Parquet/CSV file written by the merge."""
+    suffix = _suffix(file)
+    if suffix == ".parquet":
+        return pd.read_parquet(file)
+    if suffix == ".csv":
+        return pd.read_csv(file, encoding="utf-8-sig")
+    return pd.read_excel(file)
+
+
+def read_report(file):
+    """Parse a monitoring report and apply the dashboard's column coercions."""
+    return prepare_report(read_table(file))
+
+
+def prepare_report(df):
+    """Column coercions applied to every freshly parsed report."""
+    # Force numeric types
+    for col in METRIC_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+    if {'点赞数', '评论数', '转发数'} <= set(df.columns):
+        df['raw_csi'] = raw_csi(df)
+
+    if '发布时间' in df.columns:
+        df['发布时间'], failures = parse_timestamps(df['发布时间'], key='发布时间')
+        if failures:
+            logger.warning("%d rows have an unparseable 发布时间 and no 日期", failures)
+        df['日期'] = df['发布时间'].dt.date
+
+    # Columns mixing numbers and text (e.g. 粉丝数 = 1200 / '暂无') cannot be
+    # stored column-wise; keep them as text so cached and fresh loads agree.
+    for col in df.columns:
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True).startswith('mixed'):
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+def content_hash(file):
+    """SHA-256 of a workbook given as a path or an uploaded file object."""
+    if isinstance(file, (str, os.PathLike)):
+        return file_fingerprint(file)
+    data = file.getvalue() if hasattr(file, "getvalue") else file.read()
+    return hashlib.sha256(data).hexdigest()
+
+
+def cache_path(digest, cache_dir=None):
+    return os.path.join(cache_dir or CACHE_DIR, f"{digest}-v{CACHE_VERSION}.parquet")
+
+
+def compact_frame(df, keep_text=True):
+    """Shrink a loaded report: categorical labels, narrowest integer metrics.
+
+    Metrics are downcast only when every value is integral, so sums and the
+    CSI score are unchanged. With ``keep_text=False`` columns outside
+    RESIDENT_COLUMNS are dropped.
+    """
+    if not keep_text:
+        df = df[[col for col in df.columns if col in RESIDENT_COLUMNS]]
+    df = df.copy()
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    for col in METRIC_COLUMNS + ['raw_csi']:
+        if col not in df.columns or df[col].dtype.kind not in 'fiu':
+            continue
+        values = df[col]
+        if values.dtype.kind == 'f':
+            if not (values.notna().all() and (values == values.round()).all()):
+                continue
+            values = values.astype('int64')
+        downcast = 'unsigned' if (values >= 0).all() else 'integer'
+        df[col] = pd.to_numeric(values, downcast=downcast)
+    return df
+
+
+def memory_report(df):
+    """Bytes held by each column of ``df``, largest first."""
+    usage = df.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({'列': usage.index, '类型': df.dtypes.astype(str).to_numpy(), '字节': usage.to_numpy()})
+    return report.sort_values('字节', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def restore_dates(df):
+    """Missing 日期 values back to NaT, as ``prepare_report`` leaves them (Parquet reads them as None)."""
+    if '日期' in df.columns and df['日期'].dtype == object:
+        df['日期'] = df['日期'].where(df['日期'].notna(), pd.NaT)
+    return df
+
+
+def _read_cache(path, compact):
+    if not compact:
+        return restore_dates(pd.read_parquet(path))
+    import pyarrow.parquet as pq
+    names = pq.read_schema(path).names
+    df = pd.read_parquet(path, columns=[col for col in names if col in RESIDENT_COLUMNS])
+    return compact_frame(restore_dates(df))
+
+
+def load_report(file, cache_dir=None, digest=None, compact=False):
+    """Load a report through the columnar cache keyed by its content hash.
+
+    The first load of a given file parses it (Excel, or a merge's Parquet/CSV
+    output) and writes a Parquet copy of the coerced frame; later loads
+    (including re-uploads of identical bytes) read that copy instead.
+    Caching is skipped silently when no Parquet engine is available or the
+    cache directory is not writable.
+
+    With ``compact=True`` the frame is shrunk by ``compact_frame``; text
+    columns the dashboard does not use are left out when the cache holds
+    them, and can be read later with ``load_columns``.
+    """
+    digest = digest or content_hash(file)
+    path = cache_path(digest, cache_dir)
+    if os.path.exists(path):
+        try:
+            return _read_cache(path, compact)
+        except Exception:
+            pass  # unreadable cache file: rebuild it below
+
+    if hasattr(file, "seek"):
+        file.seek(0)
+    df = read_report(file)
+    cached = False
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        df.to_parquet(tmp_path, index=False, row_group_size=CACHE_ROW_GROUP)
+        os.replace(tmp_path, path)
+        _prune(os.path.dirname(path))
+        cached = True
+    except Exception:
+        pass  # the cache is an optimisation only
+    if compact:
+        df = compact_frame(df, keep_text=not cached)
+    return df
+
+
+def load_columns(digest, columns, cache_dir=None, rows=None):
+    """Read selected columns of a cached report on demand (None if not cached).
+
+    With ``rows`` (row positions) only the row groups holding them are read,
+    and the result has one row per position, in the order given.
+    """
+    path = cache_path(digest, cache_dir)
+    if not os.path.exists(path):
+        return None
+    import pyarrow.parquet as pq
+    parquet = pq.ParquetFile(path)
+    columns = [col for col in columns if col in parquet.schema_arrow.names]
+    if rows is None:
+        return parquet.read(columns=columns).to_pandas()
+    rows = np.asarray(rows, dtype=np.int64)
+    sizes = [parquet.metadata.row_group(i).num_rows for i in range(parquet.num_row_groups)]
+    starts = np.concatenate([[0], np.cumsum(sizes)])
+    owner = np.searchsorted(starts, rows, side='right') - 1
+    groups = np.unique(owner)
+    # Where each read group starts once the groups are concatenated
+    offsets = np.zeros(len(starts), dtype=np.int64)
+    offsets[groups] = np.concatenate([[0], np.cumsum(np.asarray(sizes)[groups])[:-1]])
+    table = parquet.read_row_groups(groups.tolist(), columns=columns)
+    return table.take(rows - starts[owner] + offsets[owner]).to_pandas()
+
+
+def _prune(cache_dir):
+    """Keep only the CACHE_KEEP most recently written cache files."""
+    files = [os.path.join(cache_dir, f) for f in os.listdir(cache_dir) if f.endswith(".parquet")]
+    files.sort(key=os.path.getmtime, reverse=True)
+    for stale in files[CACHE_KEEP:]:
+        try:
+            os.remove(stale)
+        except OSError:
+            pass
@@ -0,0 +1,173 @@
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from monitor.anomaly import detect_anomalies
+from monitor.data import content_hash, load_columns, load_report, memory_report
+from monitor.explorer import TitleIndex, article_page
+from monitor.leaderboard import build_topk_index, csi_leaderboard, top_articles
+from monitor.rollup import (best_platform, build_cube, daily_counts, date_bounds, kpi_summary, platform_totals,
+                            platform_volume, sentiment_counts, sentiment_shares, trend_counts)
+
+# Trend windows other than a selection's full date range kept per dataset (least recently used dropped)
+TREND_CACHE_SIZE = 32
+
+
+class Dataset:
+    """A loaded report plus the aggregates derived from it once at load time.
+
+    ``cube``, the platform × sentiment ``sentiments`` table and the
+    ``anomalies`` flags may be passed in when they were computed elsewhere
+    (e.g. by the article store or a snapshot), in which case ``df`` only
+    needs the leaderboard rows. Everything the dashboard shows for a platform
+    selection is computed through ``view`` and memoized in ``views``.
+    """
+
+    def __init__(self, df, digest=None, cache_dir=None, cube=None, platforms=None, sentiments=None,
+                 anomalies=None):
+        self.df = df
+        self.digest = digest
+        self.cache_dir = cache_dir
+        # Data version (source file modification time) when known
+        self.version = None
+        self.cube = build_cube(df) if cube is None else cube
+        self.sentiments = sentiment_counts(df) if sentiments is None else sentiments
+        self.topk = build_topk_index(df)
+        # Platforms in report order (the filter's options)
+        self.platforms = df['发布平台'].unique().tolist() if platforms is None else list(platforms)
+        self.views = {}
+        # Ad-hoc trend windows: bounded, since a shared dataset lives as long as the process
+        self._trends = OrderedDict()
+        self._trends_lock = threading.Lock()
+        # Flagged days of every platform, detected from the cube on first use unless given
+        self.flags = anomalies
+        # Loads the complete dataset when this one holds only some rows (a snapshot)
+        self.loader = None
+        self._full = None
+        self._memory = None
+
+    def full(self):
+        """The dataset with every article row: this one, or the one ``loader`` loads on first use."""
+        if self.loader is None:
+            return self
+        if self._full is None:
+            self._full = self.loader()
+        return self._full
+
+    def view(self, name, platforms, compute):
+        """``compute()`` for the named view of a platform selection, computed once.
+
+        Views are keyed on the set of platforms, not the order they were picked in.
+        """
+        key = (name, tuple(sorted(platforms)))
+        if key not in self.views:
+            self.views[key] = compute()
+        return self.views[key]
+
+    def totals(self, platforms):
+        return self.view('totals', platforms, lambda: platform_totals(self.cube, platforms))
+
+    def kpis(self, platforms):
+        return self.view('kpis', platforms, lambda: kpi_summary(self.totals(platforms)))
+
+    def insight(self, platforms):
+        return self.view('insight', platforms, lambda: best_platform(self.totals(platforms)))
+
+    def volume(self, platforms):
+        return self.view('volume', platforms, lambda: platform_volume(self.totals(platforms)))
+
+    def daily(self, platforms):
+        return self.view('daily', platforms, lambda: daily_counts(self.cube, platforms))
+
+    def date_bounds(self, platforms):
+        return self.view('bounds', platforms, lambda: date_bounds(self.cube, platforms))
+
+    def trend(self, platforms, start, end, freq):
+        """Article counts per platform and day/week/month bucket within a window.
+
+        Only the selection's full date range is memoized with the other views;
+        narrower windows go through a small LRU cache of ``TREND_CACHE_SIZE``.
+        """
+        def compute():
+            return trend_counts(self.cube, platforms, start, end, freq)
+        if (start, end) == self.date_bounds(platforms):
+            return self.view(f'trend.{freq}', platforms, compute)
+        key = (freq, start, end, tuple(sorted(platforms)))
+        with self._trends_lock:
+            if key in self._trends:
+                self._trends.move_to_end(key)
+                return self._trends[key]
+        trend = compute()
+        with self._trends_lock:
+            self._trends[key] = trend
+            while len(self._trends) > TREND_CACHE_SIZE:
+                self._trends.popitem(last=False)
+        return trend
+
+    def comps(self, platforms):
+        """Read totals and interaction breakdown per platform (Tier 3)."""
+        def compute():
+            totals = self.totals(platforms)
+            return totals['阅读数'].reset_index(), totals[['点赞数', '评论数', '转发数']].reset_index()
+        return self.view('comps', platforms, compute)
+
+    def sentiment(self, platforms):
+        """Sentiment mix (count and share of each label) per platform."""
+        return self.view('sentiment', platforms, lambda: sentiment_shares(self.sentiments, platforms))
+
+    def anomalies(self, platforms):
+        """Days flagged by the EWMA detector for the platforms, latest first."""
+        if self.flags is None:
+            self.flags = detect_anomalies(self.cube)
+        return self.view('anomalies', platforms,
+                         lambda: self.flags[self.flags['发布平台'].isin(platforms)].reset_index(drop=True))
+
+    def leaderboard(self, metric, platforms):
+        """Top articles of the platforms by ``metric`` ('raw_csi' adds the 0-100 传播指数)."""
+        if metric == 'raw_csi':
+            return self.view('csi', platforms, lambda: csi_leaderboard(self.df, self.topk, platforms))
+        return self.view(f'top.{metric}', platforms, lambda: top_articles(self.df, self.topk, platforms, metric))
+
+    def columns(self, columns, positions=None):
+        """The requested columns, reading any that are not resident from the cache.
+
+        With ``positions`` only those rows are returned, and only they are
+        read from the cache.
+        """
+        frame = self.df if positions is None else self.df.iloc[positions]
+        missing = [col for col in columns if col not in frame.columns]
+        frame = frame[[col for col in columns if col in frame.columns]]
+        extra = load_columns(self.digest, missing, self.cache_dir, rows=positions) if missing and self.digest else None
+        if extra is None:
+            return frame
+        extra.index = frame.index
+        frame = pd.concat([frame, extra], axis=1)
+        return frame[[col for col in columns if col in frame.columns]]
+
+    def explore(self, platforms, start=None, end=None, keyword="", sort='发布时间', descending=True,
+                page=0, size=20, columns=None):
+        """One server-sorted page of the article explorer as ``(rows, total)``.
+
+        The title index is built on the first search. Only the page's rows
+        are returned, with ``columns`` (read from the cache if not resident).
+        """
+        index = self.view('title_index', (), lambda: TitleIndex(self.df['标题'])) if keyword.strip() else None
+        positions, total = article_page(self.df, index, platforms, start, end, keyword, sort, descending,
+                                        page, size)
+        if columns is None:
+            return self.df.iloc[positions], total
+        return self.columns(columns, positions), total
+
+    @property
+    def memory(self):
+        """Per-column memory report of the resident frame (computed once)."""
+        if self._memory is None:
+            self._memory = memory_report(self.df)
+        return self._memory
+
+
+def load_dataset(file, cache_dir=None, compact=False):
+    """Load a workbook (through the columnar cache) and build its aggregates."""
+    digest = content_hash(file)
+    return Dataset(load_report(file, cache_dir=cache_dir, digest=digest, compact=compact), digest, cache_dir)
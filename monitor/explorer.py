@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+# Columns the explorer can sort by
+SORT_COLUMNS = ['发布时间', '阅读数', '点赞数', '评论数', '转发数', 'raw_csi']
+PAGE_SIZE = 20
+
+
+def normalize_text(values):
+    """Searchable form of titles: half-width (NFKC) and lower-case; missing titles become ''."""
+    values = pd.Series(values, dtype=object)
+    return values.where(values.notna(), '').map(str).str.normalize('NFKC').str.lower()
+
+
+class TitleIndex:
+    """Character-bigram inverted index over titles for substring search.
+
+    Every bigram of every normalized title is encoded as one integer and
+    stored with its row in a sorted posting array, built in a few vectorized
+    passes. A search term's rows are the intersection of its bigrams'
+    postings, confirmed by an exact substring check on those candidates
+    only; single-character terms scan the titles.
+    """
+
+    def __init__(self, titles):
+        self.titles = normalize_text(titles).to_numpy()
+        lengths = np.fromiter((len(t) for t in self.titles), dtype=np.int64, count=len(self.titles))
+        codes = np.frombuffer(''.join(self.titles).encode('utf-32-le'), dtype=np.uint32).astype(np.int64)
+        owner = np.repeat(np.arange(len(self.titles)), lengths)
+        # Code points fit in 21 bits; pairs that straddle two titles are dropped
+        inside = owner[:-1] == owner[1:]
+        grams = ((codes[:-1] << 21) | codes[1:])[inside]
+        rows = owner[:-1][inside]
+        order = np.lexsort((rows, grams))
+        grams, rows = grams[order], rows[order]
+        first = np.ones(len(grams), dtype=bool)
+        first[1:] = (grams[1:] != grams[:-1]) | (rows[1:] != rows[:-1])
+        self.grams = grams[first]
+        self.rows = rows[first]
+
+    def _postings(self, gram):
+        lo = np.searchsorted(self.grams, gram, side='left')
+        hi = np.searchsorted(self.grams, gram, side='right')
+        return self.rows[lo:hi]
+
+    def _term(self, term):
+        if len(term) < 2:
+            return np.flatnonzero(pd.Series(self.titles).str.contains(term, regex=False).to_numpy())
+        codes = np.frombuffer(term.encode('utf-32-le'), dtype=np.uint32).astype(np.int64)
+        postings = sorted((self._postings(g) for g in set((codes[:-1] << 21) | codes[1:])), key=len)
+        candidates = postings[0]
+        for rows in postings[1:]:
+            if not len(candidates):
+                break
+            candidates = np.intersect1d(candidates, rows, assume_unique=True)
+        return candidates[np.fromiter((term in self.titles[r] for r in candidates), dtype=bool,
+                                      count=len(candidates))]
+
+    def search(self, query):
+        """Sorted positions of the titles containing every whitespace-separated term of ``query``."""
+        hits = None
+        for term in normalize_text([query]).iloc[0].split():
+            rows = self._term(term)
+            hits = rows if hits is None else np.intersect1d(hits, rows, assume_unique=True)
+        return np.arange(len(self.titles)) if hits is None else hits
+
+
+def article_page(df, index, platforms, start=None, end=None, keyword="", sort='发布时间', descending=True,
+                 page=0, size=PAGE_SIZE):
+    """One page of the matching articles, sorted on the server, plus the number of matches.
+
+    Filters are the platforms, the publish-day window ``[start, end]`` (rows
+    without a time only show when no window is given) and the title search
+    ``keyword``. Ties and missing values keep report order, missing last.
+    Returns ``(positions, total)`` with the row positions of the page.
+    """
+    mask = df['发布平台'].isin(platforms).to_numpy()
+    if start is not None:
+        times = df['发布时间']
+        mask = mask & ((times >= pd.Timestamp(start)) & (times < pd.Timestamp(end) + pd.Timedelta(days=1))).to_numpy()
+    rows = np.flatnonzero(mask)
+    if keyword.strip():
+        rows = np.intersect1d(rows, index.search(keyword), assume_unique=True)
+    values = df[sort].iloc[rows].reset_index(drop=True)
+    rows = rows[values.sort_values(ascending=not descending, kind='stable', na_position='last').index.to_numpy()]
+    return rows[page * size:(page + 1) * size], len(rows)
@@ -0,0 +1,134 @@
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+# Site names the crawls append to titles, e.g. "标题｜新华网"
+SITE_SUFFIXES = ('新华社客户端', '新华网', '新华社', '新华视点')
+_SUFFIX = re.compile(r'[\s|_\-—–·:]+(?:' + '|'.join(SITE_SUFFIXES) + r')\s*$')
+_NOISE = re.compile(r'[\W_]+')
+
+NGRAM = 2
+NUM_PERM = 64
+# 16 bands of 4 rows: pairs around Jaccard 0.5 and above become candidates
+BANDS = 16
+BLOCK_TITLES = 20_000
+
+
+def normalize_title(title):
+    """Comparable form of a title: half-width, lower-case, no site suffix, whitespace or punctuation."""
+    if not isinstance(title, str):
+        return ""
+    text = unicodedata.normalize('NFKC', title).strip()
+    text = _SUFFIX.sub('', text)
+    return _NOISE.sub('', text).lower()
+
+
+def shingles(text, n=NGRAM):
+    """Character n-grams of a normalized title (the whole title if it is shorter)."""
+    if len(text) <= n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def _permutations(num_perm, seed=1):
+    # Odd multipliers: h -> a * h + b (mod 2**64) is then a permutation of 64-bit hashes
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, np.iinfo(np.uint64).max, num_perm, dtype=np.uint64, endpoint=True) | np.uint64(1)
+    b = rng.integers(0, np.iinfo(np.uint64).max, num_perm, dtype=np.uint64, endpoint=True)
+    return a, b
+
+
+def minhash(shingle_sets, num_perm=NUM_PERM):
+    """MinHash signatures (one row per set) of the given n-gram sets.
+
+    Shingles are hashed with pandas' stable hash and permuted as
+    ``a * h + b`` (mod 2**64) for ``num_perm`` fixed (a, b) pairs, a block
+    of titles at a time.
+    """
+    a, b = _permutations(num_perm)
+    signatures = np.empty((len(shingle_sets), num_perm), dtype=np.uint64)
+    for start in range(0, len(shingle_sets), BLOCK_TITLES):
+        block = shingle_sets[start:start + BLOCK_TITLES]
+        sizes = np.fromiter((len(s) for s in block), dtype=np.int64, count=len(block))
+        grams = np.fromiter((g for s in block for g in s), dtype=object, count=int(sizes.sum()))
+        hashes = pd.util.hash_array(grams)
+        with np.errstate(over='ignore'):
+            permuted = hashes[:, None] * a + b
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        signatures[start:start + len(block)] = np.minimum.reduceat(permuted, offsets, axis=0)
+    return signatures
+
+
+def _band_keys(signatures, bands):
+    """One hash per band of each signature, shape (rows, bands)."""
+    rows = signatures.shape[1] // bands
+    banded = signatures[:, :rows * bands].reshape(len(signatures), bands, rows)
+    return pd.util.hash_array(banded.reshape(-1, rows).view(f'V{8 * rows}').ravel()).reshape(len(signatures), bands)
+
+
+class FuzzyTitleIndex:
+    """MinHash/LSH blocking index over normalized titles.
+
+    Titles are split into character n-grams and summarized by MinHash
+    signatures; signatures are cut into bands and only titles sharing a
+    whole band with the query become candidates. Candidates are then scored
+    by the exact n-gram Jaccard similarity, so the cost grows with the
+    number of plausible pairs rather than with every pair. Blank titles are
+    never indexed or matched.
+    """
+
+    def __init__(self, titles, num_perm=NUM_PERM, bands=BANDS):
+        self.num_perm = num_perm
+        self.bands = bands
+        normalized = pd.Series(titles, dtype=object).map(normalize_title)
+        self.rows = np.flatnonzero((normalized != "").to_numpy())
+        self.titles = normalized.to_numpy()[self.rows]
+        self.shingles = [shingles(t) for t in self.titles]
+        keys = _band_keys(minhash(self.shingles, num_perm), bands)
+        self._buckets = pd.DataFrame({
+            'band': np.tile(np.arange(bands), len(self.rows)),
+            'key': keys.ravel(),
+            'entry': np.repeat(np.arange(len(self.rows)), bands),
+        })
+
+    def candidates(self, titles):
+        """``(query, row, score)`` frame of every blocked pair with its Jaccard score.
+
+        ``query`` is the position in ``titles`` and ``row`` the position in
+        the indexed titles.
+        """
+        normalized = pd.Series(titles, dtype=object).map(normalize_title)
+        queries = np.flatnonzero((normalized != "").to_numpy())
+        empty = pd.DataFrame({'query': np.array([], dtype=np.int64), 'row': np.array([], dtype=np.int64),
+                              'score': np.array([], dtype=float)})
+        if not len(queries) or not len(self.rows):
+            return empty
+        query_shingles = [shingles(t) for t in normalized.to_numpy()[queries]]
+        keys = _band_keys(minhash(query_shingles, self.num_perm), self.bands)
+        probe = pd.DataFrame({
+            'band': np.tile(np.arange(self.bands), len(queries)),
+            'key': keys.ravel(),
+            'probe': np.repeat(np.arange(len(queries)), self.bands),
+        })
+        pairs = probe.merge(self._buckets, on=['band', 'key'])[['probe', 'entry']].drop_duplicates()
+        if pairs.empty:
+            return empty
+        scores = [jaccard(query_shingles[p], self.shingles[e])
+                  for p, e in zip(pairs['probe'].to_numpy(), pairs['entry'].to_numpy())]
+        return pd.DataFrame({
+            'query': queries[pairs['probe'].to_numpy()],
+            'row': self.rows[pairs['entry'].to_numpy()],
+            'score': scores,
+        })
+
+    def matches(self, titles, threshold):
+        """Blocked pairs scoring at least ``threshold``, best first (ties by position)."""
+        pairs = self.candidates(titles)
+        pairs = pairs[pairs['score'] >= threshold]
+        return pairs.sort_values(['score', 'query', 'row'], ascending=[False, True, True], ignore_index=True)
@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+STATE_VERSION = 2
+
+
+def file_fingerprint(path, chunk_size=1 << 20):
+    """SHA-256 of a file's contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def row_hashes(df, columns=None):
+    """Stable 64-bit hash of each row (optionally restricted to ``columns``)."""
+    if columns is not None:
+        df = df[[c for c in columns if c in df.columns]]
+    if df.empty:
+        return np.zeros(len(df), dtype=np.uint64)
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def diff_rows(old_hashes, new_hashes):
+    """Compare a source's previous row hashes with its current ones.
+
+    Returns ``(changed, added)`` position arrays, or ``None`` when rows were
+    removed and positions can no longer be trusted.
+    """
+    old_hashes = np.asarray(old_hashes, dtype=np.uint64)
+    new_hashes = np.asarray(new_hashes, dtype=np.uint64)
+    watermark = len(old_hashes)
+    if len(new_hashes) < watermark:
+        return None
+    changed = np.flatnonzero(new_hashes[:watermark] != old_hashes)
+    added = np.arange(watermark, len(new_hashes))
+    return changed, added
+
+
+def hashes_path(path, name):
+    """Parquet file next to the state file ``path`` holding source ``name``'s row and key hashes."""
+    return f"{os.path.splitext(path)[0]}.{name}.hashes.parquet"
+
+
+def load_state(path):
+    """Load a persisted merge state, or ``None`` if missing or incompatible.
+
+    Each source's ``row_hashes`` and ``key_hashes`` are read back from its
+    Parquet file, which must match the fingerprint recorded in the state.
+    """
+    try:
+        with open(path, encoding="utf-8") as fh:
+            state = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if state.get("version") != STATE_VERSION:
+        return None
+    for name, entry in state["sources"].items():
+        hashes = hashes_path(path, name)
+        try:
+            if file_fingerprint(hashes) != entry.get("hashes"):
+                return None
+            frame = pd.read_parquet(hashes)
+        except (OSError, ValueError):
+            return None
+        entry["row_hashes"] = frame["row"].to_numpy(dtype=np.uint64)
+        entry["key_hashes"] = frame["key"].to_numpy(dtype=np.uint64)
+    return state
+
+
+def save_state(path, state):
+    """Write the merge state atomically so an interrupted run never corrupts it.
+
+    Per-row hashes grow with the sources, so they go to one Parquet file per
+    source (``hashes_path``) rather than into the JSON; only sources whose
+    ``hashes`` fingerprint is None (new or changed this run) are rewritten.
+    """
+    sources = {}
+    for name, entry in state["sources"].items():
+        fingerprint = entry.get("hashes")
+        if fingerprint is None:
+            hashes = hashes_path(path, name)
+            frame = pd.DataFrame({"row": np.asarray(entry["row_hashes"], dtype=np.uint64),
+                                  "key": np.asarray(entry["key_hashes"], dtype=np.uint64)})
+            frame.to_parquet(f"{hashes}.tmp", index=False)
+            os.replace(f"{hashes}.tmp", hashes)
+            fingerprint = file_fingerprint(hashes)
+        sources[name] = {k: v for k, v in entry.items() if k not in ("row_hashes", "key_hashes")}
+        sources[name]["hashes"] = fingerprint
+    state = dict(state, version=STATE_VERSION, sources=sources)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(state, fh, ensure_ascii=False)
+    os.replace(tmp_path, path)
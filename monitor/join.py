@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+
+def normalize_urls(values):
+    """Vectorized counterpart of ``clean_url``: strip strings, blank everything else."""
+    return pd.Series(values, dtype=object).map(lambda v: v.strip() if isinstance(v, str) else "")
+
+
+def normalize_titles(values):
+    """Vectorized counterpart of ``str(title).strip()`` (NaN becomes ``'nan'``)."""
+    return pd.Series(values, dtype=object).map(str).str.strip()
+
+
+def _first_positions(keys):
+    """Map every non-empty key to the first row position holding it and its row count."""
+    keys = pd.Series(np.asarray(keys, dtype=object))
+    valid = (keys != "").to_numpy()
+    positions = pd.Series(np.arange(len(keys)))[valid]
+    grouped = positions.groupby(keys[valid].to_numpy(), sort=False)
+    first = grouped.min()
+    return pd.Index(first.index), first.to_numpy(), grouped.size().to_numpy()
+
+
+class KeyIndex:
+    """Hash index over one back-trace source's URL and (optional) title keys.
+
+    ``resolve`` reproduces the original nested loop: for each lookup row the
+    winning record is the first one in source order whose URL or title equals
+    the row's key. Empty lookup keys never match.
+    """
+
+    def __init__(self, urls, titles=None):
+        self.size = len(urls)
+        self.urls = _first_positions(normalize_urls(urls))
+        self.titles = _first_positions(normalize_titles(titles)) if titles is not None else None
+
+    @staticmethod
+    def _lookup(index, keys):
+        keys_index, first, counts = index
+        hit = keys_index.get_indexer(np.asarray(keys, dtype=object))
+        found = hit >= 0
+        positions = np.full(len(keys), -1, dtype=np.int64)
+        dupes = np.zeros(len(keys), dtype=bool)
+        positions[found] = first[hit[found]]
+        dupes[found] = counts[hit[found]] > 1
+        return positions, dupes
+
+    def resolve(self, urls, titles=None):
+        """Return ``(positions, ambiguous)`` arrays for the given lookup keys.
+
+        ``positions`` holds the matched record position or ``-1``;
+        ``ambiguous`` flags rows for which more than one record qualified.
+        """
+        urls = normalize_urls(urls)
+        url_pos, ambiguous = self._lookup(self.urls, urls)
+        url_pos[(urls == "").to_numpy()] = -1
+        if self.titles is None or titles is None:
+            ambiguous &= url_pos >= 0
+            return url_pos, ambiguous
+
+        titles = normalize_titles(titles)
+        title_pos, title_dupes = self._lookup(self.titles, titles)
+        title_pos[(titles == "").to_numpy()] = -1
+
+        both = (url_pos >= 0) & (title_pos >= 0)
+        positions = np.where(url_pos >= 0, url_pos, title_pos)
+        positions[both] = np.minimum(url_pos[both], title_pos[both])
+        ambiguous = ((ambiguous & (url_pos >= 0))
+                     | (title_dupes & (title_pos >= 0))
+                     | (both & (url_pos != title_pos)))
+        return positions, ambiguous
+
+
+def join_source(index, urls, titles=None, mask=None):
+    """Resolve lookup rows against ``index``, restricted to rows in ``mask``.
+
+    Returns ``(positions, stats)`` where ``stats`` counts matched, missed and
+    ambiguous rows among the rows considered.
+    """
+    positions, ambiguous = index.resolve(urls, titles)
+    if mask is not None:
+        mask = np.asarray(mask, dtype=bool)
+        positions = np.where(mask, positions, -1)
+        ambiguous &= mask
+        considered = int(mask.sum())
+    else:
+        considered = len(positions)
+    matched = int((positions >= 0).sum())
+    stats = {
+        "matched": matched,
+        "missed": considered - matched,
+        "ambiguous": int(ambiguous.sum()),
+    }
+    return positions, stats
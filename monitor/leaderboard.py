@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+TOP_K = 20
+
+
+def raw_csi(df):
+    """CSI Algorithm: Likes*1 + Comments*2 + Shares*3."""
+    return df['点赞数'] + df['评论数'] * 2 + df['转发数'] * 3
+
+
+def build_topk_index(df, metrics=('raw_csi', '评论数'), k=TOP_K):
+    """Row positions of each platform's top-``k`` articles for every metric.
+
+    Ties are broken by row order, exactly like ``DataFrame.nlargest``, so the
+    top-``k`` of any set of platforms is always contained in the union of
+    their lists.
+    """
+    positions = pd.Series(np.arange(len(df)), index=df.index)
+    index = {}
+    for metric in metrics:
+        index[metric] = {}
+        for platform, group in df.groupby('发布平台', observed=True, sort=False):
+            top = group.nlargest(k, metric)
+            index[metric][platform] = positions[top.index].to_numpy()
+    return index
+
+
+def top_articles(df, index, platforms, metric, n=TOP_K):
+    """The ``n`` largest rows of ``metric`` over the given platforms.
+
+    Only the per-platform candidate lists are merged and ranked, so the cost
+    is O(platforms × k) regardless of how many articles the frame holds.
+    """
+    lists = [index[metric][p] for p in platforms if p in index[metric]]
+    if not lists:
+        return df.iloc[:0]
+    candidates = df.iloc[np.sort(np.concatenate(lists))]
+    return candidates.nlargest(n, metric)
+
+
+def csi_leaderboard(df, index, platforms, n=TOP_K):
+    """Top CSI articles with 传播指数 normalized to 0-100 against the scope's max."""
+    top = top_articles(df, index, platforms, 'raw_csi', n).copy()
+    # Standardization (0-100 Scale)
+    max_csi = top['raw_csi'].max() if not top.empty else 0
+    if max_csi > 0:
+        top['传播指数'] = (top['raw_csi'] / max_csi) * 100
+    else:
+        top['传播指数'] = 0
+    return top
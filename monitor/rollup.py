@@ -0,0 +1,137 @@
+import pandas as pd
+
+from monitor.data import METRIC_COLUMNS
+from monitor.sentiment import LABELS
+
+INTERACTION_COLUMNS = ['点赞数', '评论数', '转发数']
+
+# Trend buckets, finest first, with their length in days; the trend uses the
+# finest one that keeps each platform's series within TREND_MAX_POINTS
+TREND_BUCKETS = {'D': 1, 'W': 7, 'M': 30}
+TREND_MAX_POINTS = 90
+
+
+def build_cube(df):
+    """Platform × day rollup: article count and metric sums per (发布平台, 日期).
+
+    Rows without a date are kept under a NaN day so platform totals still
+    cover every article.
+    """
+    metrics = [col for col in METRIC_COLUMNS if col in df.columns]
+    # Sum compact (narrow integer) metrics in 64 bits so totals cannot overflow
+    values = df[['发布平台', '日期'] + metrics].astype({col: 'int64' for col in metrics if df[col].dtype.kind in 'iu'})
+    grouped = values.groupby(['发布平台', '日期'], dropna=False, observed=True, sort=True)
+    cube = grouped[metrics].sum()
+    cube.insert(0, '篇数', grouped.size())
+    return cube
+
+
+def slice_cube(cube, platforms):
+    """Cube cells of the selected platforms."""
+    return cube[cube.index.get_level_values('发布平台').isin(platforms)]
+
+
+def platform_totals(cube, platforms):
+    """Per-platform count and metric sums, sorted by platform name."""
+    totals = slice_cube(cube, platforms).groupby(level='发布平台', observed=True).sum()
+    return totals[totals['篇数'] > 0]
+
+
+def kpi_summary(totals):
+    """Headline numbers for Tier 1, from ``platform_totals``."""
+    count = int(totals['篇数'].sum())
+    return {
+        'count': count,
+        'reads': totals['阅读数'].sum(),
+        'interactions': totals[INTERACTION_COLUMNS].sum().sum(),
+        'avg_likes': (totals['点赞数'].sum() / count) if count > 0 else 0,
+        'platforms': len(totals),
+    }
+
+
+def best_platform(totals):
+    """Platform with the highest interactions per article, as ``(name, density)``."""
+    if totals.empty:
+        return None, None
+    density = totals[INTERACTION_COLUMNS].sum(axis=1) / totals['篇数']
+    return density.idxmax(), density.max()
+
+
+def platform_volume(totals):
+    """Article count per platform, largest first (the donut's input)."""
+    p_vol = totals['篇数'].sort_values(ascending=False, kind='stable').reset_index()
+    p_vol.columns = ['平台', '篇数']
+    return p_vol
+
+
+def daily_counts(cube, platforms):
+    """Daily article count per platform for dated rows, ordered by day then platform."""
+    daily = slice_cube(cube, platforms)['篇数'].reset_index()
+    daily = daily[daily['日期'].notna()]
+    return daily.sort_values(['日期', '发布平台']).reset_index(drop=True)
+
+
+def date_bounds(cube, platforms):
+    """First and last day with articles on the selected platforms, or None."""
+    days = slice_cube(cube, platforms).index.get_level_values('日期').dropna()
+    if days.empty:
+        return None
+    return days.min(), days.max()
+
+
+def sentiment_table(counts):
+    """Platform × sentiment count table from counts indexed by (发布平台, 情感属性).
+
+    Known labels come first in ``LABELS`` order, any others after them.
+    """
+    table = counts.unstack(fill_value=0)
+    labels = [label for label in LABELS if label in table.columns]
+    table = table[labels + [label for label in table.columns if label not in labels]]
+    table.columns = pd.Index(list(table.columns), name='情感属性')
+    return table.astype('int64')
+
+
+def sentiment_counts(df):
+    """Article count per platform and 情感属性 label; rows without a label are left out."""
+    if '情感属性' not in df.columns:
+        return sentiment_table(pd.Series(dtype='int64', index=pd.MultiIndex.from_tuples(
+            [], names=['发布平台', '情感属性'])))
+    labelled = df[df['情感属性'].notna()]
+    return sentiment_table(labelled.groupby(['发布平台', '情感属性'], observed=True).size())
+
+
+def sentiment_shares(counts, platforms):
+    """Long frame of each selected platform's sentiment mix: 发布平台, 情感属性, 篇数, 占比."""
+    table = counts[counts.index.isin(platforms)]
+    table = table[table.sum(axis=1) > 0]
+    shares = table.stack().rename('篇数').reset_index()
+    shares['占比'] = shares['篇数'] / shares.groupby('发布平台')['篇数'].transform('sum')
+    return shares
+
+
+def trend_bucket(start, end, max_points=TREND_MAX_POINTS):
+    """Finest bucket ('D', 'W' or 'M') giving at most ``max_points`` per platform over the window."""
+    days = (end - start).days + 1
+    for freq, length in TREND_BUCKETS.items():
+        if days <= max_points * length:
+            return freq
+    return 'M'
+
+
+def trend_counts(cube, platforms, start=None, end=None, freq='D'):
+    """Article count per platform and bucket within ``[start, end]``.
+
+    Buckets are days, weeks (starting Monday) or months, labelled by their
+    first day and ordered like ``daily_counts``; the daily trend of the whole
+    range is ``daily_counts`` itself.
+    """
+    daily = daily_counts(cube, platforms)
+    if start is not None:
+        daily = daily[daily['日期'] >= start]
+    if end is not None:
+        daily = daily[daily['日期'] <= end]
+    if freq == 'D':
+        return daily.reset_index(drop=True)
+    buckets = pd.to_datetime(daily['日期']).dt.to_period(freq).dt.start_time.rename('日期')
+    grouped = daily.groupby([buckets, daily['发布平台']], observed=True, sort=False)['篇数'].sum()
+    return grouped.reset_index().sort_values(['日期', '发布平台']).reset_index(drop=True)
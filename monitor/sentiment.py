@@ -0,0 +1,174 @@
+import hashlib
+import os
+import re
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+
+import pandas as pd
+
+# Labels of the 情感属性 column, in display order
+LABELS = ['正面', '中性', '负面']
+
+# Bump whenever the lexicon or the scoring rule changes: labels cached by an
+# older model are then scored again
+MODEL_VERSION = 1
+BATCH_SIZE = 2_000
+# Fewer texts than this are scored in-process; a process pool only pays off beyond that
+POOL_MIN_TEXTS = 10_000
+# Title hits count this much more than summary hits
+TITLE_WEIGHT = 2
+
+POSITIVE = (
+    '成功', '突破', '增长', '提升', '发展', '创新', '合作', '共赢', '胜利', '喜迎', '喜报', '庆祝', '祝贺',
+    '荣获', '获奖', '夺冠', '冠军', '金牌', '纪录', '点赞', '温暖', '暖心', '感人', '致敬', '英雄', '楷模',
+    '丰收', '进步', '领先', '优秀', '圆满', '助力', '惠民', '幸福', '美好', '振兴', '繁荣', '高质量', '亮点',
+    '欢迎', '友好', '启迪', '好评', '赞誉', '成就', '成效', '里程碑', '开通', '落成', '投产', '竣工', '获救',
+    '脱贫', '提振', '回暖', '向好', '稳中有进', '新高', '首发', '盛会', '精彩', '守护', '团圆', '喜悦',
+)
+NEGATIVE = (
+    '死亡', '遇难', '身亡', '丧生', '罹难', '事故', '爆炸', '枪击', '袭击', '火灾', '地震', '洪水', '洪涝',
+    '灾害', '受灾', '受伤', '伤亡', '失踪', '坠毁', '坍塌', '冲突', '战争', '战火', '暴力', '犯罪', '诈骗',
+    '违法', '违规', '腐败', '受贿', '贪污', '被查', '落马', '处分', '判刑', '起诉', '逮捕', '拘留', '抗议',
+    '制裁', '封禁', '指责', '谴责', '抨击', '下跌', '暴跌', '亏损', '危机', '污染', '疫情', '失业', '罢工',
+    '难民', '恐怖', '挑衅', '霸凌', '曝光', '投诉', '假冒', '虐待', '悲剧', '惨案', '凶手', '遭遇', '威胁',
+    '警告', '谣言', '造假', '欺诈', '停电', '停运', '暴雨', '台风', '寒潮', '隐患', '严重', '困境', '失败',
+)
+# A negation right before a lexicon word flips its polarity (不成功, 未发现隐患)
+NEGATIONS = ('没有', '并非', '不', '未', '无', '非')
+
+_WORD_WEIGHTS = {**{word: 1 for word in POSITIVE}, **{word: -1 for word in NEGATIVE}}
+
+
+def _trie_pattern(words):
+    """Regex matching any of ``words``, nested by shared prefix so each position is tried once."""
+    tree = {}
+    for word in words:
+        node = tree
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def emit(node):
+        alternatives = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not alternatives:
+            return ''
+        body = alternatives[0] if len(alternatives) == 1 and len(alternatives[0]) == 1 \
+            else '(?:' + '|'.join(alternatives) + ')'
+        return body + ('?' if '' in node else '')
+    return re.compile(emit(tree))
+
+
+_PATTERN = _trie_pattern(_WORD_WEIGHTS)
+
+
+def _text(value):
+    return value if isinstance(value, str) else '' if value is None or pd.isna(value) else str(value)
+
+
+def score(text):
+    """Lexicon score of a text: +1 per positive hit, -1 per negative hit, flipped after a negation."""
+    total = 0
+    for match in _PATTERN.finditer(text):
+        weight = _WORD_WEIGHTS[match.group()]
+        total += -weight if text.endswith(NEGATIONS, 0, match.start()) else weight
+    return total
+
+
+def classify(title, summary=''):
+    """'正面', '中性' or '负面' for an article, from its title and summary."""
+    total = TITLE_WEIGHT * score(_text(title)) + score(_text(summary))
+    return '正面' if total > 0 else '负面' if total < 0 else '中性'
+
+
+def classify_batch(pairs):
+    """Labels of a list of ``(title, summary)`` pairs (a process pool's unit of work)."""
+    return [classify(title, summary) for title, summary in pairs]
+
+
+def text_keys(titles, summaries):
+    """Cache keys of articles: SHA-1 of title and summary, so any edit to either re-scores it."""
+    return [hashlib.sha1(f"{_text(t)}\x00{_text(s)}".encode('utf-8')).hexdigest()
+            for t, s in zip(titles, summaries)]
+
+
+class SentimentCache:
+    """Persistent labels keyed by ``text_keys`` in a small SQLite file.
+
+    Each label records the model version that produced it; labels of other
+    versions are treated as missing.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with closing(sqlite3.connect(path)) as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS labels (key TEXT PRIMARY KEY, label TEXT, model INTEGER)")
+
+    def get(self, keys):
+        """{key: label} for the given keys that are cached for the current model."""
+        found = {}
+        keys = list(dict.fromkeys(keys))
+        with closing(sqlite3.connect(self.path)) as conn:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                found.update(conn.execute(
+                    f"SELECT key, label FROM labels WHERE model = ? AND key IN ({', '.join('?' * len(chunk))})",
+                    [MODEL_VERSION] + chunk).fetchall())
+        return found
+
+    def put(self, labels):
+        """Store ``{key: label}`` for the current model."""
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            conn.executemany("INSERT OR REPLACE INTO labels VALUES (?, ?, ?)",
+                             [(key, label, MODEL_VERSION) for key, label in labels.items()])
+
+
+def missing_sentiment(df):
+    """Mask of the rows without a 情感属性 label (absent, empty or blank)."""
+    if '情感属性' not in df.columns:
+        return pd.Series(True, index=df.index)
+    labels = df['情感属性']
+    return labels.isna() | (labels.astype(object).map(_text).str.strip() == '')
+
+
+def label_texts(pairs, workers=None, batch_size=BATCH_SIZE):
+    """Labels of ``(title, summary)`` pairs, scored in batches across a process pool when many."""
+    workers = workers or os.cpu_count() or 1
+    batches = [pairs[start:start + batch_size] for start in range(0, len(pairs), batch_size)]
+    if workers == 1 or len(pairs) < POOL_MIN_TEXTS:
+        return [label for batch in batches for label in classify_batch(batch)]
+    with ProcessPoolExecutor(max_workers=min(workers, len(batches))) as pool:
+        return [label for labels in pool.map(classify_batch, batches) for label in labels]
+
+
+def fill_sentiment(df, cache=None, workers=None, batch_size=BATCH_SIZE):
+    """Label the rows of ``df`` that have no 情感属性, in place; returns ``(labelled, cached)``.
+
+    Each distinct title/summary is scored once: cached labels are reused and
+    only the rest are classified, then added to ``cache`` (a SentimentCache
+    or None). Rows that already carry a label are never touched.
+    """
+    rows = missing_sentiment(df).to_numpy().nonzero()[0]
+    if not len(rows):
+        return 0, 0
+    titles = df['标题'].iloc[rows].tolist() if '标题' in df.columns else [''] * len(rows)
+    summaries = df['摘要'].iloc[rows].tolist() if '摘要' in df.columns else [''] * len(rows)
+    keys = text_keys(titles, summaries)
+    known = cache.get(keys) if cache is not None else {}
+    todo = {}
+    for key, title, summary in zip(keys, titles, summaries):
+        if key not in known and key not in todo:
+            todo[key] = (title, summary)
+    scored = dict(zip(todo, label_texts(list(todo.values()), workers, batch_size)))
+    if cache is not None and scored:
+        cache.put(scored)
+    known.update(scored)
+    if '情感属性' not in df.columns:
+        df['情感属性'] = None
+    elif df['情感属性'].dtype != object:
+        # Categorical, or all-NaN float64 when the sheet's column is blank
+        df['情感属性'] = df['情感属性'].astype(object)
+    df.iloc[rows, df.columns.get_loc('情感属性')] = [known[key] for key in keys]
+    cached = sum(key not in scored for key in keys)
+    return len(rows), cached
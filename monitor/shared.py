@@ -0,0 +1,100 @@
+import glob
+import logging
+import os
+import threading
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Columnar first: on equal modification times the Parquet copy wins
+REPORT_PATTERNS = ("*.parquet", "*.xlsx")
+
+
+def _columnar_copy(report):
+    """The Parquet file the merge wrote alongside ``report`` in the same pass, if any."""
+    stem, suffix = os.path.splitext(report)
+    sibling = stem + ".parquet"
+    if suffix.lower() != ".parquet" and os.path.exists(sibling) \
+            and os.path.getmtime(sibling) >= os.path.getmtime(report):
+        return sibling
+    return report
+
+
+def resolve_report(path):
+    """The report file for ``path``: the file itself, or the newest report in a directory.
+
+    A workbook with an at-least-as-new Parquet copy of the same name resolves
+    to the copy, which loads much faster.
+    """
+    if not os.path.isdir(path):
+        return _columnar_copy(path) if os.path.exists(path) else path
+    candidates = [f for pattern in REPORT_PATTERNS for f in glob.glob(os.path.join(path, pattern))
+                  if not os.path.basename(f).startswith("~$")]
+    if not candidates:
+        raise FileNotFoundError(f"No report found in {path}")
+    return _columnar_copy(max(candidates, key=os.path.getmtime))
+
+
+class SharedDataset:
+    """One read-only dataset per process, reloaded in the background when its file changes.
+
+    ``path`` is a report file or a data directory (the newest report in it is
+    used). A daemon thread polls the file's mtime and size every ``interval``
+    seconds; once a change has been stable for one poll the file is loaded
+    with ``loader`` and swapped in with a single reference assignment, so
+    readers always see either the old or the new version, never a mix.
+    Sessions call ``current()`` on each rerun and pick up new versions then.
+    A failed reload (e.g. a half-written file) keeps the previous version.
+    """
+
+    def __init__(self, path, loader, interval=5.0):
+        self.path = path
+        self.interval = interval
+        self._loader = loader
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._current = None
+        self._signature = None
+        self._pending = None
+        self._reload(self._stat())
+        self._thread = threading.Thread(target=self._watch, name="dataset-watcher", daemon=True)
+        self._thread.start()
+
+    def _stat(self):
+        report = resolve_report(self.path)
+        stat = os.stat(report)
+        return report, stat.st_mtime_ns, stat.st_size
+
+    def _reload(self, signature):
+        report, mtime_ns, _ = signature
+        with self._reload_lock:
+            ds = self._loader(report)
+            ds.version = datetime.fromtimestamp(mtime_ns / 1e9)
+            self._current = ds
+            self._signature = signature
+        logger.info("Loaded %s (version %s)", report, ds.version)
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            try:
+                signature = self._stat()
+            except OSError:
+                continue
+            if signature == self._signature:
+                self._pending = None
+            elif signature != self._pending:
+                # Changed since the last poll: wait until the writer has finished
+                self._pending = signature
+            else:
+                try:
+                    self._reload(signature)
+                except Exception:
+                    logger.exception("Reloading %s failed; keeping the previous version", signature[0])
+                self._pending = None
+
+    def current(self):
+        """The latest loaded dataset."""
+        return self._current
+
+    def stop(self):
+        self._stop.set()
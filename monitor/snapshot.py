@@ -0,0 +1,123 @@
+import json
+import logging
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from monitor.data import content_hash, restore_dates
+from monitor.dataset import Dataset, load_dataset
+from monitor.incremental import file_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the snapshot layout or the frames it holds change
+SNAPSHOT_VERSION = 6
+SNAPSHOT_SUFFIX = ".snapshot"
+# Frames of a snapshot, one Parquet file each; meta.json names their hashes
+SNAPSHOT_FRAMES = ('cube', 'sentiments', 'anomalies', 'leaders')
+META_FILE = "meta.json"
+
+
+def snapshot_path(report):
+    """Directory holding the snapshot of a report: next to it, same name."""
+    return os.path.splitext(report)[0] + SNAPSHOT_SUFFIX
+
+
+def build_snapshot(ds, digest):
+    """Snapshot of a loaded report: its cube, sentiment counts, anomaly flags and leaderboard rows.
+
+    Only the rows in some platform's top-K list are kept; together with the
+    cube, the sentiment table and the anomaly flags they answer every
+    platform selection, so the report is never parsed while the snapshot
+    matches. Views are computed from them on first use.
+    """
+    lists = [positions for per_platform in ds.topk.values() for positions in per_platform.values()]
+    rows = np.unique(np.concatenate(lists)) if lists else np.array([], dtype=np.int64)
+    if ds.flags is None:
+        ds.anomalies(ds.platforms)
+    return {
+        'version': SNAPSHOT_VERSION,
+        'digest': digest,
+        'created': datetime.now(),
+        'platforms': list(ds.platforms),
+        'cube': ds.cube,
+        'sentiments': ds.sentiments,
+        'anomalies': ds.flags,
+        'leaders': ds.df.iloc[rows],
+    }
+
+
+def _write_frame(path, frame):
+    tmp_path = f"{path}.tmp"
+    frame.to_parquet(tmp_path)
+    os.replace(tmp_path, path)
+    return file_fingerprint(path)
+
+
+def write_snapshot(path, snapshot):
+    """Write a snapshot's frames as Parquet and its metadata as JSON, metadata last.
+
+    meta.json records the SHA-256 of every frame file, so a reader never
+    mixes files of two different writes.
+    """
+    os.makedirs(path, exist_ok=True)
+    frames = {}
+    for name in SNAPSHOT_FRAMES:
+        frame = snapshot[name].reset_index() if name == 'cube' else snapshot[name]
+        frames[name] = _write_frame(os.path.join(path, f"{name}.parquet"), frame)
+    meta = {
+        'version': snapshot['version'],
+        'digest': snapshot['digest'],
+        'created': snapshot['created'].isoformat(timespec='seconds'),
+        'platforms': snapshot['platforms'],
+        'frames': frames,
+    }
+    tmp_path = os.path.join(path, f"{META_FILE}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(meta, fh, ensure_ascii=False)
+    os.replace(tmp_path, os.path.join(path, META_FILE))
+
+
+def snapshot_report(report, compact=True):
+    """Load ``report``, build its snapshot and write it next to the report; returns the path."""
+    ds = load_dataset(report, compact=compact)
+    path = snapshot_path(report)
+    write_snapshot(path, build_snapshot(ds, ds.digest))
+    return path
+
+
+def _read_frames(path, meta):
+    frames = {}
+    for name in SNAPSHOT_FRAMES:
+        file = os.path.join(path, f"{name}.parquet")
+        if file_fingerprint(file) != meta['frames'][name]:
+            raise ValueError(f"{name}.parquet does not match {META_FILE}")
+        frames[name] = restore_dates(pd.read_parquet(file))
+    frames['cube'] = frames['cube'].set_index(['发布平台', '日期'])
+    return frames
+
+
+def load_snapshot(report):
+    """The dataset stored in ``report``'s snapshot, or None if there is none for this exact file.
+
+    The snapshot must have been built from the same bytes (content hash) by
+    the current snapshot version; anything else means loading the report.
+    Both are checked in meta.json before any frame is read.
+    """
+    path = snapshot_path(report)
+    if not os.path.exists(os.path.join(path, META_FILE)):
+        return None
+    try:
+        with open(os.path.join(path, META_FILE), encoding="utf-8") as fh:
+            meta = json.load(fh)
+        if meta.get('version') != SNAPSHOT_VERSION or meta.get('digest') != content_hash(report):
+            logger.info("Snapshot %s is stale; loading %s", path, report)
+            return None
+        frames = _read_frames(path, meta)
+    except Exception as e:
+        logger.warning("Ignoring unreadable snapshot %s: %s", path, e)
+        return None
+    return Dataset(frames['leaders'], meta['digest'], cube=frames['cube'], platforms=meta['platforms'],
+                   sentiments=frames['sentiments'], anomalies=frames['anomalies'])
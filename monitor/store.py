@@ -0,0 +1,271 @@
+import json
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+
+import pandas as pd
+
+from monitor.anomaly import AnomalyDetector, daily_metrics, flag_frame
+from monitor.data import METRIC_COLUMNS, read_report
+from monitor.incremental import file_fingerprint
+from monitor.join import normalize_urls
+from monitor.leaderboard import TOP_K, raw_csi
+from monitor.rollup import sentiment_table
+
+# Report column -> store column
+COLUMNS = {
+    '发布平台': 'platform',
+    '标题': 'title',
+    '原文链接': 'url',
+    '发布时间': 'published',
+    '日期': 'date',
+    '情感属性': 'sentiment',
+    '作者': 'author',
+    '阅读数': 'reads',
+    '点赞数': 'likes',
+    '评论数': 'comments',
+    '转发数': 'shares',
+    'raw_csi': 'csi',
+}
+METRICS = {col: COLUMNS[col] for col in METRIC_COLUMNS}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    key TEXT PRIMARY KEY,
+    platform TEXT,
+    title TEXT,
+    url TEXT,
+    published TEXT,
+    date TEXT,
+    sentiment TEXT,
+    author TEXT,
+    reads REAL,
+    likes REAL,
+    comments REAL,
+    shares REAL,
+    csi REAL,
+    source TEXT,
+    ingested_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_articles_platform_date ON articles(platform, date);
+CREATE INDEX IF NOT EXISTS idx_articles_published ON articles(published);
+CREATE INDEX IF NOT EXISTS idx_articles_url ON articles(url);
+CREATE TABLE IF NOT EXISTS ingests (
+    fingerprint TEXT PRIMARY KEY,
+    source TEXT,
+    rows INTEGER,
+    ingested_at TEXT
+);
+CREATE TABLE IF NOT EXISTS detectors (
+    name TEXT PRIMARY KEY,
+    state TEXT,
+    updated_at TEXT
+);
+"""
+
+
+def _keys(df):
+    """Article keys: the URL, or platform|title|publish time for rows without one."""
+    urls = normalize_urls(df['原文链接']) if '原文链接' in df.columns else pd.Series('', index=df.index)
+    fallback = df['发布平台'].map(str) + '|' + df['标题'].map(str)
+    if '发布时间' in df.columns:
+        fallback = fallback + '|' + df['发布时间'].map(str)
+    return urls.where(urls != '', fallback)
+
+
+def _records(df, source, ingested_at):
+    """Rows of a prepared report as store tuples (NaN/NaT become NULL)."""
+    df = df.copy()
+    if 'raw_csi' not in df.columns and {'点赞数', '评论数', '转发数'} <= set(df.columns):
+        df['raw_csi'] = raw_csi(df)
+    rows = pd.DataFrame({'key': _keys(df)})
+    for col, name in COLUMNS.items():
+        if col not in df.columns:
+            rows[name] = None
+        elif col == '发布时间':
+            rows[name] = df[col].dt.strftime('%Y-%m-%d %H:%M:%S')
+        elif col == '日期':
+            rows[name] = pd.to_datetime(df[col]).dt.strftime('%Y-%m-%d')
+        elif col in METRIC_COLUMNS or col == 'raw_csi':
+            rows[name] = df[col].astype('float64')
+        else:
+            rows[name] = df[col].astype(object)
+    rows['source'] = source
+    rows['ingested_at'] = ingested_at
+    rows = rows.astype(object).where(rows.notna(), None)
+    return list(rows.itertuples(index=False, name=None))
+
+
+# Store columns read back into report frames (日期 is derived from 发布时间)
+_FRAME_COLUMNS = [name for col, name in COLUMNS.items() if col != '日期']
+
+
+def _frame(rows):
+    """Store rows (in _FRAME_COLUMNS order) as a report frame."""
+    df = pd.DataFrame(rows, columns=[col for col in COLUMNS if col != '日期'])
+    df['发布时间'] = pd.to_datetime(df['发布时间'], format='%Y-%m-%d %H:%M:%S')
+    df['日期'] = df['发布时间'].dt.date
+    for col in METRIC_COLUMNS + ['raw_csi']:
+        df[col] = df[col].astype('float64').fillna(0)
+    return df
+
+
+class ArticleStore:
+    """Embedded SQLite history of every ingested report, one row per article.
+
+    Articles are keyed by URL (or platform, title and publish time when a row
+    has none), so ingesting a newer report of the same period updates the
+    metrics in place instead of duplicating rows. The dashboard reads it
+    through ``platforms``, ``date_bounds``, ``cube``, ``sentiments`` and
+    ``leaders``, which push platform/date filters and aggregation down into
+    SQL.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        # One short-lived connection per call: safe across Streamlit's threads
+        return sqlite3.connect(self.path)
+
+    def _query(self, sql, params=()):
+        with closing(self._connect()) as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def ingest_frame(self, df, source, fingerprint=None):
+        """Upsert the rows of a prepared report; returns the number of rows written."""
+        ingested_at = datetime.now().isoformat(timespec='seconds')
+        records = _records(df, source, ingested_at)
+        names = ['key'] + list(COLUMNS.values()) + ['source', 'ingested_at']
+        updates = ', '.join(f"{name} = excluded.{name}" for name in names[1:])
+        sql = (f"INSERT INTO articles ({', '.join(names)}) VALUES ({', '.join('?' * len(names))}) "
+               f"ON CONFLICT(key) DO UPDATE SET {updates}")
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(sql, records)
+            conn.execute("INSERT OR REPLACE INTO ingests VALUES (?, ?, ?, ?)",
+                         (fingerprint or f"{source}@{ingested_at}", source, len(records), ingested_at))
+        return len(records)
+
+    def ingest_report(self, path, force=False):
+        """Ingest a report workbook; returns rows written, or None if it was already ingested."""
+        fingerprint = file_fingerprint(path)
+        if not force and self._query("SELECT 1 FROM ingests WHERE fingerprint = ?", (fingerprint,)):
+            return None
+        return self.ingest_frame(read_report(path), os.path.basename(path), fingerprint)
+
+    def version(self):
+        """Time of the latest ingestion (None for an empty store)."""
+        (latest,), = self._query("SELECT MAX(ingested_at) FROM ingests")
+        return datetime.fromisoformat(latest) if latest else None
+
+    def _detector(self):
+        rows = self._query("SELECT state FROM detectors WHERE name = 'anomalies'")
+        return AnomalyDetector(json.loads(rows[0][0])) if rows else None
+
+    def update_anomalies(self):
+        """Fold the days ingested since the last call into the stored anomaly detector.
+
+        Only articles from the detector's ``resume_day`` on are read, through
+        the platform/day index, so the cost follows the new rows rather than
+        the history. Returns the new flags as a ``flag_frame``.
+        """
+        detector = self._detector() or AnomalyDetector()
+        flags = detector.update(daily_metrics(self.cube(self.platforms(), detector.resume_day())))
+        with closing(self._connect()) as conn, conn:
+            conn.execute("INSERT OR REPLACE INTO detectors VALUES ('anomalies', ?, ?)",
+                         (json.dumps(detector.state(), ensure_ascii=False),
+                          datetime.now().isoformat(timespec='seconds')))
+        return flag_frame(flags)
+
+    def anomalies(self, start=None, end=None):
+        """Stored flags within ``[start, end]`` (a ``flag_frame``), or None before the first update."""
+        detector = self._detector()
+        if detector is None:
+            return None
+        flags = flag_frame(detector.flags)
+        if start is not None:
+            flags = flags[flags['日期'] >= start]
+        if end is not None:
+            flags = flags[flags['日期'] <= end]
+        return flags.reset_index(drop=True)
+
+    def platforms(self):
+        return [row[0] for row in self._query(
+            "SELECT DISTINCT platform FROM articles WHERE platform IS NOT NULL ORDER BY platform")]
+
+    def date_bounds(self):
+        """First and last publish day as dates, or None for an empty store."""
+        (first, last), = self._query("SELECT MIN(date), MAX(date) FROM articles")
+        if first is None:
+            return None
+        return pd.Timestamp(first).date(), pd.Timestamp(last).date()
+
+    def _where(self, platforms, start, end):
+        clauses = [f"platform IN ({', '.join('?' * len(platforms))})" if platforms else "0"]
+        params = list(platforms)
+        if start is not None:
+            clauses.append("date >= ?")
+            params.append(str(start))
+        if end is not None:
+            clauses.append("date <= ?")
+            params.append(str(end))
+        return " WHERE " + " AND ".join(clauses), params
+
+    def cube(self, platforms, start=None, end=None):
+        """Platform × day rollup of the window, shaped like ``rollup.build_cube``."""
+        where, params = self._where(platforms, start, end)
+        sums = ', '.join(f"TOTAL({name})" for name in METRICS.values())
+        rows = self._query(f"SELECT platform, date, COUNT(*), {sums} FROM articles{where} "
+                           f"GROUP BY platform, date ORDER BY platform, date", params)
+        cube = pd.DataFrame(rows, columns=['发布平台', '日期', '篇数'] + list(METRICS))
+        cube['日期'] = pd.to_datetime(cube['日期']).dt.date
+        for col in METRICS:
+            if (cube[col] == cube[col].round()).all():
+                cube[col] = cube[col].astype('int64')
+        return cube.set_index(['发布平台', '日期'])
+
+    def sentiments(self, platforms, start=None, end=None):
+        """Platform × sentiment article counts of the window, shaped like ``rollup.sentiment_counts``."""
+        where, params = self._where(platforms, start, end)
+        rows = self._query(f"SELECT platform, sentiment, COUNT(*) FROM articles{where} AND sentiment IS NOT NULL "
+                           f"GROUP BY platform, sentiment ORDER BY platform", params)
+        counts = pd.DataFrame(rows, columns=['发布平台', '情感属性', '篇数'])
+        return sentiment_table(counts.set_index(['发布平台', '情感属性'])['篇数'])
+
+    def leaders(self, platforms, start=None, end=None, k=TOP_K):
+        """Each platform's top-``k`` rows by CSI and by comments within the window.
+
+        Rows come back in ingestion order, so ``build_topk_index`` over the
+        result gives the same lists as over the full window.
+        """
+        where, params = self._where(platforms, start, end)
+        ranked = [f"SELECT rowid FROM (SELECT rowid, ROW_NUMBER() OVER (PARTITION BY platform "
+                  f"ORDER BY {column} DESC, rowid) AS rank FROM articles{where}) WHERE rank <= ?"
+                  for column in ('csi', 'comments')]
+        sql = (f"SELECT {', '.join(_FRAME_COLUMNS)} FROM articles WHERE rowid IN ({' UNION '.join(ranked)}) "
+               f"ORDER BY rowid")
+        return _frame(self._query(sql, (params + [k]) * 2))
+
+    def explore(self, platforms, start=None, end=None, keyword="", sort='发布时间', descending=True,
+                page=0, size=20, columns=None):
+        """One page of the article explorer, filtered, sorted and paginated in SQL: ``(rows, total)``.
+
+        Every whitespace-separated ``keyword`` term must occur in the title;
+        ties and NULLs keep ingestion order, NULLs last.
+        """
+        where, params = self._where(platforms, start, end)
+        for term in keyword.split():
+            escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            where += " AND title LIKE ? ESCAPE '\\'"
+            params.append(f"%{escaped}%")
+        (total,), = self._query(f"SELECT COUNT(*) FROM articles{where}", params)
+        column = COLUMNS[sort]
+        sql = (f"SELECT {', '.join(_FRAME_COLUMNS)} FROM articles{where} "
+               f"ORDER BY {column} IS NULL, {column} {'DESC' if descending else 'ASC'}, rowid LIMIT ? OFFSET ?")
+        df = _frame(self._query(sql, params + [size, page * size]))
+        return (df if columns is None else df[[col for col in columns if col in df.columns]]), total
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+PLATFORMS = ['今日头条', '微博', '微信', 'B站', '小红书']
+PLATFORM_SHARE = [0.8, 0.08, 0.05, 0.04, 0.03]
+PLATFORM_HOSTS = {
+    '今日头条': 'https://www.toutiao.com/article/',
+    '微博': 'https://weibo.com/1699432410/',
+    '微信': 'https://mp.weixin.qq.com/s/',
+    'B站': 'https://www.bilibili.com/video/BV',
+    '小红书': 'https://www.xiaohongshu.com/discovery/item/',
+}
+WORDS = np.array(['新华网', '网友', '发布', '现场', '直击', '关注', '最新', '解读', '权威', '视频',
+                  '经济', '科技', '民生', '国际', '冬季', '城市', '乡村', '文化', '体育', '健康'])
+SENTIMENTS = ['中性', '正面', '负面']
+EMOTIONS = ['其他', '喜悦', '惊奇', '愤怒', '悲伤']
+REGIONS = ['北京', '上海', '广东', '四川', '未知']
+
+
+def _titles(rng, ids):
+    words = WORDS[rng.integers(0, len(WORDS), size=(len(ids), 3))]
+    prefix = pd.Series(words[:, 0]).str.cat([pd.Series(words[:, 1]), pd.Series(words[:, 2])], sep='')
+    return (prefix + '：' + pd.Series(ids).astype(str)).to_numpy()
+
+
+def main_sheet(n, seed=0, start='2025-12-01', days=30):
+    """A main monitoring sheet with the real export's column names."""
+    rng = np.random.default_rng(seed)
+    ids = np.arange(n)
+    platforms = rng.choice(PLATFORMS, size=n, p=PLATFORM_SHARE)
+    hosts = pd.Series(platforms).map(PLATFORM_HOSTS)
+    titles = _titles(rng, ids)
+    published = pd.Timestamp(start) + pd.to_timedelta(rng.integers(0, days * 86400, size=n), unit='s')
+    reads = rng.lognormal(7, 2, size=n).round()
+    reads[rng.random(n) < 0.3] = np.nan  # many platforms do not report reads
+    return pd.DataFrame({
+        '序号': ids + 1.0,
+        '平台类型': np.where(np.isin(platforms, ['微博', '微信']), '社交', 'APP'),
+        '发布平台': platforms,
+        '标题': titles,
+        '摘要': titles,
+        '原文链接': (hosts + pd.Series(ids).astype(str)).to_numpy(),
+        '发布时间': published,
+        '情感属性': rng.choice(SENTIMENTS, size=n, p=[0.7, 0.2, 0.1]),
+        '发布人': '新华网',
+        '作者': '新华网',
+        '原作者': np.nan,
+        '主题词': '网友（1） 新华网（1）',
+        '发布地区': rng.choice(REGIONS, size=n),
+        '提及地区': np.nan,
+        '阅读数': reads,
+        '点赞数': rng.lognormal(3, 2, size=n).round().astype(np.int64),
+        '评论数': rng.lognormal(1, 1.5, size=n).round().astype(np.int64),
+        '转发数': rng.lognormal(1, 1.5, size=n).round().astype(np.int64),
+        '粉丝数': '暂无',
+        '相似文章数': 0.0,
+        '情绪词': rng.choice(EMOTIONS, size=n),
+        'IP属地': rng.choice(REGIONS, size=n),
+        '认证类型': np.nan,
+        '原发标题': '无标题',
+    })
+
+
+def _backtrace_keys(rng, main, platform, n, match_rate=0.5):
+    """URLs, titles and publish times of one platform's back-trace records.
+
+    ``match_rate`` of the records point at main rows of that platform; the
+    rest are new articles, some published outside the main sheet's range.
+    """
+    rows = main.index[main['发布平台'] == platform].to_numpy()
+    matched = rng.random(n) < match_rate if len(rows) else np.zeros(n, dtype=bool)
+    picked = rows[rng.integers(0, len(rows), size=n)] if len(rows) else np.zeros(n, dtype=np.int64)
+    new_ids = np.arange(n) + 10_000_000
+    urls = np.where(matched, main['原文链接'].to_numpy()[picked],
+                    PLATFORM_HOSTS[platform] + pd.Series(new_ids).astype(str).to_numpy())
+    titles = np.where(matched, main['标题'].to_numpy()[picked], _titles(rng, new_ids))
+    start = main['发布时间'].min()
+    span = max(int((main['发布时间'].max() - start).total_seconds()), 1)
+    times = (start + pd.to_timedelta(rng.integers(-span // 10, span + span // 10, size=n), unit='s'))
+    return urls, titles, times
+
+
+def backtrace_frames(main, size=None, seed=0):
+    """The three back-trace CSV frames (bili, red, wx) with the crawlers' column names."""
+    size = size or max(len(main) // 10, 1)
+    rng = np.random.default_rng(seed)
+    urls, titles, times = _backtrace_keys(rng, main, 'B站', size)
+    bili = pd.DataFrame({
+        'url': urls, 'title': titles, 'publish_time': times.strftime('%Y-%m-%d %H:%M:%S'),
+        'read_count': rng.integers(0, 500_000, size), 'like_count': rng.integers(0, 20_000, size),
+        'comment_count': rng.integers(0, 2_000, size), 'share_count': rng.integers(0, 2_000, size),
+        'content': titles, 'author_name': '新华网',
+    })
+    urls, _, times = _backtrace_keys(rng, main, '小红书', size)
+    red = pd.DataFrame({
+        'url': urls, '创建时间': times.strftime('%Y-%m-%d %H:%M'),
+        'num_read': rng.integers(0, 200_000, size), 'num_like': rng.integers(0, 20_000, size),
+        'num_comment': rng.integers(0, 2_000, size), 'num_repost': rng.integers(0, 2_000, size),
+    })
+    urls, titles, times = _backtrace_keys(rng, main, '微信', size)
+    wx = pd.DataFrame({
+        'url': urls, 'title': titles, 'posttime': times.strftime('%Y/%m/%d %H:%M:%S'),
+        'readnum': rng.integers(0, 100_000, size), 'likenum': rng.integers(0, 5_000, size),
+        'share_num': rng.integers(0, 5_000, size), 'author': '新华社',
+    })
+    return {'bili': bili, 'red': red, 'wx': wx}
@@ -0,0 +1,90 @@
+import pandas as pd
+
+# Layouts seen in the monitoring export and the crawlers' CSVs, most common first
+DATE_FORMATS = (
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d %H:%M',
+    '%Y/%m/%d %H:%M:%S',
+    '%Y/%m/%d %H:%M',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%d',
+    '%Y/%m/%d',
+)
+SAMPLE_SIZE = 100
+
+# Detected format per column key (e.g. 'bili.publish_time'), kept for the process
+_formats = {}
+
+
+def detect_format(values):
+    """The one of DATE_FORMATS that parses most sampled strings, or None if none does."""
+    sample = values[values.map(lambda v: isinstance(v, str))].head(SAMPLE_SIZE)
+    best, best_count = None, 0
+    for fmt in DATE_FORMATS:
+        count = pd.to_datetime(sample, format=fmt, errors='coerce').notna().sum()
+        if count > best_count:
+            best, best_count = fmt, count
+    return best
+
+
+def _parse_one(value):
+    # What a per-value pd.to_datetime accepted before: naive timestamps only
+    try:
+        parsed = pd.to_datetime(value)
+    except Exception:
+        return pd.NaT
+    if not isinstance(parsed, pd.Timestamp) or parsed.tz is not None:
+        return pd.NaT
+    return parsed
+
+
+def _parse_any(values):
+    """Format-less parsing of the leftovers, vectorized unless time zones get in the way."""
+    try:
+        parsed = pd.to_datetime(values, format='mixed', errors='coerce')
+    except (ValueError, TypeError):
+        parsed = None
+    if parsed is None or getattr(parsed.dtype, 'tz', None) is not None or parsed.dtype.kind != 'M':
+        parsed = values.map(_parse_one)
+    return parsed
+
+
+def parse_timestamps(values, key=None):
+    """Parse a whole column of timestamps at once.
+
+    Strings are parsed with the column's format, detected from a sample on
+    first use and cached under ``key``; anything that does not fit it
+    (datetime objects, other layouts) is parsed without a format. Returns
+    ``(timestamps, failures)`` where ``failures`` counts non-blank values
+    that could not be parsed and became NaT.
+    """
+    values = pd.Series(values)
+    if values.dtype.kind == 'M' and getattr(values.dtype, 'tz', None) is None:
+        return values, 0
+    present = values.notna() & ~values.map(lambda v: isinstance(v, str) and not v.strip())
+    if values.dtype.kind in 'iuf':
+        parsed = pd.to_datetime(values, errors='coerce')
+    else:
+        fmt = _formats.get(key)
+        if fmt is None:
+            fmt = detect_format(values)
+            if fmt is not None and key is not None:
+                _formats[key] = fmt
+        is_text = values.map(lambda v: isinstance(v, str))
+        if fmt is not None:
+            parsed = pd.to_datetime(values.where(is_text), format=fmt, errors='coerce')
+        else:
+            parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+        retry = parsed.isna() & values.notna()
+        if retry.any():
+            parsed = parsed.astype('datetime64[ns]')
+            parsed[retry] = _parse_any(values[retry])
+    # Same resolution whether the strings came from a workbook or a Parquet file
+    parsed = parsed.astype('datetime64[ns]')
+    failures = int((parsed.isna() & present).sum())
+    return parsed, failures
+
+
+def in_range(timestamps, start, end):
+    """Boolean mask of timestamps within ``[start, end]``; unparsed (NaT) values are outside."""
+    return timestamps.between(start, end).to_numpy()
@@ -0,0 +1,54 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+_log_lock = threading.Lock()
+
+
+class StageTimer:
+    """Wall-clock durations of the named stages of one script run.
+
+    A disabled timer is a no-op, so instrumented code costs nothing unless
+    profiling was asked for.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.stages = []
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name, time.perf_counter() - start))
+
+    def total(self):
+        return time.perf_counter() - self._start
+
+    def report(self):
+        """Stage timings in milliseconds, in execution order."""
+        return pd.DataFrame({
+            '阶段': [name for name, _ in self.stages],
+            '耗时(ms)': [round(seconds * 1000, 1) for _, seconds in self.stages],
+        })
+
+    def write_log(self, path, **fields):
+        """Append this run as one JSON line (with ``fields`` such as session and rerun IDs)."""
+        record = dict(fields, ts=datetime.now().isoformat(timespec='milliseconds'),
+                      total_ms=round(self.total() * 1000, 1),
+                      stages={name: round(seconds * 1000, 2) for name, seconds in self.stages})
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        line = json.dumps(record, ensure_ascii=False)
+        with _log_lock, open(path, 'a', encoding='utf-8') as fh:
+            fh.write(line + '\n')
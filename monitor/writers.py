@@ -0,0 +1,232 @@
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Output format -> file extension
+FORMATS = {'xlsx': '.xlsx', 'parquet': '.parquet', 'csv': '.csv'}
+BATCH_ROWS = 100_000
+
+
+def _cell(value):
+    """A frame value as openpyxl expects it; missing values become empty cells."""
+    if value is None or value is pd.NaT:
+        return None
+    if isinstance(value, (float, np.floating)) and np.isnan(value):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class XlsxStreamWriter:
+    """Row-streaming .xlsx writer (openpyxl write-only mode).
+
+    Rows go straight to a temporary sheet file instead of an in-memory
+    workbook, so memory stays flat however many rows are written. Cells read
+    back the same as ``DataFrame.to_excel(path, index=False)``.
+    """
+
+    def __init__(self, path, columns, sheet_name="Sheet1"):
+        from openpyxl import Workbook
+        self.path = path
+        self.columns = list(columns)
+        self.rows = 0
+        self._book = Workbook(write_only=True)
+        self._sheet = self._book.create_sheet(sheet_name)
+        self._sheet.append(self.columns)
+
+    def write_row(self, values):
+        self._sheet.append([_cell(v) for v in values])
+        self.rows += 1
+
+    def write_frame(self, df):
+        for values in df[self.columns].itertuples(index=False, name=None):
+            self.write_row(values)
+
+    def close(self):
+        self._book.save(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+
+
+class CsvStreamWriter:
+    """Batch-appending CSV writer (UTF-8 with BOM so Excel shows Chinese text).
+
+    Columns ``column_kinds`` finds 'int' are written without a decimal point,
+    so they read back as integers like the workbook's.
+    """
+
+    def __init__(self, path, columns, kinds=None):
+        self.path = path
+        self.columns = list(columns)
+        self.ints = [col for col in self.columns if kinds and kinds[col] == 'int']
+        self.rows = 0
+        self._file = open(path, 'w', encoding='utf-8-sig', newline='')
+        pd.DataFrame(columns=self.columns).to_csv(self._file, index=False)
+
+    def write_frame(self, df):
+        df = df[self.columns]
+        if self.ints:
+            df = df.astype({col: 'int64' for col in self.ints})
+        df.to_csv(self._file, header=False, index=False)
+        self.rows += len(df)
+
+    def close(self):
+        self._file.close()
+
+
+def _kinds(values):
+    """Kinds of the non-missing values of one column: 'num', 'time' and/or 'text'."""
+    values = values[values.notna()]
+    if values.empty:
+        return set()
+    if values.dtype.kind in 'biuf':
+        return {'num'}
+    if values.dtype.kind == 'M':
+        return {'time'}
+
+    def kind(v):
+        if isinstance(v, (bool, int, float, np.number)):
+            return 'num'
+        if isinstance(v, (datetime, np.datetime64)):
+            return 'time'
+        return 'text'
+    return set(values.map(kind))
+
+
+def _integral(values):
+    """Whether a numeric column has a value in every row and only whole numbers."""
+    if values.isna().any():
+        return False
+    numbers = pd.to_numeric(values, errors='coerce')
+    return bool(numbers.notna().all() and (numbers == numbers.round()).all())
+
+
+def column_kinds(frames, columns):
+    """Column type for a columnar file: 'int', 'num', 'time', or 'text' for anything mixed.
+
+    Excel cells can mix numbers, times and text in one column; Parquet
+    cannot, so mixed columns are stored as text (which ``prepare_report``
+    parses again the same way). Numeric columns without gaps and with only
+    whole numbers are 'int' and all-empty columns are 'num', as ``read_excel``
+    returns them.
+    """
+    seen = {col: set() for col in columns}
+    integral = dict.fromkeys(columns, True)
+    for frame in frames:
+        for col in columns:
+            seen[col] |= _kinds(frame[col])
+            integral[col] = integral[col] and seen[col] <= {'num'} and _integral(frame[col])
+    kinds = {}
+    for col, found in seen.items():
+        kind = found.pop() if len(found) == 1 else 'text' if found else 'num'
+        kinds[col] = 'int' if kind == 'num' and integral[col] else kind
+    return kinds
+
+
+def _as_text(value):
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    return value if isinstance(value, str) else str(value)
+
+
+class ParquetStreamWriter:
+    """Row-group-at-a-time Parquet writer with a schema fixed by ``column_kinds``."""
+
+    def __init__(self, path, columns, kinds):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self.path = path
+        self.columns = list(columns)
+        self.kinds = kinds
+        self.rows = 0
+        types = {'int': pa.int64(), 'num': pa.float64(), 'time': pa.timestamp('ns'), 'text': pa.string()}
+        self._schema = pa.schema([(str(col), types[kinds[col]]) for col in self.columns])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write_frame(self, df):
+        import pyarrow as pa
+        batch = pd.DataFrame(index=df.index)
+        for col in self.columns:
+            kind = self.kinds[col]
+            if kind == 'int':
+                batch[str(col)] = pd.to_numeric(df[col]).astype('int64')
+            elif kind == 'num':
+                batch[str(col)] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+            elif kind == 'time':
+                batch[str(col)] = pd.to_datetime(df[col], errors='coerce').astype('datetime64[ns]')
+            else:
+                batch[str(col)] = df[col].map(_as_text).astype(object)
+        self._writer.write_table(pa.Table.from_pandas(batch, schema=self._schema, preserve_index=False))
+        self.rows += len(df)
+
+    def close(self):
+        self._writer.close()
+
+
+def frame_batches(df, rows=BATCH_ROWS):
+    for start in range(0, len(df), rows):
+        yield df.iloc[start:start + rows]
+
+
+def output_paths(base, formats):
+    """{format: path} for writing ``base`` (a path with or without extension) in each format."""
+    stem = os.path.splitext(base)[0]
+    unknown = [fmt for fmt in formats if fmt not in FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown output format(s): {', '.join(unknown)} (choose from {', '.join(FORMATS)})")
+    return {fmt: stem + FORMATS[fmt] for fmt in formats}
+
+
+def write_outputs(paths, columns, batches):
+    """Write the same rows to every output in ``paths`` ({format: path}) in one pass.
+
+    ``batches`` is a callable returning an iterator of frames with
+    ``columns``; it is called a second time beforehand when the column types
+    of a Parquet or CSV output have to be worked out. Each file is written next to its target and moved
+    into place only once every output is complete; all outputs then share
+    one modification time. Returns rows written.
+    """
+    columns = list(columns)
+    kinds = column_kinds(batches(), columns) if {'parquet', 'csv'} & set(paths) else None
+    tmp_paths = {fmt: f"{path}.tmp{FORMATS[fmt]}" for fmt, path in paths.items()}
+    writers = []
+    try:
+        for fmt, tmp_path in tmp_paths.items():
+            if fmt == 'xlsx':
+                writers.append(XlsxStreamWriter(tmp_path, columns))
+            elif fmt == 'csv':
+                writers.append(CsvStreamWriter(tmp_path, columns, kinds))
+            else:
+                writers.append(ParquetStreamWriter(tmp_path, columns, kinds))
+        rows = 0
+        for frame in batches():
+            for writer in writers:
+                writer.write_frame(frame)
+            rows += len(frame)
+        for writer in writers:
+            writer.close()
+        writers = []
+        finished = datetime.now().timestamp()
+        for fmt, tmp_path in tmp_paths.items():
+            os.utime(tmp_path, (finished, finished))
+            os.replace(tmp_path, paths[fmt])
+        return rows
+    finally:
+        for writer in writers:
+            try:
+                writer.close()
+            except Exception:
+                pass
+        for tmp_path in tmp_paths.values():
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -0,0 +1,249 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import merge_backtrace
+from monitor.data import cache_path, content_hash, load_report, prepare_report, read_report
+from monitor.dataset import Dataset
+from monitor.leaderboard import csi_leaderboard, top_articles
+from monitor.rollup import best_platform, daily_counts, kpi_summary, platform_totals, platform_volume
+from monitor.sentiment import SentimentCache, fill_sentiment
+from monitor.snapshot import build_snapshot, load_snapshot, snapshot_path, write_snapshot
+from monitor.synthetic import backtrace_frames, main_sheet
+from monitor.writers import frame_batches, output_paths, write_outputs
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT_DIR, "bench_results")
+# openpyxl writes ~20k rows/s; bigger sheets only exercise the in-memory paths
+DEFAULT_MAX_XLSX_ROWS = 100_000
+EXCEL_ROW_LIMIT = 1_048_575
+APP_PATH = os.path.join(ROOT_DIR, "app.py")
+
+# Run in a fresh interpreter by startup_times: times app.py's top-level imports,
+# then its first script run (load + every section built) and a warm rerun
+STARTUP_PROBE = r'''
+import ast, json, sys, time
+app = sys.argv[1]
+with open(app, encoding="utf-8") as fh:
+    tree = ast.parse(fh.read())
+imports = ast.Module([node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))], [])
+start = time.perf_counter()
+exec(compile(imports, app, "exec"), {})
+imported = time.perf_counter() - start
+eager = [name for name in ("plotly.express", "openpyxl") if name in sys.modules]
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(app, default_timeout=600)
+start = time.perf_counter()
+at.run()
+first = time.perf_counter() - start
+start = time.perf_counter()
+at.run()
+rerun = time.perf_counter() - start
+errors = [str(e.value) for e in at.exception]
+print(json.dumps({"import": imported, "first_render": first, "rerun": rerun, "eager": eager, "errors": errors}))
+'''
+
+
+def parse_size(text):
+    text = text.strip().lower()
+    factor = {'k': 1_000, 'm': 1_000_000}.get(text[-1], 1)
+    return int(float(text.rstrip('km')) * factor)
+
+
+def timed(fn, repeat=1):
+    """Best wall-clock time of ``repeat`` calls, and the last result."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def startup_times(report, cache_dir, repeat=1):
+    """Best cold-process import, first-render and rerun times of the dashboard serving ``report``."""
+    env = dict(os.environ, MONITOR_DATA_PATH=report, MONITOR_CACHE_DIR=cache_dir, MONITOR_PROFILE="0")
+    best = None
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", STARTUP_PROBE, APP_PATH], env=env, cwd=ROOT_DIR,
+                             capture_output=True, text=True, check=True).stdout
+        times = json.loads(out.strip().splitlines()[-1])
+        if times['errors']:
+            raise RuntimeError(f"app.py failed on {report}: {times['errors'][0]}")
+        best = times if best is None else {k: min(v, times[k]) if isinstance(v, float) else v
+                                           for k, v in best.items()}
+    return best
+
+
+def bench_size(n, workdir, repeat, max_xlsx_rows, results):
+    def record(stage, seconds, **extra):
+        results.append(dict({'size': n, 'stage': stage, 'seconds': round(seconds, 6)}, **extra))
+        print(f"  {stage:<28} {seconds * 1000:>10.1f} ms")
+
+    print(f"Generating {n:,} synthetic rows...")
+    main = main_sheet(n)
+    sources = backtrace_frames(main)
+    cache_dir = os.path.join(workdir, f"cache-{n}")
+
+    # --- LOAD ---
+    xlsx_path = None
+    if n <= min(max_xlsx_rows, EXCEL_ROW_LIMIT):
+        xlsx_path = os.path.join(workdir, f"main-{n}.xlsx")
+        main.to_excel(xlsx_path, index=False)
+        seconds, _ = timed(lambda: read_report(xlsx_path))
+        record('load.excel_parse', seconds)
+        parquet_path = output_paths(xlsx_path, ['parquet'])['parquet']
+        write_outputs({'parquet': parquet_path}, main.columns, lambda: frame_batches(main))
+        seconds, _ = timed(lambda: read_report(parquet_path), repeat)
+        record('load.parquet_parse', seconds)
+        seconds, _ = timed(lambda: load_report(xlsx_path, cache_dir=cache_dir))
+        record('load.cache_miss', seconds)
+        digest = None
+    else:
+        # Too big for a workbook: seed the columnar cache directly
+        digest = f"synthetic-{n}"
+        os.makedirs(cache_dir, exist_ok=True)
+        prepare_report(main.copy()).to_parquet(cache_path(digest, cache_dir), index=False)
+    seconds, _ = timed(lambda: load_report(xlsx_path, cache_dir=cache_dir, digest=digest), repeat)
+    record('load.cache_hit', seconds)
+    seconds, df = timed(lambda: load_report(xlsx_path, cache_dir=cache_dir, digest=digest, compact=True), repeat)
+    record('load.cache_hit_compact', seconds)
+
+    # --- AGGREGATE (no rendering) ---
+    seconds, ds = timed(lambda: Dataset(df), repeat)
+    record('aggregate.dataset_build', seconds)
+    platforms = df['发布平台'].unique().tolist()
+    seconds, totals = timed(lambda: platform_totals(ds.cube, platforms), repeat)
+    record('aggregate.platform_totals', seconds)
+    seconds, _ = timed(lambda: best_platform(totals), repeat)
+    record('aggregate.sidebar_insight', seconds)
+    seconds, _ = timed(lambda: kpi_summary(totals), repeat)
+    record('aggregate.tier1_kpis', seconds)
+    seconds, _ = timed(lambda: (platform_volume(totals), daily_counts(ds.cube, platforms)), repeat)
+    record('aggregate.tier2_volume_daily', seconds)
+    seconds, _ = timed(lambda: (totals['阅读数'].reset_index(),
+                                totals[['点赞数', '评论数', '转发数']].reset_index()), repeat)
+    record('aggregate.tier3_comps', seconds)
+
+    # --- SNAPSHOT (precomputed startup) ---
+    if xlsx_path is not None:
+        seconds, _ = timed(lambda: write_snapshot(snapshot_path(xlsx_path), build_snapshot(ds, content_hash(xlsx_path))))
+        record('snapshot.build', seconds)
+        seconds, _ = timed(lambda: load_snapshot(xlsx_path), repeat)
+        record('snapshot.load', seconds)
+
+    # --- STARTUP (fresh process: imports, first render from the snapshot, rerun) ---
+    if xlsx_path is not None:
+        times = startup_times(xlsx_path, cache_dir, repeat)
+        record('startup.import', times['import'], eager=times['eager'])
+        record('startup.first_render', times['first_render'])
+        record('startup.rerun', times['rerun'])
+
+    # --- LEADERBOARD ---
+    seconds, _ = timed(lambda: (csi_leaderboard(ds.df, ds.topk, platforms),
+                                top_articles(ds.df, ds.topk, platforms, '评论数')), repeat)
+    record('leaderboard.all_platforms', seconds)
+    seconds, _ = timed(lambda: [csi_leaderboard(ds.df, ds.topk, [p]) for p in platforms], repeat)
+    record('leaderboard.each_platform', seconds / max(len(platforms), 1))
+
+    # --- WRITE (merge outputs) ---
+    for formats in (['csv'], ['parquet'], ['xlsx'], ['parquet', 'xlsx']):
+        if 'xlsx' in formats and xlsx_path is None:
+            continue
+        paths = output_paths(os.path.join(workdir, f"out-{n}"), formats)
+        seconds, _ = timed(lambda: write_outputs(paths, main.columns, lambda: frame_batches(main)))
+        record(f"write.{'+'.join(formats)}", seconds)
+
+    # --- SENTIMENT (every row unlabelled: cold cache, then warm) ---
+    unlabelled = main[['标题', '摘要']].assign(情感属性=None)
+    cache = SentimentCache(os.path.join(workdir, f"sentiment-{n}.sqlite"))
+    seconds, _ = timed(lambda: fill_sentiment(unlabelled.copy(), cache))
+    record('sentiment.classify', seconds)
+    seconds, _ = timed(lambda: fill_sentiment(unlabelled.copy(), cache), repeat)
+    record('sentiment.cached', seconds)
+
+    # --- MERGE ---
+    if xlsx_path is None:
+        print("  merge.end_to_end             skipped (main sheet too large for xlsx)")
+        return
+    csv_paths = {}
+    for name, frame in sources.items():
+        csv_paths[name] = os.path.join(workdir, f"xinhua_{name}-{n}.csv")
+        frame.to_csv(csv_paths[name], index=False)
+    merge_backtrace.MAIN_EXCEL = xlsx_path
+    merge_backtrace.BILI_CSV = csv_paths['bili']
+    merge_backtrace.RED_CSV = csv_paths['red']
+    merge_backtrace.WX_CSV = csv_paths['wx']
+    merge_backtrace.OUTPUT_EXCEL = os.path.join(workdir, f"merged-{n}.xlsx")
+    merge_backtrace.SENTIMENT_CACHE = os.path.join(workdir, f"sentiment-merge-{n}.sqlite")
+    with contextlib.redirect_stdout(io.StringIO()):
+        seconds, _ = timed(merge_backtrace.merge_data)
+    record('merge.end_to_end', seconds, csv_rows=sum(len(f) for f in sources.values()))
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    """Print the ratio of each stage's time to the same stage in a previous run."""
+    with open(baseline_path, encoding='utf-8') as fh:
+        baseline = {(r['size'], r['stage']): r['seconds'] for r in json.load(fh)['results']}
+    print(f"\nCompared with {baseline_path} (>1.00 is slower):")
+    for r in results:
+        before = baseline.get((r['size'], r['stage']))
+        if before:
+            print(f"  {r['size']:>9,} {r['stage']:<28} {r['seconds'] / before:>6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark of the load, aggregate and merge paths.")
+    parser.add_argument("--sizes", default="10k,100k",
+                        help="comma-separated main-sheet row counts, e.g. 10k,100k,1m,2m")
+    parser.add_argument("--repeat", type=int, default=3, help="repetitions for fast stages (best is kept)")
+    parser.add_argument("--max-xlsx-rows", type=parse_size, default=DEFAULT_MAX_XLSX_ROWS,
+                        help="largest size written as a workbook (Excel parse and merge stages)")
+    parser.add_argument("--output", default=None, help="results JSON (default: bench_results/<timestamp>.json)")
+    parser.add_argument("--baseline", default=None, help="previous results JSON to compare against")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="monitor-bench-") as workdir:
+        for n in [parse_size(s) for s in args.sizes.split(",")]:
+            bench_size(n, workdir, args.repeat, args.max_xlsx_rows, results)
+
+    output = args.output or os.path.join(RESULTS_DIR, datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    meta = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'machine': platform.platform(),
+    }
+    with open(output, 'w', encoding='utf-8') as fh:
+        json.dump({'meta': meta, 'results': results}, fh, ensure_ascii=False, indent=2)
+    print(f"Saved results to: {output}")
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
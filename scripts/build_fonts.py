@@ -0,0 +1,62 @@
+import argparse
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Web font file served from static/fonts -> (installed font file, family of the face to take from it).
+# The Debian packages fonts-noto-cjk, fonts-noto-cjk-extra and fonts-jetbrains-mono provide the sources;
+# the CJK files are collections, of which only the Simplified Chinese face is kept.
+FONTS = {
+    "NotoSansSC-Regular.woff2": ("NotoSansCJK-Regular.ttc", "Noto Sans CJK SC"),
+    "NotoSansSC-Medium.woff2": ("NotoSansCJK-Medium.ttc", "Noto Sans CJK SC"),
+    "NotoSansSC-Bold.woff2": ("NotoSansCJK-Bold.ttc", "Noto Sans CJK SC"),
+    "JetBrainsMono-Regular.woff2": ("JetBrainsMono-Regular.ttf", None),
+    "JetBrainsMono-Bold.woff2": ("JetBrainsMono-Bold.ttf", None),
+}
+FONT_DIR = "/usr/share/fonts"
+
+
+def find_font(name, font_dir=FONT_DIR):
+    """Path of the installed font file called ``name`` (None if not installed)."""
+    for root, _, files in os.walk(font_dir):
+        if name in files:
+            return os.path.join(root, name)
+    return None
+
+
+def load_face(path, family):
+    """The font in ``path``; for a collection, its face whose (typographic) family is ``family``."""
+    from fontTools.ttLib import TTCollection, TTFont
+    if family is None:
+        return TTFont(path)
+    for font in TTCollection(path).fonts:
+        names = font['name']
+        if (names.getDebugName(16) or names.getDebugName(1)) == family:
+            return font
+    raise ValueError(f"{path} has no '{family}' face")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert the installed dashboard fonts to WOFF2 for static/fonts.")
+    parser.add_argument("--font-dir", default=FONT_DIR, help="where the fonts are installed (default: %(default)s)")
+    parser.add_argument("--out", default=os.path.join(ROOT_DIR, "static", "fonts"),
+                        help="output directory (default: %(default)s)")
+    args = parser.parse_args()
+
+    sources = {name: find_font(source, args.font_dir) for name, (source, _) in FONTS.items()}
+    missing = [FONTS[name][0] for name, path in sources.items() if path is None]
+    if missing:
+        # Shipping the image without its fonts must not pass silently
+        sys.exit(f"Fonts not installed under {args.font_dir}: {', '.join(missing)}")
+
+    os.makedirs(args.out, exist_ok=True)
+    for name, path in sources.items():
+        font = load_face(path, FONTS[name][1])
+        font.flavor = "woff2"
+        font.save(os.path.join(args.out, name))
+        print(f"{path} -> {name} ({os.path.getsize(os.path.join(args.out, name)) / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from monitor.shared import resolve_report
+from monitor.snapshot import snapshot_report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute the dashboard snapshot of a report.")
+    parser.add_argument("path", nargs="?", default=os.environ.get("MONITOR_DATA_PATH", "信源监测_Updated.xlsx"),
+                        help="report file or data directory, as served by the dashboard "
+                             "(default: $MONITOR_DATA_PATH or %(default)s)")
+    args = parser.parse_args()
+
+    # The same file the dashboard would pick (newest report, Parquet copy first)
+    report = resolve_report(args.path)
+    start = time.perf_counter()
+    path = snapshot_report(report, compact=os.environ.get("MONITOR_COMPACT_SCHEMA", "1") != "0")
+    size = sum(entry.stat().st_size for entry in os.scandir(path))
+    print(f"Snapshot of {report} written to {path} ({size / 1024:.0f} KB, {time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import argparse
+import glob
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from monitor.anomaly import describe_flag
+from monitor.shared import REPORT_PATTERNS
+from monitor.store import ArticleStore
+
+DEFAULT_STORE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "monitor.sqlite")
+
+
+def report_files(paths):
+    """Reports named on the command line, expanding directories, oldest first.
+
+    In a directory, a workbook the merge also wrote as Parquet is taken once,
+    through the Parquet copy.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            found = [f for pattern in REPORT_PATTERNS for f in glob.glob(os.path.join(path, pattern))
+                     if not os.path.basename(f).startswith("~$")]
+            files.extend(f for f in found
+                         if not (f.endswith(".xlsx") and os.path.splitext(f)[0] + ".parquet" in found))
+        else:
+            files.append(path)
+    # Oldest first, so a newer report of the same articles leaves its metrics in the store
+    return sorted(files, key=os.path.getmtime)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Append monitoring reports to the local article store.")
+    parser.add_argument("paths", nargs="+", help="report workbooks (or Parquet/CSV merge outputs) or directories of them")
+    parser.add_argument("--store", default=os.environ.get("MONITOR_STORE", DEFAULT_STORE),
+                        help=f"SQLite file (default: $MONITOR_STORE or {DEFAULT_STORE})")
+    parser.add_argument("--force", action="store_true", help="re-ingest files that were ingested before")
+    args = parser.parse_args()
+
+    store = ArticleStore(args.store)
+    for path in report_files(args.paths):
+        rows = store.ingest_report(path, force=args.force)
+        if rows is None:
+            print(f"Skipped {path} (already ingested)")
+        else:
+            print(f"Ingested {rows} rows from {path}")
+    flags = store.update_anomalies()
+    print(f"Anomaly check: {len(flags)} new flagged day metrics")
+    for _, flag in flags.iterrows():
+        print(f"  {describe_flag(flag)}")
+    print(f"Store: {args.store}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,25 @@
 import pandas as pd
+import numpy as np
+import argparse
 import os
+import sys
+import pickle
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from monitor.join import KeyIndex, join_source, normalize_urls, normalize_titles
+from monitor.anomaly import describe_flag
+from monitor.fuzzy import FuzzyTitleIndex
+from monitor.sentiment import SentimentCache, fill_sentiment
+from monitor.incremental import file_fingerprint, row_hashes, diff_rows, load_state, save_state
+from monitor.shared import resolve_report
+from monitor.snapshot import snapshot_report
+from monitor.store import ArticleStore
+from monitor.timestamps import parse_timestamps, in_range
+from monitor.data import read_table
+from monitor.writers import frame_batches, output_paths, write_outputs
 
 # Define file paths
 BASE_DIR = "/Users/yuwen/work/XinHuaData"
@@ -10,6 +30,99 @@ RED_CSV = os.path.join(DATA_DIR, "xinhua_red.csv")
 WX_CSV = os.path.join(DATA_DIR, "xinhua_wx.csv")
 
 OUTPUT_EXCEL = os.path.join(BASE_DIR, "信源监测_Updated.xlsx")
+# Formats written next to OUTPUT_EXCEL (same name, own extension) in one pass:
+# 'xlsx' for people, 'parquet' for the dashboard and incremental runs, 'csv'
+OUTPUT_FORMATS = ['xlsx']
+STATE_FILE = os.path.join(BASE_DIR, ".merge_state.json")
+
+# Rows per back-trace CSV chunk in streaming mode (--stream)
+STREAM_CHUNKSIZE = 100_000
+
+# Near-duplicate title matching (--fuzzy): minimum n-gram Jaccard similarity
+# of normalized titles, and where the matches are listed for review
+FUZZY_THRESHOLD = 0.8
+FUZZY_REPORT = os.path.join(BASE_DIR, "信源监测_fuzzy_matches.csv")
+
+# Rows without a 情感属性 (appended back-trace rows) are classified offline, in
+# batches across SENTIMENT_WORKERS processes (default: one per CPU); labels are
+# cached by title/summary hash so unchanged articles are never scored twice.
+# With SENTIMENT off (--no-sentiment) appended rows are stamped '中性' instead.
+SENTIMENT = True
+SENTIMENT_CACHE = os.path.join(BASE_DIR, ".sentiment_cache.sqlite")
+SENTIMENT_WORKERS = None
+
+# Back-trace sources in routing order: a main row is routed to the first
+# source whose platform name or URL hint it contains, and only that source
+# is searched for a match. `title` is None where matching is URL-only.
+SOURCES = [
+    {
+        'name': 'bili', 'platform': 'B站', 'url_hint': 'bilibili',
+        'url': 'url', 'title': 'title', 'time': 'publish_time',
+        'metrics': {'阅读数': 'read_count', '点赞数': 'like_count', '评论数': 'comment_count', '转发数': 'share_count'},
+    },
+    {
+        'name': 'red', 'platform': '小红书', 'url_hint': 'xiaohongshu',
+        'url': 'url', 'title': None, 'time': '创建时间',
+        'metrics': {'阅读数': 'num_read', '点赞数': 'num_like', '评论数': 'num_comment', '转发数': 'num_repost'},
+    },
+    {
+        'name': 'wx', 'platform': '微信', 'url_hint': 'weixin',
+        'url': 'url', 'title': 'title', 'time': 'posttime',
+        'metrics': {'阅读数': 'readnum', '点赞数': 'likenum', '转发数': 'share_num'},
+    },
+]
+
+def source_paths():
+    return {'bili': BILI_CSV, 'red': RED_CSV, 'wx': WX_CSV}
+
+def read_inputs(workbook, csv_paths):
+    """Read a workbook and back-trace CSVs concurrently.
+
+    The workbook parse (CPU-bound openpyxl) runs in a worker process while the
+    CSVs are read in threads alongside it. Each input fails on its own:
+    returns ``(df, sources, skipped)`` where ``df`` is None if the workbook
+    could not be read (its error is in ``skipped[None]``) and ``skipped``
+    maps every CSV that failed to its error.
+    """
+    sources, skipped = {}, {}
+    with ProcessPoolExecutor(max_workers=1) as processes, \
+            ThreadPoolExecutor(max_workers=max(len(csv_paths), 1)) as threads:
+        main_future = processes.submit(read_table, workbook)
+        csv_futures = {name: threads.submit(pd.read_csv, path) for name, path in csv_paths.items()}
+        for name, future in csv_futures.items():
+            try:
+                sources[name] = future.result()
+            except Exception as e:
+                skipped[name] = e
+        try:
+            df = main_future.result()
+        except Exception as e:
+            df = None
+            skipped[None] = e
+    return df, sources, skipped
+
+def output_files():
+    """{format: path} of every output of a merge."""
+    return output_paths(OUTPUT_EXCEL, OUTPUT_FORMATS)
+
+def primary_output():
+    """The output incremental runs read back and fingerprint (the Parquet file when written)."""
+    paths = output_files()
+    return next(paths[fmt] for fmt in ('parquet', 'xlsx', 'csv') if fmt in paths)
+
+def save_outputs(columns, batches):
+    paths = output_files()
+    write_outputs(paths, columns, batches)
+    for path in paths.values():
+        print(f"Saved updated file to: {path}")
+
+def output_state(rows):
+    return {'fingerprint': file_fingerprint(primary_output()), 'rows': rows, 'formats': list(OUTPUT_FORMATS)}
+
+def report_skipped(skipped):
+    for spec in SOURCES:
+        if spec['name'] in skipped:
+            print(f"  Skipped {spec['platform']} ({spec['name']}): {skipped[spec['name']]}")
 
 def clean_url(url):
     """Simple URL cleaner to help matching."""
@@ -17,212 +130,804 @@ def clean_url(url):
         return ""
     return url.strip()
 
-def merge_data():
-    print(f"Loading main data from {MAIN_EXCEL}...")
-    try:
-        df_main = pd.read_excel(MAIN_EXCEL)
-    except FileNotFoundError:
-        print("Main Excel file not found.")
+def key_columns(spec):
+    return [spec['url']] + ([spec['title']] if spec['title'] else [])
+
+def route_main(df_main):
+    """Assign every main row to at most one source, following SOURCES order."""
+    urls = normalize_urls(df_main['原文链接'])
+    platforms = df_main['发布平台'].map(str)
+    unrouted = np.ones(len(df_main), dtype=bool)
+    routes = {}
+    for spec in SOURCES:
+        hit = (platforms.str.contains(spec['platform'], regex=False)
+               | urls.str.contains(spec['url_hint'], regex=False)).to_numpy()
+        routes[spec['name']] = unrouted & hit
+        unrouted &= ~hit
+    return routes
+
+def patch_rows(df, patch):
+    """Overwrite the cells of `df` present in `patch` (a frame indexed by df labels)."""
+    if patch.empty:
         return
+    hit = df.index.isin(patch.index)
+    for col in patch.columns:
+        if col not in df.columns:
+            df[col] = np.nan
+        df[col] = df[col].where(~hit, patch[col].reindex(df.index))
 
-    # Load back-trace data
-    print("Loading back-trace CSVs...")
-    try:
-        df_bili = pd.read_csv(BILI_CSV)
-        df_red = pd.read_csv(RED_CSV)
-        df_wx = pd.read_csv(WX_CSV)
-    except Exception as e:
-        print(f"Error loading CSVs: {e}")
+def apply_metrics(df, spec, df_src, positions):
+    """Copy the source metrics of every matched record (positions >= 0) onto its row."""
+    hit = positions >= 0
+    if not hit.any():
         return
+    patch = pd.DataFrame(index=df.index[hit])
+    for col, src_col in spec['metrics'].items():
+        if src_col in df_src.columns:
+            patch[col] = df_src[src_col].to_numpy()[positions[hit]]
+        else:
+            patch[col] = 0
+    patch_rows(df, patch)
 
-    # Create lookups for faster access and TRACKING matches
-    matched_urls = set()
-    
-    # Pre-process main df to build index of existing articles
-    existing_urls = set()
-    existing_titles = set()
-    for _, row in df_main.iterrows():
-        if pd.notna(row['原文链接']):
-            existing_urls.add(clean_url(row['原文链接']))
-        if pd.notna(row['标题']):
-            existing_titles.add(str(row['标题']).strip())
-
-    # Build maps for the CSVs to easily access data
-    # We will use these maps for keys
-    bili_records = df_bili.to_dict('records')
-    red_records = df_red.to_dict('records')
-    wx_records = df_wx.to_dict('records')
+def update_main(df_main, sources, routes):
+    """Update main rows in place from the back-trace sources.
+
+    Each source is indexed once by URL and title, then all routed main rows
+    are resolved in one pass. Returns the per-source winning record position
+    of every main row (-1 when unmatched) and the total number of updates.
+    """
+    winners = {}
+    updates_count = 0
+    for spec in SOURCES:
+        if spec['name'] not in sources:
+            continue
+        df_src = sources[spec['name']]
+        index = KeyIndex(df_src[spec['url']],
+                         df_src[spec['title']] if spec['title'] else None)
+        positions, stats = join_source(index, df_main['原文链接'],
+                                       df_main['标题'] if spec['title'] else None,
+                                       mask=routes[spec['name']])
+        apply_metrics(df_main, spec, df_src, positions)
+
+        winners[spec['name']] = positions
+        updates_count += stats['matched']
+        print(f"  {spec['platform']}: matched {stats['matched']}, missed {stats['missed']}, "
+              f"ambiguous {stats['ambiguous']}")
+    return winners, updates_count
+
+def fuzzy_match(df_main, sources, routes, winners, threshold):
+    """Near-duplicate title matching for the records the exact join left over.
 
+    Titles are normalized (full/half width, case, punctuation, a trailing
+    "｜新华网"-style site name) and blocked with a MinHash/LSH index over the
+    main sheet, so only plausible pairs are scored. For titled sources:
+
+    - a main row routed to the source and still unmatched takes the metrics
+      of its most similar leftover record (ties: earliest record);
+    - any other leftover record similar to a main title is a near-duplicate
+      of an existing article and is not appended.
+
+    Leftover records whose URL or title equals that of a main article or of
+    an exact match are exact duplicates and are not scored.
+
+    ``winners`` is updated in place. Returns the audit frame (one line per
+    fuzzy match) and ``{source: positions of records not to append}``.
+    """
+    index = FuzzyTitleIndex(df_main['标题'])
+    main_urls, main_titles = existing_keys(df_main)
+    audits = []
+    matched_records = {}
+    for spec in SOURCES:
+        name = spec['name']
+        if name not in sources or not spec['title']:
+            continue
+        df_src = sources[name]
+        positions = winners[name]
+        won = np.zeros(len(df_src), dtype=bool)
+        won[positions[positions >= 0]] = True
+        # Records keyed exactly to a main article or an exact winner are the
+        # exact path's (not appended anyway); only the rest can match fuzzily
+        urls = normalize_urls(df_src[spec['url']]).to_numpy()
+        titles = df_src[spec['title']]
+        titles = normalize_titles(titles).where(titles.notna(), "").to_numpy()
+        known_urls = (main_urls | set(urls[won])) - {""}
+        known_titles = (main_titles | set(titles[won])) - {""}
+        exact = pd.Series(urls).isin(known_urls).to_numpy() | pd.Series(titles).isin(known_titles).to_numpy()
+        leftover = np.flatnonzero(~won & ~exact)
+        pairs = index.matches(df_src[spec['title']].iloc[leftover], threshold)
+        pairs['query'] = leftover[pairs['query'].to_numpy()]
+
+        # Pairs come best first, so the first pair of a row is its match
+        open_rows = routes[name] & (positions < 0)
+        claimed = pairs[open_rows[pairs['row'].to_numpy()]].drop_duplicates('row')
+        fuzzy_positions = np.full(len(df_main), -1, dtype=np.int64)
+        fuzzy_positions[claimed['row'].to_numpy()] = claimed['query'].to_numpy()
+        apply_metrics(df_main, spec, df_src, fuzzy_positions)
+        positions[claimed['row'].to_numpy()] = claimed['query'].to_numpy()
+
+        duplicates = pairs[~pairs['query'].isin(claimed['query'])].drop_duplicates('query')
+        matched_records[name] = np.union1d(claimed['query'].to_numpy(), duplicates['query'].to_numpy())
+        for action, found in (('matched', claimed), ('duplicate', duplicates)):
+            rows, records = found['row'].to_numpy(), found['query'].to_numpy()
+            audits.append(pd.DataFrame({
+                'platform': spec['platform'],
+                'action': action,
+                'score': found['score'].round(4).to_numpy(),
+                'main_row': rows,
+                'main_title': df_main['标题'].to_numpy()[rows],
+                'main_url': df_main['原文链接'].to_numpy()[rows],
+                'record': records,
+                'record_title': df_src[spec['title']].to_numpy()[records],
+                'record_url': df_src[spec['url']].to_numpy()[records],
+            }))
+        print(f"  {spec['platform']}: fuzzy-matched {len(claimed)} rows, "
+              f"{len(duplicates)} near-duplicate records not appended")
+    audit = pd.concat(audits, ignore_index=True) if audits else pd.DataFrame()
+    if not audit.empty:
+        audit = audit.sort_values(['platform', 'action', 'main_row', 'record'], ignore_index=True)
+    return audit, matched_records
+
+def existing_keys(df_main):
+    """URL and title sets of the articles already in the main sheet."""
+    urls = df_main['原文链接']
+    titles = df_main['标题']
+    return set(normalize_urls(urls[urls.notna()])), set(normalize_titles(titles[titles.notna()]))
+
+def time_range(df_main):
     # Calculate valid time range from main data
     if '发布时间' in df_main.columns:
-        df_main['发布时间'] = pd.to_datetime(df_main['发布时间'])
+        df_main['发布时间'], failures = parse_timestamps(df_main['发布时间'], key='发布时间')
+        if failures:
+            print(f"Warning: {failures} main rows have an unparseable 发布时间.")
         min_date = df_main['发布时间'].min()
         max_date = df_main['发布时间'].max()
         print(f"Main data time range: {min_date} to {max_date}")
+        return min_date, max_date
+    print("Warning: No '发布时间' in main data. Skipping time filtering.")
+    return pd.Timestamp.min, pd.Timestamp.max
+
+def build_row(name, item):
+    """Main-sheet row for an appended back-trace record."""
+    if name == 'bili':
+        return {
+            '发布平台': 'B站',
+            '标题': item.get('title'),
+            '原文链接': item.get('url'),
+            '发布时间': item.get('publish_time'),
+            '阅读数': item.get('read_count', 0),
+            '点赞数': item.get('like_count', 0),
+            '评论数': item.get('comment_count', 0),
+            '转发数': item.get('share_count', 0),
+            '摘要': str(item.get('content', ''))[:100] if pd.notna(item.get('content')) else '', # Content extract, safe handle
+            '作者': item.get('author_name', '新华网'),
+        }
+    if name == 'red':
+        return {
+            '发布平台': '小红书',
+            '标题': '小红书笔记', # Fallback
+            '原文链接': item.get('url'),
+            '发布时间': item.get('创建时间'), # Use create time
+            '阅读数': item.get('num_read', 0),
+            '点赞数': item.get('num_like', 0),
+            '评论数': item.get('num_comment', 0),
+            '转发数': item.get('num_repost', 0),
+        }
+    return {
+        '发布平台': '微信',
+        '标题': item.get('title'),
+        '原文链接': item.get('url'),
+        '发布时间': item.get('posttime'),
+        '阅读数': item.get('readnum', 0),
+        '点赞数': item.get('likenum', 0),
+        '转发数': item.get('share_num', 0),
+        '评论数': 0, # Metric often missing in Wx export
+        '作者': item.get('author')
+    }
+
+def append_rows(spec, df_src, positions, existing_urls, existing_titles, dated):
+    """New main rows for the given source records that pass the date and duplicate checks.
+
+    ``dated`` is the ``time_mask`` of the source. Returns a list of
+    ``(source_position, row)`` in source order.
+    """
+    rows = []
+    # Date Check
+    positions = positions[dated[positions]]
+    records = df_src.iloc[positions].to_dict('records')
+    for pos, item in zip(positions, records):
+        # Double check against existing sets (in case main df had it but we missed mapping logic)
+        url = clean_url(item.get(spec['url']))
+        if url in existing_urls:
+            continue
+        if spec['title'] and str(item.get(spec['title'])).strip() in existing_titles:
+            continue
+        rows.append((int(pos), build_row(spec['name'], item)))
+    return rows
+
+def with_new_rows(df_main, new_rows):
+    if not new_rows:
+        return df_main
+    df_new = pd.DataFrame(new_rows)
+    # Identify columns in main but not in new (e.g. '情感属性')
+    # We should fill them with default
+    for col in df_main.columns:
+        if col not in df_new.columns:
+            df_new[col] = None
+            # Left empty for label_sentiment, or Neutral when classification is off
+            if col == '情感属性' and not SENTIMENT:
+                df_new[col] = '中性' # Default to Neutral for safe display
+
+    # Concatenate
+    return pd.concat([df_main, df_new], ignore_index=True)
+
+def label_sentiment(df, verbose=True):
+    """Classify the rows of ``df`` without a 情感属性, in place (see monitor.sentiment)."""
+    if not SENTIMENT or '情感属性' not in df.columns:
+        return 0
+    labelled, cached = fill_sentiment(df, SentimentCache(SENTIMENT_CACHE), SENTIMENT_WORKERS)
+    if verbose and labelled:
+        print(f"Sentiment: labelled {labelled} rows ({cached} from cache, {labelled - cached} classified)")
+    return labelled
+
+def report_unparsed(spec, failures):
+    if failures:
+        print(f"  {spec['platform']}: {failures} records with an unparseable {spec['time']} skipped")
+
+def time_mask(spec, df_src, min_date, max_date, rows=None, failures=None):
+    """Mask over all source records: published within the main sheet's range.
+
+    Only ``rows`` (default: every record) are parsed; the rest stay False.
+    Records whose time cannot be parsed are out of range and are counted:
+    reported right away, or added to ``failures[spec['name']]`` if given.
+    """
+    dated = np.zeros(len(df_src), dtype=bool)
+    if spec['time'] not in df_src.columns:
+        return dated
+    rows = np.arange(len(df_src)) if rows is None else np.asarray(rows, dtype=np.int64)
+    times, unparsed = parse_timestamps(df_src[spec['time']].iloc[rows], key=f"{spec['name']}.{spec['time']}")
+    if failures is None:
+        report_unparsed(spec, unparsed)
     else:
-        print("Warning: No '发布时间' in main data. Skipping time filtering.")
-        min_date = pd.Timestamp.min
-        max_date = pd.Timestamp.max
+        failures[spec['name']] = failures.get(spec['name'], 0) + unparsed
+    dated[rows] = in_range(times, min_date, max_date)
+    return dated
 
-    def is_in_range(date_str):
-        try:
-            d = pd.to_datetime(date_str)
-            return min_date <= d <= max_date
-        except:
-            return False
+def merge_full(main_fingerprint=None, fuzzy=None):
+    """Merge everything from scratch. Returns the merge state for incremental reruns.
 
-    new_rows = []
-    updates_count = 0
+    ``fuzzy`` is a similarity threshold that turns on ``fuzzy_match`` after
+    the exact join; its matches are written to FUZZY_REPORT.
+    """
+    print(f"Loading main data from {MAIN_EXCEL} and back-trace CSVs...")
+    paths = source_paths()
+    df_main, sources, skipped = read_inputs(MAIN_EXCEL, paths)
+    if df_main is None:
+        if isinstance(skipped[None], FileNotFoundError):
+            print("Main Excel file not found.")
+        else:
+            print(f"Error loading main Excel: {skipped[None]}")
+        return None
+    # A back-trace source that failed to load is left out of this merge
+    report_skipped(skipped)
+
+    # Pre-process main df to build index of existing articles
+    existing_urls, existing_titles = existing_keys(df_main)
+    min_date, max_date = time_range(df_main)
 
-    # 1. UPDATE PHASE: Iterate existing main data
-    for index, row in df_main.iterrows():
-        url = clean_url(row['原文链接'])
-        title = str(row['标题']).strip()
-        platform = str(row['发布平台'])
-        
-        # Check Bili (Update)
-        if 'B站' in platform or 'bilibili' in url:
-            for item in bili_records:
-                b_url = clean_url(item.get('url'))
-                b_title = str(item.get('title')).strip()
-                if (url and b_url == url) or (title and b_title == title):
-                    # Match found
-                    df_main.at[index, '阅读数'] = item.get('read_count', 0)
-                    df_main.at[index, '点赞数'] = item.get('like_count', 0)
-                    df_main.at[index, '评论数'] = item.get('comment_count', 0)
-                    df_main.at[index, '转发数'] = item.get('share_count', 0)
-                    updates_count += 1
-                    matched_urls.add(b_url)
-                    matched_urls.add(b_title) # Track title as "id" too effectively
-                    item['_matched'] = True
-                    break
-
-        # Check Red (Update)
-        elif '小红书' in platform or 'xiaohongshu' in url:
-            for item in red_records:
-                r_url = clean_url(item.get('url'))
-                if url and r_url == url:
-                    df_main.at[index, '阅读数'] = item.get('num_read', 0)
-                    df_main.at[index, '点赞数'] = item.get('num_like', 0)
-                    df_main.at[index, '评论数'] = item.get('num_comment', 0)
-                    df_main.at[index, '转发数'] = item.get('num_repost', 0)
-                    updates_count += 1
-                    matched_urls.add(r_url)
-                    item['_matched'] = True
-                    break
-        
-        # Check WeChat (Update)
-        elif '微信' in platform or 'weixin' in url:
-            for item in wx_records:
-                w_url = clean_url(item.get('url'))
-                w_title = str(item.get('title')).strip()
-                if (url and w_url == url) or (title and w_title == title):
-                    df_main.at[index, '阅读数'] = item.get('readnum', 0)
-                    df_main.at[index, '点赞数'] = item.get('likenum', 0)
-                    df_main.at[index, '转发数'] = item.get('share_num', 0)
-                    updates_count += 1
-                    matched_urls.add(w_url)
-                    matched_urls.add(w_title)
-                    item['_matched'] = True
-                    break
+    # 1. UPDATE PHASE: resolve every main row against hashed source indexes
+    routes = route_main(df_main)
+    winners, updates_count = update_main(df_main, sources, routes)
+    fuzzy_records = {}
+    if fuzzy is not None:
+        print(f"Matching near-duplicate titles (similarity >= {fuzzy})...")
+        audit, fuzzy_records = fuzzy_match(df_main, sources, routes, winners, fuzzy)
+        updates_count += int((audit['action'] == 'matched').sum()) if not audit.empty else 0
+        audit.to_csv(FUZZY_REPORT, index=False, encoding='utf-8-sig')
+        print(f"Fuzzy match report saved to: {FUZZY_REPORT}")
 
     # 2. APPEND PHASE: Check for unmatched CSV records with DATE FILTER
     print("Checking for new records to append (within time range)...")
-    
-    # Append Bilibili
-    for item in bili_records:
-        if not item.get('_matched'):
-            # Double check against existing sets (in case main df had it but we missed mapping logic)
-            b_url = clean_url(item.get('url'))
-            b_title = str(item.get('title')).strip()
-            # Date Check
-            b_time = item.get('publish_time')
-            if not is_in_range(b_time):
-                continue
-                
-            if b_url not in existing_urls and b_title not in existing_titles:
-                new_row = {
-                    '发布平台': 'B站',
-                    '标题': item.get('title'),
-                    '原文链接': item.get('url'),
-                    '发布时间': b_time,
-                    '阅读数': item.get('read_count', 0),
-                    '点赞数': item.get('like_count', 0),
-                    '评论数': item.get('comment_count', 0),
-                    '转发数': item.get('share_count', 0),
-                    '摘要': str(item.get('content', ''))[:100] if pd.notna(item.get('content')) else '', # Content extract, safe handle
-                    '作者': item.get('author_name', '新华网'),
-                }
-                new_rows.append(new_row)
-
-    # Append Red
-    for item in red_records:
-        if not item.get('_matched'):
-            r_url = clean_url(item.get('url'))
-            # Date Check
-            r_time = item.get('创建时间')
-            if not is_in_range(r_time):
-                continue
+    new_rows = []
+    appended = {}
+    for spec in SOURCES:
+        if spec['name'] not in sources:
+            continue
+        df_src = sources[spec['name']]
+        won = np.zeros(len(df_src), dtype=bool)
+        won[winners[spec['name']][winners[spec['name']] >= 0]] = True
+        won[fuzzy_records.get(spec['name'], [])] = True
+        candidates = np.flatnonzero(~won)
+        dated = time_mask(spec, df_src, min_date, max_date, candidates)
+        rows = append_rows(spec, df_src, candidates, existing_urls, existing_titles, dated)
+        appended[spec['name']] = {pos: len(df_main) + len(new_rows) + i for i, (pos, _) in enumerate(rows)}
+        new_rows.extend(row for _, row in rows)
+
+    print(f"Data merge complete. Updated {updates_count} rows.")
+    print(f"Found {len(new_rows)} new rows to append.")
+    if skipped:
+        print(f"Skipped sources: {', '.join(sorted(skipped))}")
+
+    df_final = with_new_rows(df_main, new_rows)
+    label_sentiment(df_final)
 
-            if r_url not in existing_urls:
-                new_row = {
-                    '发布平台': '小红书',
-                    '标题': '小红书笔记', # Fallback
-                    '原文链接': item.get('url'),
-                    '发布时间': r_time, # Use create time
-                    '阅读数': item.get('num_read', 0),
-                    '点赞数': item.get('num_like', 0),
-                    '评论数': item.get('num_comment', 0),
-                    '转发数': item.get('num_repost', 0),
-                }
-                new_rows.append(new_row)
-
-    # Append WeChat
-    for item in wx_records:
-        if not item.get('_matched'):
-            w_url = clean_url(item.get('url'))
-            w_title = str(item.get('title')).strip()
-            # Date Check
-            w_time = item.get('posttime')
-            if not is_in_range(w_time):
+    # Save
+    save_outputs(df_final.columns, lambda: frame_batches(df_final))
+
+    has_range = '发布时间' in df_main.columns
+    state = {
+        'main': {'fingerprint': main_fingerprint or file_fingerprint(MAIN_EXCEL), 'rows': len(df_main)},
+        'output': output_state(len(df_final)),
+        'time_range': [str(min_date), str(max_date)] if has_range else None,
+        'sources': {},
+    }
+    urls = normalize_urls(df_main['原文链接'])
+    titles = normalize_titles(df_main['标题'])
+    for spec in SOURCES:
+        name = spec['name']
+        routed = np.flatnonzero(routes[name])
+        entry = {
+            'url_rows': _key_rows(urls.iloc[routed], routed),
+            'title_rows': _key_rows(titles.iloc[routed], routed) if spec['title'] else {},
+        }
+        if name in sources:
+            df_src = sources[name]
+            positions = winners[name]
+            entry.update({
+                'fingerprint': file_fingerprint(paths[name]),
+                'rows': len(df_src),
+                'row_hashes': row_hashes(df_src),
+                'key_hashes': row_hashes(df_src, key_columns(spec)),
+                'hashes': None,
+                'winners': {str(r): int(positions[r]) for r in np.flatnonzero(positions >= 0)},
+                'appended': {str(pos): row for pos, row in appended[name].items()},
+            })
+        else:
+            # Not loaded: the next incremental run applies all of its records as new
+            entry.update({'fingerprint': None, 'rows': 0, 'row_hashes': np.zeros(0, dtype=np.uint64),
+                          'key_hashes': np.zeros(0, dtype=np.uint64), 'hashes': None, 'winners': {}, 'appended': {}})
+        state['sources'][name] = entry
+    return state
+
+def _key_rows(keys, rows):
+    """{key: [row, ...]} for the non-empty keys of the given main rows."""
+    keys = pd.Series(np.asarray(rows, dtype=np.int64), index=keys.to_numpy())
+    keys = keys[keys.index != ""]
+    return {k: v.tolist() for k, v in keys.groupby(level=0, sort=False)}
+
+def merge_incremental(state, main_fingerprint):
+    """Apply only new or changed back-trace rows on top of the previous output.
+
+    Returns the updated state, or None when the change cannot be applied
+    incrementally (rows removed, match keys edited, output replaced...) and
+    a full merge is needed instead.
+    """
+    output = primary_output()
+    if state['output'].get('formats', ['xlsx']) != OUTPUT_FORMATS:
+        print("Output formats changed since last run.")
+        return None
+    if not os.path.exists(output) or file_fingerprint(output) != state['output']['fingerprint']:
+        print("Output file changed since last run.")
+        return None
+    paths = source_paths()
+    changed_sources = []
+    skipped = {}
+    for spec in SOURCES:
+        try:
+            fingerprint = file_fingerprint(paths[spec['name']])
+        except OSError as e:
+            skipped[spec['name']] = e
+            continue
+        if fingerprint != state['sources'][spec['name']]['fingerprint']:
+            changed_sources.append(spec)
+    report_skipped(skipped)
+    if not changed_sources:
+        print("No back-trace changes since last run; output is up to date.")
+        return state
+
+    print(f"Loading previous output from {output} and changed back-trace CSVs...")
+    df_out, sources, failed = read_inputs(output, {spec['name']: paths[spec['name']] for spec in changed_sources})
+    if df_out is None:
+        print(f"Error loading previous output: {failed.pop(None)}")
+        return None
+    # Sources that failed to load keep their state and are retried next run
+    report_skipped(failed)
+    skipped.update(failed)
+    changed_sources = [spec for spec in changed_sources if spec['name'] in sources]
+    if not changed_sources:
+        print("No back-trace source could be loaded; output left unchanged.")
+        return state
+    n_main = state['main']['rows']
+    existing_urls, existing_titles = existing_keys(df_out.iloc[:n_main])
+    if state['time_range']:
+        min_date, max_date = (pd.Timestamp(t) for t in state['time_range'])
+    else:
+        min_date, max_date = pd.Timestamp.min, pd.Timestamp.max
+
+    new_rows = []
+    updates_count = 0
+    for spec in changed_sources:
+        name = spec['name']
+        src_state = state['sources'][name]
+        df_src = sources[name]
+        hashes = row_hashes(df_src)
+        key_hashes = row_hashes(df_src, key_columns(spec))
+        delta = diff_rows(src_state['row_hashes'], hashes)
+        if delta is None:
+            print(f"  {spec['platform']}: rows were removed.")
+            return None
+        changed, added = delta
+        if (key_hashes[changed] != src_state['key_hashes'][changed]).any():
+            print(f"  {spec['platform']}: match keys of existing rows were edited.")
+            return None
+
+        winners = {int(r): p for r, p in src_state['winners'].items()}
+        appended = {int(p): r for p, r in src_state['appended'].items()}
+        metric_positions = np.full(len(df_out), -1, dtype=np.int64)
+        row_patches = {}
+        candidates = []
+        rows_delta = np.concatenate([changed, added])
+        urls = normalize_urls(df_src[spec['url']].iloc[rows_delta])
+        titles = normalize_titles(df_src[spec['title']].iloc[rows_delta]) if spec['title'] else None
+        dated = time_mask(spec, df_src, min_date, max_date, rows_delta)
+        for i, pos in enumerate(rows_delta):
+            pos = int(pos)
+            if pos in appended:
+                if not dated[pos]:
+                    print(f"  {spec['platform']}: an appended record moved out of range.")
+                    return None
+                row_patches[appended[pos]] = build_row(name, df_src.iloc[pos].to_dict())
                 continue
+            rows = []
+            url = urls.iloc[i]
+            if url:
+                rows += src_state['url_rows'].get(url, [])
+            if titles is not None and titles.iloc[i]:
+                rows += src_state['title_rows'].get(titles.iloc[i], [])
+            # New records only win rows nobody matched; changed ones keep the rows they won
+            won = [r for r in set(rows) if winners.get(r, pos) == pos]
+            for r in won:
+                winners[r] = pos
+                metric_positions[r] = pos
+            if not won:
+                candidates.append(pos)
 
-            if w_url not in existing_urls and w_title not in existing_titles:
-                new_row = {
-                    '发布平台': '微信',
-                    '标题': item.get('title'),
-                    '原文链接': item.get('url'),
-                    '发布时间': w_time,
-                    '阅读数': item.get('readnum', 0),
-                    '点赞数': item.get('likenum', 0),
-                    '转发数': item.get('share_num', 0),
-                    '评论数': 0, # Metric often missing in Wx export
-                    '作者': item.get('author')
-                }
-                new_rows.append(new_row)
+        apply_metrics(df_out, spec, df_src, metric_positions)
+        if row_patches:
+            patch_rows(df_out, pd.DataFrame.from_dict(row_patches, orient='index'))
+        rows = append_rows(spec, df_src, np.asarray(candidates, dtype=np.int64),
+                           existing_urls, existing_titles, dated)
+        for pos, row in rows:
+            appended[pos] = len(df_out) + len(new_rows)
+            new_rows.append(row)
 
-    print(f"Data merge complete. Updated {updates_count} rows.")
+        patched = int((metric_positions >= 0).sum()) + len(row_patches)
+        updates_count += patched
+        print(f"  {spec['platform']}: {len(changed)} changed and {len(added)} new records, "
+              f"patched {patched} rows, appended {len(rows)}")
+        src_state.update({
+            'fingerprint': file_fingerprint(paths[name]),
+            'rows': len(df_src),
+            'row_hashes': hashes,
+            'key_hashes': key_hashes,
+            'hashes': None,
+            'winners': {str(r): p for r, p in winners.items()},
+            'appended': {str(p): r for p, r in appended.items()},
+        })
+
+    print(f"Incremental merge complete. Patched {updates_count} rows.")
     print(f"Found {len(new_rows)} new rows to append.")
-    
-    if new_rows:
-        df_new = pd.DataFrame(new_rows)
-        # Identify columns in main but not in new (e.g. '情感属性')
-        # We should fill them with default
-        for col in df_main.columns:
-            if col not in df_new.columns:
-                df_new[col] = None 
-                # Optional: Simple heuristic for sentiment? For now leave matching empty or '中性'
-                if col == '情感属性':
-                    df_new[col] = '中性' # Default to Neutral for safe display
-
-        # Concatenate
-        df_final = pd.concat([df_main, df_new], ignore_index=True)
-    else:
-        df_final = df_main
-    
-    # Save
-    df_final.to_excel(OUTPUT_EXCEL, index=False)
-    print(f"Saved updated file to: {OUTPUT_EXCEL}")
+    if skipped:
+        print(f"Skipped sources: {', '.join(sorted(skipped))}")
+    df_final = with_new_rows(df_out, new_rows)
+    label_sentiment(df_final)
+    save_outputs(df_final.columns, lambda: frame_batches(df_final))
+    state['output'] = output_state(len(df_final))
+    return state
+
+class RowSpill:
+    """Appended rows parked in a temporary file until the output is written.
+
+    Rows come from CSV chunks read as text; columns in ``dtypes`` are turned
+    back into numbers as the rows are read out.
+    """
+
+    def __init__(self):
+        self._file = tempfile.TemporaryFile()
+        self.columns = []
+        self.rows = 0
+        self.dtypes = {}
+
+    def extend(self, rows):
+        if not rows:
+            return
+        for row in rows:
+            self.columns.extend(col for col in row if col not in self.columns)
+        pickle.dump(rows, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.rows += len(rows)
+
+    def __iter__(self):
+        self._file.seek(0)
+        while True:
+            try:
+                rows = pickle.load(self._file)
+            except EOFError:
+                return
+            for row in rows:
+                for col, dtype in self.dtypes.items():
+                    if dtype is not None and isinstance(row.get(col), str):
+                        row[col] = int(row[col]) if dtype == 'int64' else float(row[col])
+                yield row
+
+    def close(self):
+        self._file.close()
+
+def scan_numeric(values, flags):
+    """Fold one chunk of a text-read column into its ``flags`` (numeric, missing, integer)."""
+    present = values.notna()
+    numbers = pd.to_numeric(values, errors='coerce')
+    flags['numeric'] &= bool((numbers.notna() | ~present).all())
+    flags['missing'] |= bool((~present).any())
+    flags['integer'] &= bool(values[present].str.fullmatch(r'\s*[-+]?\d+\s*').all())
+
+def read_dtype(flags):
+    """The dtype a whole-file read_csv infers for a scanned column: int64, float64 or None (text).
+
+    A chunk without e.g. a '1.2万' cell would parse that column as numbers
+    while the whole-file read keeps every value as a string, so chunks are
+    read as text and the column's type is decided once the file is scanned.
+    """
+    if not flags['numeric']:
+        return None
+    return 'int64' if flags['integer'] and not flags['missing'] else 'float64'
+
+def stream_source(spec, path, df_main, route, existing_urls, existing_titles, min_date, max_date,
+                  spill, chunksize):
+    """Resolve one back-trace CSV against the main sheet one chunk at a time.
+
+    The join runs the other way round from ``update_main``: routed main rows
+    are indexed by URL/title and each chunk is looked up in that index. A
+    main row keeps the first record that matches it (chunks come in file
+    order), so winners, metrics and appended rows equal the in-memory merge
+    while only one chunk of the CSV is held at a time. Unmatched records that
+    pass the append checks go to ``spill``. Returns ``(patch, stats, failures)``.
+    """
+    routed = np.flatnonzero(route)
+    lookups = [(spec['url'], normalize_urls, df_main['原文链接'])]
+    if spec['title']:
+        lookups.append((spec['title'], normalize_titles, df_main['标题']))
+    tables = []
+    for _, normalize, keys in lookups:
+        table = pd.DataFrame({'key': normalize(keys.iloc[routed]).to_numpy(), 'row': routed})
+        tables.append(table[table['key'] != ""])
+
+    winners = np.full(len(df_main), -1, dtype=np.int64)
+    matches = np.zeros(len(df_main), dtype=np.int64)
+    pieces = {col: [] for col in spec['metrics']}
+    flags = {col: {'numeric': True, 'missing': False, 'integer': True} for col in spec['metrics']}
+    failures = {}
+    offset = 0
+    # One pass over the file: every column is read as text and the metrics get
+    # the type a whole-file read would give them once all chunks are seen
+    for chunk in pd.read_csv(path, chunksize=chunksize, dtype=str):
+        for col, src_col in spec['metrics'].items():
+            if src_col in chunk.columns:
+                scan_numeric(chunk[src_col], flags[col])
+        positions = np.arange(offset, offset + len(chunk))
+        pairs = pd.concat([table.merge(pd.DataFrame({'key': normalize(chunk[col]).to_numpy(), 'pos': positions}),
+                                       on='key')[['row', 'pos']]
+                           for table, (col, normalize, _) in zip(tables, lookups)]).drop_duplicates()
+        matches += np.bincount(pairs['row'].to_numpy(), minlength=len(df_main))
+        first = pairs.groupby('row')['pos'].min()
+        first = first[winners[first.index.to_numpy()] < 0]
+        rows, won = first.index.to_numpy(), first.to_numpy()
+        winners[rows] = won
+        for col, src_col in spec['metrics'].items():
+            if src_col in chunk.columns:
+                pieces[col].append(pd.Series(chunk[src_col].to_numpy()[won - offset], index=rows))
+
+        candidates = np.setdiff1d(np.arange(len(chunk)), won - offset)
+        dated = time_mask(spec, chunk, min_date, max_date, candidates, failures)
+        spill.extend([row for _, row in append_rows(spec, chunk, candidates,
+                                                    existing_urls, existing_titles, dated)])
+        offset += len(chunk)
+
+    hit = winners >= 0
+    patch = pd.DataFrame(index=df_main.index[hit])
+    spill.dtypes = {col: read_dtype(flags[col]) for col in spec['metrics']}
+    for col, dtype in spill.dtypes.items():
+        if not pieces[col]:
+            patch[col] = 0
+            continue
+        values = pd.concat(pieces[col]).sort_index()
+        patch[col] = (values if dtype is None else pd.to_numeric(values).astype(dtype)).to_numpy()
+    considered = int(route.sum())
+    stats = {'matched': int(hit.sum()), 'missed': considered - int(hit.sum()),
+             'ambiguous': int((matches > 1).sum())}
+    return patch, stats, failures.get(spec['name'], 0)
+
+def merge_stream(chunksize=None):
+    """Full merge that streams the back-trace CSVs in chunks with bounded memory.
+
+    Only the main sheet, its key index and one CSV chunk are held in memory;
+    appended rows are spilled to a temporary file and the output workbook is
+    written row by row. The output is the same as ``merge_full``'s.
+    """
+    chunksize = chunksize or STREAM_CHUNKSIZE
+    print(f"Loading main data from {MAIN_EXCEL}...")
+    try:
+        df_main = pd.read_excel(MAIN_EXCEL)
+    except FileNotFoundError:
+        print("Main Excel file not found.")
+        return
+
+    existing_urls, existing_titles = existing_keys(df_main)
+    min_date, max_date = time_range(df_main)
+    routes = route_main(df_main)
+
+    print(f"Streaming back-trace CSVs in chunks of {chunksize:,} rows...")
+    paths = source_paths()
+    spills = []
+    skipped = {}
+    updates_count = 0
+    for spec in SOURCES:
+        spill = RowSpill()
+        try:
+            patch, stats, failures = stream_source(spec, paths[spec['name']], df_main, routes[spec['name']],
+                                                   existing_urls, existing_titles, min_date, max_date,
+                                                   spill, chunksize)
+        except Exception as e:
+            # A source that fails part-way contributes nothing, as if it had not loaded
+            skipped[spec['name']] = e
+            spill.close()
+            continue
+        patch_rows(df_main, patch)
+        spills.append(spill)
+        updates_count += stats['matched']
+        print(f"  {spec['platform']}: matched {stats['matched']}, missed {stats['missed']}, "
+              f"ambiguous {stats['ambiguous']}, {spill.rows} to append")
+        report_unparsed(spec, failures)
+    report_skipped(skipped)
+
+    new_count = sum(spill.rows for spill in spills)
+    print(f"Data merge complete. Updated {updates_count} rows.")
+    print(f"Found {new_count} new rows to append.")
+    if skipped:
+        print(f"Skipped sources: {', '.join(sorted(skipped))}")
+
+    # Same columns and fill values as with_new_rows
+    new_columns = [col for spill in spills for col in spill.columns]
+    new_columns = list(dict.fromkeys(new_columns))
+    columns = list(df_main.columns) + [col for col in new_columns if col not in df_main.columns]
+    fill = {col: ('中性' if col == '情感属性' and not SENTIMENT else None) for col in columns}
+    label_sentiment(df_main)
+
+    def spilled(rows):
+        # Appended rows are classified a batch at a time (cached after the first pass)
+        frame = pd.DataFrame(rows, columns=columns)
+        label_sentiment(frame, verbose=False)
+        return frame
+
+    def batches():
+        yield from frame_batches(df_main.reindex(columns=columns), chunksize)
+        rows = []
+        for spill in spills:
+            for row in spill:
+                rows.append([row[col] if col in row else fill[col] if col not in new_columns else None
+                             for col in columns])
+                if len(rows) == chunksize:
+                    yield spilled(rows)
+                    rows = []
+        if rows:
+            yield spilled(rows)
+
+    save_outputs(columns, batches)
+    if SENTIMENT and '情感属性' in df_main.columns and new_count:
+        print(f"Sentiment: labelled {new_count} appended rows")
+    for spill in spills:
+        spill.close()
+
+def merge_data(incremental=False, state_path=None, stream=False, chunksize=None, fuzzy=None):
+    """Merge the back-trace CSVs into the main report.
+
+    With ``incremental=True`` a state file (fingerprints, row watermarks and
+    key-to-row mappings per source) is kept next to the output, and reruns
+    only apply new or changed CSV rows. The Parquet output is the store they
+    read back, so OUTPUT_FORMATS must include 'parquet'; other formats are
+    exports. Rows appended by an incremental run go to the end of the output,
+    so row order can differ from a full rebuild.
+
+    With ``stream=True`` the CSVs are processed ``chunksize`` rows at a time
+    (``merge_stream``); streaming runs always rebuild in full and keep no state.
+
+    ``fuzzy`` (a similarity threshold) adds near-duplicate title matching;
+    it is only available for full in-memory merges.
+    """
+    if fuzzy is not None and (incremental or stream):
+        raise ValueError("fuzzy title matching needs a full in-memory merge")
+    if incremental and 'parquet' not in OUTPUT_FORMATS:
+        raise ValueError("incremental merges keep their output in Parquet; add 'parquet' to the formats")
+    if stream:
+        merge_stream(chunksize)
+        return
+    if not incremental:
+        merge_full(fuzzy=fuzzy)
+        return
+
+    state_path = state_path or STATE_FILE
+    state = load_state(state_path)
+    main_fingerprint = file_fingerprint(MAIN_EXCEL) if os.path.exists(MAIN_EXCEL) else None
+    if state is not None and main_fingerprint == state['main']['fingerprint']:
+        new_state = merge_incremental(state, main_fingerprint)
+        if new_state is not None:
+            save_state(state_path, new_state)
+            return
+        print("Falling back to a full merge.")
+    new_state = merge_full(main_fingerprint)
+    if new_state is not None:
+        save_state(state_path, new_state)
 
 if __name__ == "__main__":
-    merge_data()
+    parser = argparse.ArgumentParser(description="Merge back-trace CSVs into the monitoring report.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only apply CSV rows that are new or changed since the last run")
+    parser.add_argument("--state", default=None, help=f"incremental state file (default: {STATE_FILE})")
+    parser.add_argument("--stream", action="store_true",
+                        help="read the back-trace CSVs in chunks with bounded memory (full rebuild only)")
+    parser.add_argument("--chunksize", type=int, default=STREAM_CHUNKSIZE,
+                        help=f"CSV rows per chunk in streaming mode (default: {STREAM_CHUNKSIZE:,})")
+    parser.add_argument("--format", default=None,
+                        help="comma-separated output formats written in one pass: xlsx, parquet, csv "
+                             "(e.g. parquet,xlsx for the dashboard plus a workbook; default: "
+                             f"{','.join(OUTPUT_FORMATS)}, or parquet with --incremental, which always "
+                             "writes parquet)")
+    parser.add_argument("--fuzzy", nargs="?", type=float, const=FUZZY_THRESHOLD, default=None,
+                        metavar="THRESHOLD",
+                        help="also match near-duplicate titles (similarity 0-1, default "
+                             f"{FUZZY_THRESHOLD}); matches are listed in --fuzzy-report")
+    parser.add_argument("--fuzzy-report", default=FUZZY_REPORT,
+                        help="CSV audit of the fuzzy matches (default: %(default)s)")
+    parser.add_argument("--no-sentiment", action="store_true",
+                        help="stamp appended rows '中性' instead of classifying their sentiment")
+    parser.add_argument("--sentiment-cache", default=SENTIMENT_CACHE,
+                        help="label cache of the sentiment classifier (SQLite file, default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processes classifying sentiment (default: one per CPU)")
+    parser.add_argument("--snapshot", action="store_true",
+                        help="precompute the dashboard snapshot of the merged report (see scripts/build_snapshot.py)")
+    parser.add_argument("--store", default=None,
+                        help="also append the merged report to this local article store (SQLite file)")
+    args = parser.parse_args()
+    if args.stream and args.incremental:
+        parser.error("--stream and --incremental cannot be combined")
+    if args.fuzzy is not None and (args.stream or args.incremental):
+        parser.error("--fuzzy cannot be combined with --stream or --incremental")
+    if args.fuzzy is not None and not 0 < args.fuzzy <= 1:
+        parser.error("--fuzzy threshold must be in (0, 1]")
+    FUZZY_REPORT = args.fuzzy_report
+    SENTIMENT = not args.no_sentiment
+    SENTIMENT_CACHE = args.sentiment_cache
+    SENTIMENT_WORKERS = args.workers
+    if args.format is not None:
+        OUTPUT_FORMATS = [fmt.strip() for fmt in args.format.split(",") if fmt.strip()]
+        if not OUTPUT_FORMATS:
+            parser.error("--format needs at least one format")
+    elif args.incremental:
+        OUTPUT_FORMATS = ['parquet']
+    # Incremental runs patch the Parquet output; a workbook is only exported when asked for
+    if args.incremental and 'parquet' not in OUTPUT_FORMATS:
+        OUTPUT_FORMATS = ['parquet'] + OUTPUT_FORMATS
+    try:
+        output_files()
+    except ValueError as e:
+        parser.error(str(e))
+    merge_data(incremental=args.incremental, state_path=args.state, stream=args.stream, chunksize=args.chunksize,
+               fuzzy=args.fuzzy)
+    if args.store and os.path.exists(primary_output()):
+        store = ArticleStore(args.store)
+        rows = store.ingest_report(primary_output())
+        print(f"Article store {args.store}: " + ("already up to date" if rows is None else f"ingested {rows} rows"))
+        for _, flag in store.update_anomalies().iterrows():
+            print(f"  Anomaly: {describe_flag(flag)}")
+    if args.snapshot and os.path.exists(primary_output()):
+        # The file the dashboard serves: the Parquet copy when one was written
+        print(f"Saved dashboard snapshot to: {snapshot_report(resolve_report(primary_output()))}")
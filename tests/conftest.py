@@ -0,0 +1,40 @@
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "scripts"))
+
+import merge_backtrace
+from monitor.synthetic import backtrace_frames, main_sheet
+
+
+@pytest.fixture
+def merge_inputs(tmp_path, monkeypatch):
+    """Point merge_backtrace at a synthetic main sheet and back-trace CSVs in ``tmp_path``.
+
+    Returns ``write(main=None, sources=None, output='merged.xlsx')``, which
+    writes the inputs (``main`` and ``sources`` replace the synthetic sheet
+    and CSV frames), sets the output path and returns the main sheet.
+    """
+    def write(main=None, sources=None, output="merged.xlsx", rows=300):
+        main = main_sheet(rows, seed=1) if main is None else main
+        main.to_excel(tmp_path / "main.xlsx", index=False)
+        monkeypatch.setattr(merge_backtrace, "MAIN_EXCEL", str(tmp_path / "main.xlsx"))
+        sources = backtrace_frames(main, seed=2) if sources is None else sources
+        for name, frame in sources.items():
+            frame.to_csv(tmp_path / f"xinhua_{name}.csv", index=False)
+        monkeypatch.setattr(merge_backtrace, "BILI_CSV", str(tmp_path / "xinhua_bili.csv"))
+        monkeypatch.setattr(merge_backtrace, "RED_CSV", str(tmp_path / "xinhua_red.csv"))
+        monkeypatch.setattr(merge_backtrace, "WX_CSV", str(tmp_path / "xinhua_wx.csv"))
+        monkeypatch.setattr(merge_backtrace, "OUTPUT_EXCEL", str(tmp_path / output))
+        return main
+
+    monkeypatch.setattr(merge_backtrace, "OUTPUT_FORMATS", ["xlsx"])
+    monkeypatch.setattr(merge_backtrace, "STATE_FILE", str(tmp_path / ".merge_state.json"))
+    monkeypatch.setattr(merge_backtrace, "FUZZY_REPORT", str(tmp_path / "fuzzy_matches.csv"))
+    monkeypatch.setattr(merge_backtrace, "SENTIMENT_CACHE", str(tmp_path / ".sentiment_cache.sqlite"))
+    monkeypatch.setattr(merge_backtrace, "SENTIMENT_WORKERS", 1)
+    return write
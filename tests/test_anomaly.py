@@ -0,0 +1,61 @@
+import json
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from monitor.anomaly import WARMUP_DAYS, AnomalyDetector
+
+START = date(2025, 12, 1)
+
+
+def daily_frame(days=30, seed=0, **overrides):
+    """Two platforms' daily metrics with mild noise; ``overrides`` maps 'platform/day/metric' to a value."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for platform, base in (('今日头条', 200), ('微博', 40)):
+        for offset in range(days):
+            noise = rng.uniform(0.9, 1.1, size=3)
+            rows.append({'发布平台': platform, '日期': START + timedelta(days=offset),
+                         '篇数': round(base * noise[0]), '阅读数': round(base * 500 * noise[1]),
+                         '互动量': round(base * 20 * noise[2])})
+    daily = pd.DataFrame(rows)
+    for key, value in overrides.items():
+        platform, offset, metric = key.split('/')
+        day = START + timedelta(days=int(offset))
+        daily.loc[(daily['发布平台'] == platform) & (daily['日期'] == day), metric] = value
+    return daily
+
+
+def kinds(flags):
+    return {(f['platform'], date.fromisoformat(f['day']) - START, f['metric'], f['kind']) for f in flags}
+
+
+def test_flags_spike_zero_and_gap_days():
+    daily = daily_frame(**{'今日头条/20/篇数': 2000, '微博/24/阅读数': 0, '今日头条/3/篇数': 5000})
+    # A day without a single 微博 article counts as zero articles
+    daily = daily[~((daily['发布平台'] == '微博') & (daily['日期'] == START + timedelta(days=15)))]
+    detector = AnomalyDetector()
+    flags = detector.update(daily)
+    found = kinds(flags)
+    assert ('今日头条', timedelta(days=20), '篇数', 'spike') in found
+    assert ('微博', timedelta(days=24), '阅读数', 'zero') in found
+    assert ('微博', timedelta(days=15), '篇数', 'zero') in found
+    # The warm-up spike is not judged; the newest day stays open
+    assert not [f for f in found if f[1] < timedelta(days=WARMUP_DAYS)]
+    assert detector.platforms['今日头条']['closed'] == (START + timedelta(days=28)).isoformat()
+
+
+def test_day_by_day_updates_match_batch():
+    daily = daily_frame(days=40, seed=1, **{'微博/30/互动量': 50_000, '今日头条/33/阅读数': 10})
+    batch = AnomalyDetector()
+    batch.update(daily)
+    state = None
+    for offset in range(1, 41):
+        detector = AnomalyDetector(json.loads(json.dumps(state)) if state else None)
+        resume = detector.resume_day()
+        seen = daily[daily['日期'] <= START + timedelta(days=offset - 1)]
+        detector.update(seen if resume is None else seen[seen['日期'] >= resume])
+        state = detector.state()
+    assert state['flags'] == batch.flags
+    assert len(batch.flags) >= 2
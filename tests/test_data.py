@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from monitor.data import load_report
+from monitor.synthetic import main_sheet
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_cache_hit_equals_fresh_parse(tmp_path, compact):
+    df = main_sheet(300, seed=10)
+    df['发布时间'] = df['发布时间'].astype(object)
+    df.loc[::17, '发布时间'] = np.nan
+    path = str(tmp_path / "report.xlsx")
+    df.to_excel(path, index=False)
+    cache_dir = str(tmp_path / "cache")
+    fresh = load_report(path, cache_dir=cache_dir, compact=compact)
+    cached = load_report(path, cache_dir=cache_dir, compact=compact)
+    assert fresh['日期'].isna().any()
+    columns = [col for col in fresh.columns if col in cached.columns]
+    pd.testing.assert_frame_equal(cached[columns], fresh[columns])
@@ -0,0 +1,33 @@
+import pandas as pd
+
+from monitor.data import prepare_report
+from monitor.dataset import TREND_CACHE_SIZE, Dataset
+from monitor.synthetic import main_sheet
+
+
+def synthetic_dataset(rows=500):
+    return Dataset(prepare_report(main_sheet(rows, seed=3)))
+
+
+def test_view_key_ignores_selection_order():
+    ds = synthetic_dataset()
+    kpis = ds.kpis(['今日头条', 'B站', '微博'])
+    assert ds.kpis(['微博', 'B站', '今日头条']) is kpis
+    assert len([key for key in ds.views if key[0] == 'kpis']) == 1
+    pd.testing.assert_frame_equal(ds.volume(['微信', 'B站']), ds.volume(['B站', '微信']))
+
+
+def test_trend_windows_are_bounded():
+    ds = synthetic_dataset()
+    platforms = ds.platforms
+    first, last = ds.date_bounds(platforms)
+    full = ds.trend(platforms, first, last, 'W')
+    assert ds.trend(list(reversed(platforms)), first, last, 'W') is full
+    days = pd.date_range(first, last).date
+    for end in days[1:-1]:
+        ds.trend(platforms, first, end, 'D')
+        ds.trend(platforms, days[1], end, 'D')
+    assert len(ds._trends) == TREND_CACHE_SIZE
+    assert not [key for key in ds.views if key[0].startswith('trend.') and key[0] != 'trend.W']
+    window = ds.trend(platforms, days[3], days[10], 'D')
+    assert window['日期'].between(days[3], days[10]).all()
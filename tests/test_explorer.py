@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from monitor import data
+from monitor.data import prepare_report
+from monitor.dataset import load_dataset
+from monitor.explorer import TitleIndex, article_page
+from monitor.synthetic import main_sheet
+
+
+@pytest.fixture(scope='module')
+def report():
+    df = main_sheet(800, seed=6)
+    titles = df['标题'].astype(object)
+    titles[::11] = 'ＡＢＣ全角' + titles[::11]
+    titles[::13] = 'Mixed Case ' + titles[::13]
+    titles[::29] = np.nan
+    df['标题'] = titles
+    df['发布时间'] = df['发布时间'].astype(object)
+    df.loc[::23, '发布时间'] = np.nan
+    return prepare_report(df)
+
+
+def brute_force(df, platforms, start, end, keyword, sort, descending, page, size):
+    """Filter with plain ``str.contains`` and sort the filtered frame."""
+    mask = df['发布平台'].isin(platforms)
+    if start is not None:
+        times = df['发布时间']
+        mask &= (times >= pd.Timestamp(start)) & (times < pd.Timestamp(end) + pd.Timedelta(days=1))
+    titles = df['标题'].fillna('').astype(str).str.normalize('NFKC').str.lower()
+    for term in pd.Series([keyword]).str.normalize('NFKC').str.lower()[0].split():
+        mask &= titles.str.contains(term, regex=False)
+    matches = df.reset_index(drop=True)[mask.to_numpy()]
+    ordered = matches.sort_values(sort, ascending=not descending, kind='stable', na_position='last')
+    return ordered.index.to_numpy()[page * size:(page + 1) * size], len(matches)
+
+
+@pytest.mark.parametrize('keyword', ['', '体育', '体育 城市', '科', 'abc', 'ＭＩＸＥＤ case', '：1', '不存在的词'])
+@pytest.mark.parametrize('window', [False, True])
+@pytest.mark.parametrize('sort,descending', [('发布时间', True), ('阅读数', False), ('raw_csi', True)])
+def test_article_page_matches_brute_force(report, keyword, window, sort, descending):
+    index = TitleIndex(report['标题'])
+    platforms = sorted(report['发布平台'].dropna().unique())[:4]
+    start, end = None, None
+    if window:
+        days = report['日期'].dropna().sort_values()
+        start, end = days.iloc[len(days) // 4], days.iloc[3 * len(days) // 4]
+    for page in range(3):
+        positions, total = article_page(report, index, platforms, start, end, keyword, sort, descending,
+                                        page, 25)
+        expected, expected_total = brute_force(report, platforms, start, end, keyword, sort, descending,
+                                               page, 25)
+        assert total == expected_total
+        np.testing.assert_array_equal(positions, expected)
+
+
+def test_explore_reads_page_rows_only(tmp_path, monkeypatch):
+    monkeypatch.setattr(data, 'CACHE_ROW_GROUP', 64)
+    df = main_sheet(700, seed=7)
+    path = str(tmp_path / "report.xlsx")
+    df.to_excel(path, index=False)
+    cache_dir = str(tmp_path / "cache")
+    full = load_dataset(path, cache_dir=cache_dir)
+    compact = load_dataset(path, cache_dir=cache_dir, compact=True)
+    assert '摘要' not in compact.df.columns
+    columns = ['标题', '摘要', '发布平台', '主题词', '阅读数']
+    for page in range(4):
+        rows, total = compact.explore(compact.platforms, keyword='体育', sort='阅读数', page=page, size=50,
+                                      columns=columns)
+        expected, expected_total = full.explore(full.platforms, keyword='体育', sort='阅读数', page=page,
+                                                size=50, columns=columns)
+        assert total == expected_total and list(rows.columns) == columns
+        pd.testing.assert_frame_equal(rows[['摘要', '主题词']], expected[['摘要', '主题词']])
+    empty, total = compact.explore(compact.platforms, keyword='不存在的词', columns=columns)
+    assert total == 0 and empty.empty and list(empty.columns) == columns
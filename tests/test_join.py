@@ -0,0 +1,32 @@
+import numpy as np
+
+from monitor.join import KeyIndex, join_source
+
+
+def nested_loop(src_urls, src_titles, url, title):
+    # The original update loop: first record whose URL or title equals the row's
+    for pos, (u, t) in enumerate(zip(src_urls, src_titles)):
+        u = u.strip() if isinstance(u, str) else ""
+        if (url and u == url) or (title and str(t).strip() == title):
+            return pos
+    return -1
+
+
+def test_resolve_matches_nested_loop():
+    src_urls = [' https://a/1', 'https://a/2', None, 'https://a/2', 'https://a/5']
+    src_titles = ['甲', '乙', '丙', '丁', '乙 ']
+    urls = ['https://a/1', 'https://a/2', '', 'https://a/9', None, 'https://a/5']
+    titles = ['x', 'y', '丙', '乙', '丁', '甲']
+    positions, ambiguous = KeyIndex(src_urls, src_titles).resolve(urls, titles)
+    expected = [nested_loop(src_urls, src_titles, (u or "").strip(), t) for u, t in zip(urls, titles)]
+    assert positions.tolist() == expected
+    # https://a/2 and 乙 each have two records; 甲 and https://a/5 point at different records
+    assert ambiguous.tolist() == [False, True, False, True, False, True]
+
+
+def test_join_source_mask_and_stats():
+    index = KeyIndex(['https://a/1', 'https://a/2'], ['甲', '乙'])
+    positions, stats = join_source(index, ['https://a/2', 'https://a/1', 'https://a/3'], ['', '', ''],
+                                   mask=np.array([True, False, True]))
+    assert positions.tolist() == [1, -1, -1]
+    assert stats == {'matched': 1, 'missed': 1, 'ambiguous': 0}
@@ -0,0 +1,53 @@
+import pandas as pd
+
+from monitor.data import prepare_report
+from monitor.dataset import Dataset
+from monitor.leaderboard import TOP_K
+from monitor.synthetic import main_sheet
+
+CSI_COLUMNS = ['标题', '发布平台', '传播指数', '点赞数', '评论数', '转发数', '发布时间']
+COMMENT_COLUMNS = ['标题', '发布平台', '评论数', '点赞数', '发布时间']
+
+
+def tied_report(rows=400):
+    """Synthetic report where 30 rows tie for the top CSI and comment scores (more than K)."""
+    df = main_sheet(rows, seed=6)
+    tied = df.index[df['发布平台'] == '今日头条'][::7][:30]
+    df.loc[tied, ['点赞数', '评论数', '转发数']] = [10**7, 10**6, 10**5]
+    return prepare_report(df)
+
+
+def audit_table(df, platforms, scope):
+    """The dashboard's original Tier 4 tables: copy the scope, score, normalize, nlargest(20)."""
+    f_df = df[df['发布平台'].isin(platforms)]
+    audit_df = f_df.copy()
+    if scope != "全平台":
+        audit_df = audit_df[audit_df['发布平台'] == scope]
+    audit_df['raw_csi'] = audit_df['点赞数'] + audit_df['评论数']*2 + audit_df['转发数']*3
+    max_csi = audit_df['raw_csi'].max()
+    if max_csi > 0:
+        audit_df['传播指数'] = (audit_df['raw_csi'] / max_csi) * 100
+    else:
+        audit_df['传播指数'] = 0
+    return audit_df.nlargest(20, '传播指数')[CSI_COLUMNS], audit_df.nlargest(20, '评论数')[COMMENT_COLUMNS]
+
+
+def test_leaderboards_match_full_scan():
+    df = tied_report()
+    ds = Dataset(df)
+    counts = df['发布平台'].value_counts()
+    assert counts.min() < TOP_K
+    for platforms in (ds.platforms, ['今日头条', '小红书', 'B站'], [counts.idxmin()]):
+        for scope in ["全平台"] + platforms:
+            selected = platforms if scope == "全平台" else [scope]
+            csi, comments = audit_table(df, platforms, scope)
+            pd.testing.assert_frame_equal(ds.leaderboard('raw_csi', selected)[CSI_COLUMNS], csi)
+            pd.testing.assert_frame_equal(ds.leaderboard('评论数', selected)[COMMENT_COLUMNS], comments)
+
+
+def test_leaderboard_all_zero_scores():
+    df = prepare_report(main_sheet(50, seed=7).assign(点赞数=0, 评论数=0, 转发数=0))
+    csi, _ = audit_table(df, ['今日头条'], '今日头条')
+    top = Dataset(df).leaderboard('raw_csi', ['今日头条'])
+    assert (top['传播指数'] == 0).all()
+    pd.testing.assert_frame_equal(top[CSI_COLUMNS], csi, check_dtype=False)
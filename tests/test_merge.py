@@ -0,0 +1,170 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import merge_backtrace
+from monitor.data import read_table
+from monitor.incremental import hashes_path, load_state, row_hashes
+from monitor.join import normalize_titles, normalize_urls
+from monitor.synthetic import backtrace_frames, main_sheet
+
+
+def test_fuzzy_report_lists_only_near_duplicates(merge_inputs):
+    main = main_sheet(300, seed=1)
+    sources = backtrace_frames(main, seed=2)
+    bili = sources['bili']
+    # Exact duplicates (already suppressed by the exact join) plus genuine near-duplicates
+    # of main titles that are not in the sheet: a site-name suffix added to new URLs
+    near = main[main['发布平台'] == '今日头条'].head(5)
+    copies = bili.head(5).assign(url=[f"https://www.bilibili.com/video/BVnear{i}" for i in range(5)],
+                                 title=(near['标题'] + '｜新华网').to_numpy())
+    sources['bili'] = pd.concat([bili, bili.head(20), copies], ignore_index=True)
+    merge_inputs(main, sources)
+    merge_backtrace.merge_data(fuzzy=0.8)
+
+    audit = pd.read_csv(merge_backtrace.FUZZY_REPORT)
+    main_urls = set(normalize_urls(main['原文链接']))
+    main_titles = set(normalize_titles(main['标题']))
+    assert not audit['record_url'].isin(main_urls).any()
+    assert not audit['record_title'].isin(main_titles).any()
+    assert set(copies['title']) <= set(audit['record_title'])
+    merged = pd.read_excel(merge_backtrace.OUTPUT_EXCEL)
+    assert not merged['原文链接'].isin(copies['url']).any()
+
+
+def read_output():
+    return pd.read_excel(merge_backtrace.OUTPUT_EXCEL)
+
+
+def test_stream_matches_full(merge_inputs):
+    main = merge_inputs(output="full.xlsx")
+    merge_backtrace.merge_data()
+    full = read_output()
+    merge_inputs(main, output="stream.xlsx")
+    merge_backtrace.merge_data(stream=True, chunksize=13)
+    assert len(full) > len(main)
+    pd.testing.assert_frame_equal(read_output(), full)
+
+
+def test_stream_reads_each_csv_once_with_whole_file_types(merge_inputs, monkeypatch):
+    main = main_sheet(300, seed=1)
+    sources = backtrace_frames(main, seed=2)
+    # Text, missing and fractional metric values that only show up in later chunks
+    bili = sources['bili'].astype({'read_count': object, 'like_count': float})
+    bili.loc[len(bili) - 10::3, 'read_count'] = '1.2万'
+    bili.loc[len(bili) - 10::2, 'like_count'] = np.nan
+    sources['red'] = sources['red'].astype({'num_like': float})
+    sources['red'].loc[len(sources['red']) - 10:, 'num_like'] = 2.5
+    sources['bili'] = bili
+    merge_inputs(main, sources, output="full.xlsx")
+    merge_backtrace.merge_data()
+    full = read_output()
+
+    reads = []
+    read_csv = pd.read_csv
+    def counted(path, *args, **kwargs):
+        reads.append(os.path.basename(path))
+        return read_csv(path, *args, **kwargs)
+    monkeypatch.setattr(merge_backtrace.pd, "read_csv", counted)
+    merge_inputs(main, sources, output="stream.xlsx")
+    merge_backtrace.merge_data(stream=True, chunksize=7)
+    assert sorted(reads) == ['xinhua_bili.csv', 'xinhua_red.csv', 'xinhua_wx.csv']
+    pd.testing.assert_frame_equal(read_output(), full)
+
+
+def test_incremental_matches_full(merge_inputs, tmp_path, monkeypatch):
+    # Incremental runs keep their output in Parquet and export no workbook unless asked to
+    monkeypatch.setattr(merge_backtrace, "OUTPUT_FORMATS", ["parquet"])
+    main = main_sheet(300, seed=1)
+    sources = backtrace_frames(main, seed=2)
+    merge_inputs(main, {name: frame.iloc[:len(frame) * 2 // 3] for name, frame in sources.items()},
+                 output="incremental.xlsx")
+    merge_backtrace.merge_data(incremental=True)
+    # Later crawls: metrics of earlier records change and new records are added
+    for (name, frame), metric in zip(sources.items(), ['read_count', 'num_read', 'readnum']):
+        frame.loc[:9, metric] += 1000
+        frame.to_csv(tmp_path / f"xinhua_{name}.csv", index=False)
+    state = load_state(merge_backtrace.STATE_FILE)
+    assert state is not None
+    merge_backtrace.merge_data(incremental=True)
+    incremental = pd.read_parquet(merge_backtrace.primary_output())
+    assert not os.path.exists(tmp_path / "incremental.xlsx")
+
+    # Per-row hashes live in Parquet files next to the state, not in its JSON
+    with open(merge_backtrace.STATE_FILE, encoding="utf-8") as fh:
+        saved = json.load(fh)
+    for name, frame in sources.items():
+        assert 'row_hashes' not in saved['sources'][name]
+        hashes = pd.read_parquet(hashes_path(merge_backtrace.STATE_FILE, name))
+        np.testing.assert_array_equal(hashes['row'].to_numpy(), row_hashes(frame))
+        assert saved['sources'][name]['hashes'] != state['sources'][name]['hashes']
+
+    merge_inputs(main, sources, output="full.xlsx")
+    merge_backtrace.merge_data()
+    full = pd.read_parquet(merge_backtrace.primary_output())
+    # Rows appended by an incremental run go to the end, so only the row order may differ
+    def ordered(df):
+        return df.sort_values(list(df.columns), ignore_index=True)
+    assert len(full) > len(main)
+    pd.testing.assert_frame_equal(ordered(incremental), ordered(full))
+
+
+def test_incremental_needs_parquet(merge_inputs):
+    merge_inputs()
+    with pytest.raises(ValueError):
+        merge_backtrace.merge_data(incremental=True)
+
+
+def test_tampered_hashes_force_full_merge(merge_inputs, monkeypatch):
+    monkeypatch.setattr(merge_backtrace, "OUTPUT_FORMATS", ["parquet"])
+    merge_inputs()
+    merge_backtrace.merge_data(incremental=True)
+    assert load_state(merge_backtrace.STATE_FILE) is not None
+    pd.DataFrame({'row': np.zeros(3, dtype=np.uint64), 'key': np.zeros(3, dtype=np.uint64)}).to_parquet(
+        hashes_path(merge_backtrace.STATE_FILE, 'bili'), index=False)
+    assert load_state(merge_backtrace.STATE_FILE) is None
+
+
+def test_concurrent_read_equals_sequential_read(merge_inputs):
+    merge_inputs()
+    paths = merge_backtrace.source_paths()
+    df, sources, skipped = merge_backtrace.read_inputs(merge_backtrace.MAIN_EXCEL, paths)
+    assert not skipped
+    pd.testing.assert_frame_equal(df, read_table(merge_backtrace.MAIN_EXCEL))
+    assert set(sources) == set(paths)
+    for name, path in paths.items():
+        pd.testing.assert_frame_equal(sources[name], pd.read_csv(path))
+
+
+def test_concurrent_read_skips_failed_sources(merge_inputs, tmp_path, capsys):
+    merge_inputs()
+    (tmp_path / "xinhua_red.csv").unlink()
+    (tmp_path / "xinhua_wx.csv").write_bytes(b'"url,title\n\xff\xfe\x00broken')
+    paths = merge_backtrace.source_paths()
+    df, sources, skipped = merge_backtrace.read_inputs(merge_backtrace.MAIN_EXCEL, paths)
+
+    assert set(sources) == {'bili'} and set(skipped) == {'red', 'wx'}
+    assert isinstance(skipped['red'], FileNotFoundError)
+    pd.testing.assert_frame_equal(df, read_table(merge_backtrace.MAIN_EXCEL))
+    pd.testing.assert_frame_equal(sources['bili'], pd.read_csv(paths['bili']))
+    merge_backtrace.report_skipped(skipped)
+    out = capsys.readouterr().out
+    assert "Skipped 小红书 (red)" in out and "Skipped 微信 (wx)" in out
+
+    # The merge goes on with the sources that loaded
+    merge_backtrace.merge_data()
+    out = capsys.readouterr().out
+    assert "Skipped sources: red, wx" in out
+    assert os.path.exists(merge_backtrace.OUTPUT_EXCEL)
+
+
+def test_concurrent_read_reports_unreadable_workbook(merge_inputs, tmp_path):
+    merge_inputs()
+    (tmp_path / "main.xlsx").write_bytes(b"not a workbook")
+    df, sources, skipped = merge_backtrace.read_inputs(merge_backtrace.MAIN_EXCEL,
+                                                       merge_backtrace.source_paths())
+    assert df is None and None in skipped
+    assert set(sources) == {'bili', 'red', 'wx'}
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from monitor.data import compact_frame, prepare_report
+from monitor.dataset import Dataset
+from monitor.synthetic import main_sheet
+
+
+def undated_report(rows=500):
+    """Synthetic report where some rows have no (or an unparseable) 发布时间."""
+    df = main_sheet(rows, seed=8)
+    df['发布时间'] = df['发布时间'].astype(object)
+    df.loc[df.index[::13], '发布时间'] = np.nan
+    df.loc[df.index[5::29], '发布时间'] = '未知'
+    return prepare_report(df)
+
+
+@pytest.mark.parametrize('compact', [False, True])
+@pytest.mark.parametrize('platforms', [None, ['微博', '今日头条', '小红书'], ['B站']])
+def test_cube_views_match_row_groupbys(compact, platforms):
+    df = undated_report()
+    assert df['日期'].isna().any()
+    ds = Dataset(compact_frame(df.copy()) if compact else df)
+    platforms = platforms or ds.platforms
+    # The dashboard's original per-rerun computations on the filtered rows
+    f_df = df[df['发布平台'].isin(platforms)]
+    interactions = f_df['点赞数'].sum() + f_df['评论数'].sum() + f_df['转发数'].sum()
+
+    kpis = ds.kpis(platforms)
+    assert kpis['count'] == len(f_df)
+    assert int(kpis['reads']) == int(f_df['阅读数'].sum())
+    assert int(kpis['interactions']) == int(interactions)
+    assert kpis['avg_likes'] == pytest.approx(f_df['点赞数'].sum() / len(f_df))
+    assert kpis['platforms'] == f_df['发布平台'].nunique()
+
+    insight_df = f_df.groupby('发布平台')[['点赞数', '评论数', '转发数']].sum()
+    insight_df['density'] = insight_df.sum(axis=1) / f_df['发布平台'].value_counts()
+    best, density = ds.insight(platforms)
+    assert best == insight_df['density'].idxmax()
+    assert density == pytest.approx(insight_df['density'].max())
+
+    p_vol = f_df['发布平台'].value_counts()
+    volume = ds.volume(platforms)
+    assert dict(zip(volume['平台'], volume['篇数'])) == p_vol.to_dict()
+    assert volume['篇数'].is_monotonic_decreasing
+
+    daily_p = f_df.groupby(['日期', '发布平台']).size().reset_index(name='篇数')
+    daily = ds.daily(platforms)
+    pd.testing.assert_frame_equal(daily[['日期', '发布平台', '篇数']].astype({'发布平台': object}),
+                                  daily_p, check_dtype=False)
+
+    read_comp, int_comp = ds.comps(platforms)
+    expected_read = f_df.groupby('发布平台')['阅读数'].sum().reset_index()
+    expected_int = f_df.groupby('发布平台')[['点赞数', '评论数', '转发数']].sum().reset_index()
+    pd.testing.assert_frame_equal(read_comp.astype({'发布平台': object}), expected_read, check_dtype=False)
+    pd.testing.assert_frame_equal(int_comp.astype({'发布平台': object}), expected_int, check_dtype=False)
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+import merge_backtrace
+from monitor.sentiment import LABELS, SentimentCache, fill_sentiment
+
+
+def test_fill_blank_float_column():
+    # A blank 情感属性 column is read back from Excel as all-NaN float64
+    df = pd.DataFrame({'标题': ['网友点赞', '事故造成损失'], '摘要': ['', ''], '情感属性': [np.nan, np.nan]})
+    assert fill_sentiment(df, None) == (2, 0)
+    assert df['情感属性'].isin(LABELS).all()
+
+
+def test_fill_keeps_existing_labels(tmp_path):
+    df = pd.DataFrame({'标题': ['网友点赞', '网友点赞', '事故'], '摘要': ['', '', ''],
+                       '情感属性': pd.Categorical(['负面', None, None])})
+    cache = SentimentCache(str(tmp_path / "labels.sqlite"))
+    assert fill_sentiment(df, cache) == (2, 0)
+    assert df['情感属性'].iloc[0] == '负面'
+    again = df.assign(情感属性=None)
+    assert fill_sentiment(again, cache) == (3, 3)
+    assert again['情感属性'].iloc[1:].tolist() == df['情感属性'].iloc[1:].tolist()
+
+
+def test_stream_merge_blank_sentiment_column(merge_inputs):
+    main = merge_inputs()
+    merge_inputs(main.assign(情感属性=np.nan))
+    merge_backtrace.merge_data(stream=True)
+    merged = pd.read_excel(merge_backtrace.OUTPUT_EXCEL)
+    assert len(merged) > len(main)
+    assert merged['情感属性'].isin(LABELS).all()
@@ -0,0 +1,71 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from monitor import data
+from monitor.dataset import load_dataset
+from monitor.snapshot import load_snapshot, snapshot_path, snapshot_report
+from monitor.synthetic import main_sheet
+
+
+def assert_same(a, b):
+    if isinstance(a, pd.DataFrame):
+        pd.testing.assert_frame_equal(a.reset_index(drop=True), b.reset_index(drop=True))
+    elif isinstance(a, pd.Series):
+        pd.testing.assert_series_equal(a, b)
+    elif isinstance(a, (tuple, list)):
+        assert len(a) == len(b)
+        for x, y in zip(a, b):
+            assert_same(x, y)
+    else:
+        assert a == b
+
+
+@pytest.fixture
+def report(tmp_path, monkeypatch):
+    monkeypatch.setattr(data, "CACHE_DIR", str(tmp_path / "cache"))
+    path = str(tmp_path / "report.xlsx")
+    df = main_sheet(600, seed=4)
+    df['发布时间'] = df['发布时间'].astype(object)
+    df.loc[::37, '发布时间'] = np.nan
+    df.to_excel(path, index=False)
+    return path
+
+
+def test_snapshot_views_match_fresh_dataset(report):
+    snapshot_report(report)
+    assert sorted(os.listdir(snapshot_path(report))) == [
+        'anomalies.parquet', 'cube.parquet', 'leaders.parquet', 'meta.json', 'sentiments.parquet']
+    snapshot = load_snapshot(report)
+    fresh = load_dataset(report, compact=True)
+    assert snapshot is not None and snapshot.platforms == fresh.platforms
+    assert fresh.cube.index.get_level_values('日期').isna().any()
+    platforms = fresh.platforms
+    selections = [platforms, list(reversed(platforms)), [platforms[0]], platforms[1:3], [platforms[-1]]]
+    for selection in selections:
+        first, last = fresh.date_bounds(selection)
+        middle = first + (last - first) / 2
+        for view in (lambda ds: ds.kpis(selection), lambda ds: ds.insight(selection),
+                     lambda ds: ds.volume(selection), lambda ds: ds.daily(selection),
+                     lambda ds: ds.date_bounds(selection), lambda ds: ds.comps(selection),
+                     lambda ds: ds.sentiment(selection), lambda ds: ds.anomalies(selection),
+                     lambda ds: ds.trend(selection, first, middle, 'W'),
+                     lambda ds: ds.leaderboard('raw_csi', selection),
+                     lambda ds: ds.leaderboard('评论数', selection)):
+            assert_same(view(snapshot), view(fresh))
+
+
+def test_snapshot_ignored_once_report_changes(report):
+    snapshot_report(report)
+    main_sheet(600, seed=5).to_excel(report, index=False)
+    assert load_snapshot(report) is None
+
+
+def test_snapshot_frames_must_match_meta(report):
+    path = snapshot_report(report)
+    assert load_snapshot(report) is not None
+    # A frame file from another write (or dropped in by someone else) is not trusted
+    pd.DataFrame({'发布平台': ['x']}).to_parquet(os.path.join(path, 'leaders.parquet'))
+    assert load_snapshot(report) is None
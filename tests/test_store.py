@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from monitor.anomaly import detect_anomalies
+from monitor.data import read_report
+from monitor.dataset import Dataset
+from monitor.store import ArticleStore
+from monitor.synthetic import main_sheet
+
+
+@pytest.fixture
+def report(tmp_path):
+    df = main_sheet(600, seed=9, days=40)
+    # Titles with LIKE wildcards, and rows without a URL or a publish time
+    df.loc[:3, '标题'] = ['涨幅100%创新高', '涨幅1000创新高', 'a_b 网友热议', 'axb 网友热议']
+    df['原文链接'] = df['原文链接'].astype(object)
+    df.loc[10:14, '原文链接'] = np.nan
+    df['发布时间'] = df['发布时间'].astype(object)
+    df.loc[20:22, '发布时间'] = np.nan
+    path = str(tmp_path / "report.xlsx")
+    df.to_excel(path, index=False)
+    return path
+
+
+@pytest.fixture
+def store(tmp_path, report):
+    store = ArticleStore(str(tmp_path / "articles.sqlite"))
+    store.ingest_report(report)
+    return store
+
+
+def test_reingest_updates_in_place(store, report):
+    df = read_report(report)
+    (count,), = store._query("SELECT COUNT(*) FROM articles")
+    assert count == len(df)
+    assert store.ingest_report(report) is None
+    assert store.ingest_report(report, force=True) == len(df)
+    # A newer export of the same articles only changes their metrics
+    store.ingest_frame(df.assign(点赞数=df['点赞数'] + 1), 'newer.xlsx')
+    (count, likes), = store._query("SELECT COUNT(*), TOTAL(likes) FROM articles")
+    assert count == len(df)
+    assert likes == df['点赞数'].sum() + len(df)
+
+
+def test_cube_and_leaders_match_dataset(store, report):
+    ds = Dataset(read_report(report))
+    platforms = ds.platforms
+    # Undated rows are kept under a NULL day in both
+    def cells(cube):
+        cells = cube.reset_index().astype({'发布平台': str})
+        cells['日期'] = cells['日期'].map(lambda day: str(day) if pd.notna(day) else '')
+        return cells.sort_values(['发布平台', '日期'], ignore_index=True)
+    assert store.cube(platforms).reset_index()['日期'].isna().sum() > 0
+    pd.testing.assert_frame_equal(cells(store.cube(platforms)), cells(ds.cube), check_dtype=False)
+
+    first, last = ds.date_bounds(platforms)
+    assert store.date_bounds() == (first, last)
+    window = (first + pd.Timedelta(days=5), last - pd.Timedelta(days=5))
+    windowed = Dataset(ds.df[ds.df['日期'].between(*window)].reset_index(drop=True))
+    stored = Dataset(store.leaders(platforms, *window), cube=store.cube(platforms, *window))
+    for scope in [platforms, ['今日头条'], ['小红书', 'B站']]:
+        for metric in ('raw_csi', '评论数'):
+            got = stored.leaderboard(metric, scope)
+            want = windowed.leaderboard(metric, scope)
+            assert got['原文链接'].tolist() == want['原文链接'].tolist()
+            assert got[metric].tolist() == want[metric].tolist()
+        assert stored.kpis(scope) == windowed.kpis(scope)
+
+
+def test_explore_escapes_wildcards_and_sorts_nulls_last(store, report):
+    df = read_report(report)
+    platforms = df['发布平台'].unique().tolist()
+    for keyword in ['100%', 'a_b', '网友热议', '涨幅 创新高']:
+        rows, total = store.explore(platforms, keyword=keyword, size=50)
+        hit = np.logical_and.reduce([df['标题'].str.contains(term, regex=False) for term in keyword.split()])
+        assert total == hit.sum()
+        assert sorted(rows['标题']) == sorted(df.loc[hit, '标题'])
+    rows, total = store.explore(platforms, sort='发布时间', descending=True, page=0, size=len(df))
+    assert total == len(df)
+    assert rows['发布时间'].iloc[:-3].is_monotonic_decreasing
+    assert rows['发布时间'].iloc[-3:].isna().all()
+
+
+def test_detector_state_is_incremental(store, report):
+    assert store.anomalies() is None
+    flags = store.update_anomalies()
+    assert store.update_anomalies().empty
+    stored = store.anomalies()
+    pd.testing.assert_frame_equal(stored, flags)
+    expected = detect_anomalies(store.cube(store.platforms()))
+    pd.testing.assert_frame_equal(stored, expected)
@@ -0,0 +1,69 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from monitor import timestamps
+from monitor.timestamps import parse_timestamps
+
+
+@pytest.fixture(autouse=True)
+def fresh_formats(monkeypatch):
+    monkeypatch.setattr(timestamps, '_formats', {})
+
+
+def per_value(values):
+    """The original parsing: pd.to_datetime one value at a time, failures as NaT."""
+    return pd.Series([pd.to_datetime(v, errors='coerce') for v in values], dtype='datetime64[ns]')
+
+
+def old_failures(values):
+    blank = [v is None or (isinstance(v, float) and np.isnan(v)) or (isinstance(v, str) and not v.strip())
+             for v in values]
+    return int((per_value(values).isna() & ~pd.Series(blank)).sum())
+
+
+MIXED = ['2025-12-01 10:00:00', '2025-12-01 23:59:59', '2025/12/02 11:30', '2025-12-03',
+         datetime(2025, 12, 4, 8, 15), '2025-12-05T06:07:08', '12/06/2025', 'bad', '', '  ', None, np.nan,
+         '2025-13-01 00:00:00', '2025年12月07日']
+
+
+def test_mixed_formats_in_one_key():
+    parsed, failures = parse_timestamps(pd.Series(MIXED, dtype=object), key='test.mixed')
+    pd.testing.assert_series_equal(parsed, per_value(MIXED))
+    assert failures == old_failures(MIXED)
+    assert failures == 3
+    assert timestamps._formats['test.mixed'] == '%Y-%m-%d %H:%M:%S'
+
+
+def test_cached_format_that_stops_matching():
+    first = ['2025-12-01 10:00:00', '2025-12-02 11:00:00']
+    parse_timestamps(pd.Series(first), key='test.drift')
+    assert timestamps._formats['test.drift'] == '%Y-%m-%d %H:%M:%S'
+    # A later crawl switched layouts: every row misses the cached format and is retried
+    later = ['2025/12/03 12:30', '2025/12/04 13:45', 'not a time', '2025-12-05 14:00:00']
+    parsed, failures = parse_timestamps(pd.Series(later), key='test.drift')
+    pd.testing.assert_series_equal(parsed, per_value(later))
+    assert failures == old_failures(later) == 1
+    assert timestamps._formats['test.drift'] == '%Y-%m-%d %H:%M:%S'
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_failure_count_matches_per_value_parsing(seed):
+    rng = np.random.default_rng(seed)
+    base = pd.Timestamp('2025-12-01') + pd.to_timedelta(rng.integers(0, 30 * 86400, 300), unit='s')
+    layouts = ['%Y-%m-%d %H:%M:%S', '%Y/%m/%d %H:%M', '%Y-%m-%d', 'bad', 'blank', 'none']
+    values = []
+    for stamp, layout in zip(base, rng.choice(layouts, 300, p=[.6, .15, .1, .05, .05, .05])):
+        values.append({'bad': '无', 'blank': '', 'none': None}.get(layout) or stamp.strftime(layout))
+    parsed, failures = parse_timestamps(pd.Series(values, dtype=object), key=f'test.random{seed}')
+    pd.testing.assert_series_equal(parsed, per_value(values))
+    assert failures == old_failures(values)
+
+
+def test_numeric_and_datetime_columns():
+    stamps = pd.Series(pd.to_datetime(['2025-12-01', None]))
+    assert parse_timestamps(stamps)[1] == 0
+    parsed, failures = parse_timestamps(pd.Series([np.nan, np.nan]))
+    assert parsed.isna().all() and failures == 0
@@ -0,0 +1,49 @@
+import os
+
+import pandas as pd
+from openpyxl import load_workbook
+
+import merge_backtrace
+from monitor.data import read_report
+from monitor.writers import output_paths
+
+
+def merged_frame(merge_inputs, monkeypatch):
+    """Run a full merge to xlsx, Parquet and CSV; returns the merged frame it wrote."""
+    captured = []
+    save_outputs = merge_backtrace.save_outputs
+
+    def capture(columns, batches):
+        captured.append(pd.concat(list(batches()))[list(columns)])
+        save_outputs(columns, batches)
+    monkeypatch.setattr(merge_backtrace, "save_outputs", capture)
+    monkeypatch.setattr(merge_backtrace, "OUTPUT_FORMATS", ['xlsx', 'parquet', 'csv'])
+    merge_inputs()
+    merge_backtrace.merge_data()
+    return captured[0]
+
+
+def test_outputs_round_trip(merge_inputs, monkeypatch, tmp_path):
+    df = merged_frame(merge_inputs, monkeypatch)
+    paths = output_paths(merge_backtrace.OUTPUT_EXCEL, ['xlsx', 'parquet', 'csv'])
+    assert df.isna().any().any()
+
+    # The streamed workbook reads back like DataFrame.to_excel's
+    reference = str(tmp_path / "reference.xlsx")
+    df.to_excel(reference, index=False)
+    pd.testing.assert_frame_equal(pd.read_excel(paths['xlsx']), pd.read_excel(reference))
+    sheet = load_workbook(paths['xlsx'], read_only=True).active
+    cells = [row + (None,) * (len(df.columns) - len(row)) for row in sheet.iter_rows(min_row=2, values_only=True)]
+    assert len(cells) == len(df)
+    missing = df.isna().to_numpy()
+    assert all(cells[i][j] is None for i, j in zip(*missing.nonzero()))
+    assert all(cells[i][j] is not None for i, j in zip(*(~missing).nonzero()))
+
+    # Every format loads into the same report
+    expected = read_report(reference)
+    for fmt in ('parquet', 'csv'):
+        pd.testing.assert_frame_equal(read_report(paths[fmt]), expected)
+    assert list(pd.read_parquet(paths['parquet']).columns) == list(df.columns)
+
+    mtimes = {os.stat(path).st_mtime for path in paths.values()}
+    assert len(mtimes) == 1